@@ -6,9 +6,11 @@ This script provides an easy way to run tests with different configurations
 and generate coverage reports.
 """
 
+import os
 import sys
 import subprocess
 import argparse
+import importlib.util
 from pathlib import Path
 
 
@@ -17,21 +19,51 @@ def run_command(cmd, description):
     print(f"\n🔄 {description}")
     print(f"Running: {' '.join(cmd)}")
     
+    # Output goes straight to the terminal so long runs show progress as they go
+    sys.stdout.flush()
     try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        subprocess.run(cmd, check=True)
         print("✅ Success!")
-        if result.stdout:
-            print(result.stdout)
         return True
     except subprocess.CalledProcessError as e:
+        print(f"❌ Error: command exited with status {e.returncode}")
+        return False
+    except FileNotFoundError as e:
         print(f"❌ Error: {e}")
-        if e.stdout:
-            print("STDOUT:", e.stdout)
-        if e.stderr:
-            print("STDERR:", e.stderr)
         return False
 
 
+def get_changed_test_files():
+    """
+    Find test files affected by uncommitted changes.
+    
+    Changed test modules are included directly; changed src/<name>.py
+    modules map to tests/test_<name>.py when that file exists.
+    """
+    try:
+        result = subprocess.run(["git", "diff", "--name-only", "HEAD"],
+                                check=True, capture_output=True, text=True)
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        print(f"❌ Error: could not list changed files with git: {e}")
+        sys.exit(1)
+    
+    test_files = []
+    for name in result.stdout.splitlines():
+        path = Path(name)
+        if path.suffix != ".py":
+            continue
+        if path.parts[0] == "tests" and path.name.startswith("test_"):
+            candidate = path
+        elif path.parts[0] == "src":
+            candidate = Path("tests") / f"test_{path.name}"
+        else:
+            continue
+        if candidate.exists() and str(candidate) not in test_files:
+            test_files.append(str(candidate))
+    
+    return test_files
+
+
 def main():
     parser = argparse.ArgumentParser(description="Run tests for Vinyl Recognition System")
     parser.add_argument("--quick", action="store_true", help="Run quick tests only")
@@ -41,10 +73,23 @@ def main():
     parser.add_argument("--unit", action="store_true", help="Run unit tests only")
     parser.add_argument("--integration", action="store_true", help="Run integration tests only")
     parser.add_argument("--file", help="Run specific test file")
+    parser.add_argument("--parallel", nargs="?", const="auto", metavar="N",
+                        help="Run tests in parallel with pytest-xdist (N workers, default: auto)")
+    parser.add_argument("--lf", action="store_true", help="Rerun only the tests that failed last time")
+    parser.add_argument("--ff", action="store_true", help="Run last failures first, then the rest")
+    parser.add_argument("--changed", action="store_true",
+                        help="Run only test files affected by uncommitted git changes")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Disable pytest's cache plugin (useful on CI)")
+    parser.add_argument("--exec", dest="exec_pytest", action="store_true",
+                        help="Replace this process with pytest instead of spawning it (no summary banner)")
     parser.add_argument("--install-deps", action="store_true", help="Install test dependencies")
     
     args = parser.parse_args()
     
+    if args.no_cache and (args.lf or args.ff):
+        parser.error("--lf/--ff need pytest's cache and cannot be combined with --no-cache")
+    
     # Check if we're in the right directory
     if not Path("src").exists():
         print("❌ Error: Please run this script from the project root directory")
@@ -60,11 +105,8 @@ def main():
     # Build pytest command
     cmd = [sys.executable, "-m", "pytest"]
     
-    # Check if pytest is available
-    try:
-        subprocess.run([sys.executable, "-m", "pytest", "--version"], 
-                      check=True, capture_output=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    # Check if pytest is available (in-process, no extra interpreter startup)
+    if importlib.util.find_spec("pytest") is None:
         print("❌ pytest not found. Installing test dependencies...")
         if not run_command([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"], 
                           "Installing dependencies"):
@@ -85,6 +127,25 @@ def main():
     if args.file:
         cmd.append(args.file)
     
+    if args.changed:
+        changed_files = get_changed_test_files()
+        if not changed_files:
+            print("✅ No test files affected by uncommitted changes")
+            return
+        cmd.extend(changed_files)
+    
+    if args.no_cache:
+        cmd.extend(["-p", "no:cacheprovider"])
+    
+    if args.lf:
+        cmd.append("--lf")
+    elif args.ff:
+        cmd.append("--ff")
+    
+    if args.parallel:
+        # Every test gets its own tmp_path database, so tests are spread individually
+        cmd.extend(["-n", args.parallel, "--dist=load"])
+    
     if args.coverage:
         cmd.extend([
             "--cov=src",
@@ -103,6 +164,12 @@ def main():
     print("🧪 Running Vinyl Recognition System Tests")
     print("=" * 50)
     
+    if args.exec_pytest:
+        # Hand the process over to pytest; its exit status becomes ours
+        print(f"Running: {' '.join(cmd)}")
+        sys.stdout.flush()
+        os.execvp(sys.executable, cmd)
+    
     success = run_command(cmd, "Running tests")
     
     if success:
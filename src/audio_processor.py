@@ -24,12 +24,14 @@ logger = logging.getLogger(__name__)
 class AudioProcessor:
     """Manages audio capture and processing for vinyl recognition."""
     
-    def __init__(self, on_track_detected: Optional[Callable[[str], None]] = None):
+    def __init__(self, on_track_detected: Optional[Callable[[str], None]] = None,
+                 clock: Callable[[], float] = time.time):
         """
         Initialize the audio processor.
         
         Args:
             on_track_detected: Callback function when a track is detected
+            clock: Returns the current time in seconds; replaceable for testing
         """
         # Defensive: ensure all attributes exist even if init fails
         self._audio_thread = None
@@ -44,6 +46,7 @@ class AudioProcessor:
         self.last_track_end_time = 0
         self._lock = threading.Lock()
         self.on_track_detected = on_track_detected
+        self._clock = clock
         # Now proceed with normal initialization
         self.config = get_config()
         self.audio_config = self.config.get_audio_config()
@@ -195,7 +198,7 @@ class AudioProcessor:
         else:
             rms = 0.0
         
-        current_time = time.time()
+        current_time = self._clock()
         is_silent = rms < self.silence_threshold
         
         with self._lock:
@@ -256,7 +259,7 @@ class AudioProcessor:
             return
         
         self.is_recording = False
-        self.last_track_end_time = time.time()
+        self.last_track_end_time = self._clock()
         
         # Check if recording is long enough
         recording_duration = len(self.current_recording) / (self.sample_rate * self.channels)
@@ -330,7 +333,7 @@ class AudioProcessor:
                 'silence_threshold': self.silence_threshold,
                 'recording_duration': len(self.current_recording) / (self.sample_rate * self.channels) if self.current_recording else 0,
                 'music_detected': self.music_start_time is not None,
-                'silence_duration': (time.time() - self.silence_start_time) if self.silence_start_time else 0
+                'silence_duration': (self._clock() - self.silence_start_time) if self.silence_start_time else 0
             }
     
     def test_audio_input(self, duration: float = 5.0) -> Tuple[bool, str, Optional[dict]]:
@@ -351,12 +354,12 @@ class AudioProcessor:
             
             logger.info(f"Testing audio input for {duration} seconds...")
             
-            start_time = time.time()
+            start_time = self._clock()
             samples = []
             max_level = 0.0
             min_level = float('inf')
             
-            while time.time() - start_time < duration:
+            while self._clock() - start_time < duration:
                 try:
                     data = self.stream.read(self.chunk_size, exception_on_overflow=False)
                     audio_data = np.frombuffer(data, dtype=np.int16)
@@ -7,13 +7,59 @@ Provides secure API key management and runtime configuration updates.
 
 import json
 import os
+import re
 import logging
-from typing import Dict, Any, Optional
+import pickle
+import hashlib
+import stat
+import tempfile
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
-import copy
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+REQUIRED_SECRETS = {
+    'LASTFM_API_KEY': 'Last.fm API key',
+    'LASTFM_API_SECRET': 'Last.fm API secret',
+    'LASTFM_SESSION_KEY': 'Last.fm session key (get with scripts/lastfm_auth.py)',
+    'FLASK_SECRET_KEY': 'Flask secret key'
+}
+
+OPTIONAL_SECRETS = {
+    'AUDD_API_KEY': 'AudD API key (optional if using only Shazam)'
+}
+
+# Environment variables with these prefixes are loaded as secrets
+SECRET_ENV_PREFIXES = ('LASTFM_', 'AUDD_', 'FLASK_', 'SHAZAM_', 'ACRCLOUD_')
+_SECRET_ENV_RE = re.compile('|'.join(re.escape(prefix) for prefix in SECRET_ENV_PREFIXES))
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to indented JSON bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+
+def _current_umask() -> int:
+    """Read the process umask; it can only be queried by setting it."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
 
 class ConfigManager:
     """Manages application configuration from multiple sources."""
@@ -24,9 +70,16 @@ class ConfigManager:
         self.example_config_file = self.config_dir / "config.example.json"
         self.secrets_file = self.config_dir / "secrets.env"
         self.example_secrets_file = self.config_dir / "secrets.example.env"
+        self.cache_file = self.config_dir / ".config.cache.pkl"
         
         self._config: Dict[str, Any] = {}
+        self._flat: Dict[str, Any] = {}
         self._secrets: Dict[str, str] = {}
+        self._section_cache: Dict[str, Any] = {}
+        self._secrets_validation: Optional[Dict[str, Dict[str, Any]]] = None
+        self._dirty = False
+        self._provider_order: Tuple[str, ...] = ()
+        self._provider_enabled: frozenset = frozenset()
         
         self._load_configuration()
     
@@ -34,6 +87,7 @@ class ConfigManager:
         """Load configuration from files and environment variables."""
         try:
             self._load_config_file()
+            self._rebuild_flat()
             self._load_secrets()
             logger.info("Configuration loaded successfully")
         except Exception as e:
@@ -43,29 +97,93 @@ class ConfigManager:
     def _load_config_file(self):
         """Load main configuration from JSON file."""
         if self.config_file.exists():
-            with open(self.config_file, 'r') as f:
-                self._config = json.load(f)
+            with open(self.config_file, 'rb') as f:
+                raw = f.read()
+            
+            st = self.config_file.stat()
+            header = (st.st_mtime_ns, st.st_size, hashlib.sha1(raw).hexdigest())
+            
+            cached = self._read_config_cache(header)
+            if cached is not None:
+                self._config = cached
+                return
+            
+            self._config = _json_loads(raw)
+            self._write_config_cache(header)
         elif self.example_config_file.exists():
             logger.warning(f"No config.json found, copying from example")
-            with open(self.example_config_file, 'r') as f:
-                self._config = json.load(f)
+            with open(self.example_config_file, 'rb') as f:
+                self._config = _json_loads(f.read())
+            self._dirty = True
             self.save_config()
         else:
             raise FileNotFoundError(f"No configuration file found in {self.config_dir}")
     
+    def _read_config_cache(self, header: Tuple[int, int, str]) -> Optional[Dict[str, Any]]:
+        """
+        Read the parsed configuration from the pickle cache.
+        
+        Args:
+            header: (mtime_ns, size, sha1) of the current config.json
+            
+        Returns:
+            Cached configuration dict, or None if missing or stale
+        """
+        try:
+            with open(self.cache_file, 'rb') as f:
+                if pickle.load(f) != header:
+                    return None
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable config cache: {e}")
+            return None
+    
+    def _write_config_cache(self, header: Tuple[int, int, str]) -> None:
+        """
+        Write the parsed configuration to the pickle cache atomically.
+        
+        Args:
+            header: (mtime_ns, size, sha1) of the config.json it was parsed from
+        """
+        try:
+            data = pickle.dumps(header, protocol=5) + pickle.dumps(self._config, protocol=5)
+            self._atomic_write(self.cache_file, data)
+        except Exception as e:
+            logger.debug(f"Failed to write config cache: {e}")
+    
+    def _rebuild_flat(self) -> None:
+        """Rebuild the dotted-key lookup table from the nested configuration."""
+        self._flat = {}
+        self._section_cache.clear()
+        self._flatten_into(self._config, '')
+        self._refresh_providers()
+    
+    def _flatten_into(self, section: Dict[str, Any], prefix: str) -> None:
+        """Index every value of a nested section under its dotted path."""
+        for key, value in section.items():
+            path = f"{prefix}{key}"
+            self._flat[path] = value
+            if isinstance(value, dict):
+                self._flatten_into(value, f"{path}.")
+    
     def _load_secrets(self):
         """Load secrets from environment file and system environment."""
+        self._secrets_validation = None
+        
         if self.secrets_file.exists():
-            with open(self.secrets_file, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        self._secrets[key.strip()] = value.strip()
+            lines = self.secrets_file.read_text().splitlines()
+            self._secrets.update(
+                (key.strip(), value.strip())
+                for key, sep, value in (line.partition('=') for line in lines)
+                if sep and not key.lstrip().startswith('#')
+            )
         
-        for key, value in os.environ.items():
-            if key.startswith(('LASTFM_', 'AUDD_', 'FLASK_', 'SHAZAM_', 'ACRCLOUD_')):
-                self._secrets[key] = value
+        self._secrets.update({
+            key: value for key, value in os.environ.items()
+            if _SECRET_ENV_RE.match(key)
+        })
     
     def get(self, key_path: str, default: Any = None) -> Any:
         """
@@ -78,13 +196,7 @@ class ConfigManager:
         Returns:
             Configuration value or default
         """
-        try:
-            value = self._config
-            for key in key_path.split('.'):
-                value = value[key]
-            return value
-        except (KeyError, TypeError):
-            return default
+        return self._flat.get(key_path, default)
     
     def set(self, key_path: str, value: Any) -> None:
         """
@@ -96,13 +208,32 @@ class ConfigManager:
         """
         keys = key_path.split('.')
         config = self._config
+        path = ''
         
         for key in keys[:-1]:
+            path += key
             if key not in config:
                 config[key] = {}
+                self._flat[path] = config[key]
             config = config[key]
+            path += '.'
         
         config[keys[-1]] = value
+        self._section_cache.clear()
+        self._dirty = True
+        
+        # Drop index entries under a replaced section, then index the new value
+        prefix = f"{key_path}."
+        if isinstance(self._flat.get(key_path), dict):
+            for stale_key in [k for k in self._flat if k.startswith(prefix)]:
+                del self._flat[stale_key]
+        
+        self._flat[key_path] = value
+        if isinstance(value, dict):
+            self._flatten_into(value, prefix)
+        
+        if key_path.startswith('recognition.providers') or 'recognition.providers'.startswith(key_path):
+            self._refresh_providers()
     
     def get_secret(self, key: str, default: Optional[str] = None) -> Optional[str]:
         """
@@ -126,47 +257,92 @@ class ConfigManager:
         Validate that required secrets are present.
         
         Returns:
-            Dictionary of secret validation results
+            Dictionary of secret validation results (cached until secrets reload)
         """
-        required_secrets = {
-            'LASTFM_API_KEY': 'Last.fm API key',
-            'LASTFM_API_SECRET': 'Last.fm API secret',
-            'LASTFM_SESSION_KEY': 'Last.fm session key (get with scripts/lastfm_auth.py)',
-            'FLASK_SECRET_KEY': 'Flask secret key'
-        }
-        
-        optional_secrets = {
-            'AUDD_API_KEY': 'AudD API key (optional if using only Shazam)'
-        }
+        if self._secrets_validation is not None:
+            return self._secrets_validation
         
         validation = {}
         
-        for key, description in required_secrets.items():
+        for key, description in REQUIRED_SECRETS.items():
             validation[key] = {
                 'present': self.has_secret(key),
                 'required': True,
                 'description': description
             }
         
-        for key, description in optional_secrets.items():
+        for key, description in OPTIONAL_SECRETS.items():
             validation[key] = {
                 'present': self.has_secret(key),
                 'required': False,
                 'description': description
             }
         
+        self._secrets_validation = validation
         return validation
     
-    def save_config(self) -> None:
-        """Save current configuration to file."""
+    def _dump_bytes(self) -> bytes:
+        """Serialize the current configuration to indented JSON bytes."""
+        return _json_dumps(self._config)
+    
+    def _atomic_write(self, path: Path, data: bytes) -> None:
+        """
+        Write bytes to a file atomically via a temp file and os.replace.
+        
+        The file keeps its existing permissions, or gets the umask default when
+        new, rather than the owner-only mode mkstemp creates temp files with.
+        
+        Args:
+            path: Destination file
+            data: File contents
+        """
+        try:
+            mode = stat.S_IMODE(path.stat().st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~_current_umask()
+        
+        fd, temp_path = tempfile.mkstemp(dir=self.config_dir, prefix=f".{path.name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.chmod(temp_path, mode)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    
+    def save_config(self, backup: bool = False, force: bool = False) -> Optional[Path]:
+        """
+        Save current configuration to file.
+        
+        Skipped when nothing changed through set()/update_config() since the
+        last load or save.
+        
+        Args:
+            backup: Also write a timestamped backup from the same serialized data
+            force: Write even if no changes were recorded
+            
+        Returns:
+            Path to backup file if backup was requested, otherwise None
+        """
+        if not self._dirty and not force:
+            logger.debug("Configuration unchanged, skipping save")
+            return self.backup_config() if backup else None
+        
         try:
             self.config_dir.mkdir(exist_ok=True)
-            with open(self.config_file, 'w') as f:
-                json.dump(self._config, f, indent=2)
+            data = self._dump_bytes()
+            self._atomic_write(self.config_file, data)
+            self.cache_file.unlink(missing_ok=True)
+            self._dirty = False
             logger.info("Configuration saved successfully")
         except Exception as e:
             logger.error(f"Failed to save configuration: {e}")
             raise
+        
+        if backup:
+            return self._write_backup(data)
+        return None
     
     def backup_config(self, backup_suffix: str = None) -> Path:
         """
@@ -178,22 +354,31 @@ class ConfigManager:
         Returns:
             Path to backup file
         """
+        return self._write_backup(self._dump_bytes(), backup_suffix)
+    
+    def _write_backup(self, data: bytes, backup_suffix: str = None) -> Path:
+        """Write already-serialized configuration to a backup file."""
         import datetime
         
         if backup_suffix is None:
             backup_suffix = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
         
         backup_file = self.config_dir / f"config_backup_{backup_suffix}.json"
-        
-        with open(backup_file, 'w') as f:
-            json.dump(self._config, f, indent=2)
+        self._atomic_write(backup_file, data)
         
         logger.info(f"Configuration backed up to {backup_file}")
         return backup_file
     
     def get_config_dict(self) -> Dict[str, Any]:
-        """Get a copy of the current configuration dictionary."""
-        return copy.deepcopy(self._config)
+        """
+        Get a copy of the current configuration dictionary.
+        
+        The copy is made by a JSON round-trip, which is much faster than
+        copy.deepcopy for a config tree but only preserves JSON types.
+        """
+        if ORJSON_AVAILABLE:
+            return orjson.loads(orjson.dumps(self._config))
+        return json.loads(json.dumps(self._config))
     
     def update_config(self, updates: Dict[str, Any]) -> None:
         """
@@ -202,46 +387,94 @@ class ConfigManager:
         Args:
             updates: Dictionary of configuration updates
         """
-        def update_nested_dict(original: Dict, updates: Dict):
-            for key, value in updates.items():
-                if isinstance(value, dict) and key in original and isinstance(original[key], dict):
-                    update_nested_dict(original[key], value)
+        # Merge nested sections with an explicit stack instead of recursion
+        stack = [(self._config, updates)]
+        while stack:
+            original, changes = stack.pop()
+            for key, value in changes.items():
+                if isinstance(value, dict) and isinstance(original.get(key), dict):
+                    stack.append((original[key], value))
                 else:
                     original[key] = value
         
-        update_nested_dict(self._config, updates)
+        self._rebuild_flat()
+        self._dirty = True
+    
+    def _get_section(self, name: str) -> Dict[str, Any]:
+        """Get a top-level configuration section, memoized until the next change."""
+        try:
+            return self._section_cache[name]
+        except KeyError:
+            section = self._section_cache[name] = self.get(name, {})
+            return section
     
     def get_audio_config(self) -> Dict[str, Any]:
         """Get audio configuration."""
-        return self.get('audio', {})
+        return self._get_section('audio')
     
     def get_recognition_config(self) -> Dict[str, Any]:
         """Get recognition configuration."""
-        return self.get('recognition', {})
+        return self._get_section('recognition')
     
     def get_scrobbling_config(self) -> Dict[str, Any]:
         """Get scrobbling configuration."""
-        return self.get('scrobbling', {})
+        return self._get_section('scrobbling')
     
     def get_web_config(self) -> Dict[str, Any]:
         """Get web interface configuration."""
-        return self.get('web_interface', {})
+        return self._get_section('web_interface')
     
     def get_logging_config(self) -> Dict[str, Any]:
         """Get logging configuration."""
-        return self.get('logging', {})
+        return self._get_section('logging')
     
     def get_database_config(self) -> Dict[str, Any]:
         """Get database configuration."""
-        return self.get('database', {})
+        return self._get_section('database')
+    
+    def _refresh_providers(self) -> None:
+        """Precompute provider order and enabled flags from the recognition section."""
+        providers = self.get('recognition.providers', {})
+        if not isinstance(providers, dict):
+            providers = {}
+        
+        self._provider_order = tuple(providers.get('order', ['audd', 'shazam']))
+        self._provider_enabled = frozenset(
+            name for name, settings in providers.items()
+            if isinstance(settings, dict) and settings.get('enabled', False)
+        )
     
     def is_provider_enabled(self, provider: str) -> bool:
         """Check if a recognition provider is enabled."""
-        return self.get(f'recognition.providers.{provider}.enabled', False)
+        return provider in self._provider_enabled
     
     def get_provider_order(self) -> list:
         """Get the order of recognition providers."""
-        return self.get('recognition.providers.order', ['audd', 'shazam'])
+        return list(self._provider_order)
+
+
+class _LazyConfigManager(ConfigManager):
+    """ConfigManager that defers reading config files until first use."""
+    
+    def __init__(self, config_dir: str = "config"):
+        self._lazy_config_dir = config_dir
+    
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes that don't exist yet, i.e. before loading
+        if name.startswith('__'):
+            raise AttributeError(name)
+        
+        config_dir = self.__dict__['_lazy_config_dir']
+        self.__class__ = ConfigManager
+        try:
+            ConfigManager.__init__(self, config_dir)
+        except Exception:
+            self.__dict__.clear()
+            self._lazy_config_dir = config_dir
+            self.__class__ = _LazyConfigManager
+            raise
+        
+        return getattr(self, name)
 
 
 # Global configuration instance
@@ -259,5 +492,5 @@ def get_config() -> ConfigManager:
     """Get the global configuration manager instance."""
     global config
     if config is None:
-        config = initialize_config()
+        config = _LazyConfigManager()
     return config
\ No newline at end of file
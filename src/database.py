@@ -8,17 +8,303 @@ import sqlite3
 import logging
 import threading
 import time
+import weakref
 import json
+import zlib
+import math
+import hashlib
 from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 from contextlib import contextmanager
+from concurrent.futures import Future
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 
 from config_manager import get_config
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Applied to every connection; these settings are not persisted in the database file
+CONNECTION_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-20000',
+    'PRAGMA wal_autocheckpoint=1000',
+)
+
+# RETURNING needs SQLite 3.35+; older builds (e.g. Raspberry Pi OS Bullseye) look the id up instead
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Hot-path statements. sqlite3 caches compiled statements per connection keyed by SQL
+# text, so always bind values with ? placeholders; formatting values into the SQL
+# creates a new statement every call and bypasses the cache.
+STATEMENT_CACHE_SIZE = 256
+
+_SQL_INSERT_QUEUE = '''
+    INSERT INTO scrobble_queue 
+    (artist, title, album, timestamp, duration, track_number, mbid, retry_count, created_at, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_HISTORY = '''
+    INSERT INTO scrobble_history 
+    (artist, title, album, timestamp, duration, track_number, mbid, 
+     scrobbled_at, recognition_provider, recognition_confidence, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_STATS = '''
+    INSERT INTO system_stats 
+    (timestamp, cpu_usage, memory_usage, disk_usage, temperature,
+     recognition_count, scrobble_count, error_count)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Explicit column lists keep the row shape fixed and let reads skip the metadata column
+_HISTORY_COLUMNS = (
+    'id', 'artist', 'title', 'album', 'timestamp', 'duration', 'track_number', 'mbid',
+    'scrobbled_at', 'recognition_provider', 'recognition_confidence'
+)
+
+_STATS_COLUMNS = (
+    'id', 'timestamp', 'cpu_usage', 'memory_usage', 'disk_usage', 'temperature',
+    'recognition_count', 'scrobble_count', 'error_count'
+)
+
+# Queue fields shown in the web interface; excludes track_number, mbid and metadata
+_QUEUE_VIEW_COLUMNS = (
+    'id', 'artist', 'title', 'album', 'timestamp', 'duration', 'retry_count', 'created_at'
+)
+
+_SQL_QUEUE_VIEW = f'''
+    SELECT {', '.join(_QUEUE_VIEW_COLUMNS)} FROM scrobble_queue 
+    ORDER BY created_at ASC 
+    LIMIT ?
+'''
+
+_SQL_RECENT_HISTORY = f'''
+    SELECT {', '.join(_HISTORY_COLUMNS)} FROM scrobble_history 
+    ORDER BY scrobbled_at DESC 
+    LIMIT ?
+'''
+
+_SQL_RECENT_HISTORY_WITH_METADATA = f'''
+    SELECT {', '.join(_HISTORY_COLUMNS)}, metadata FROM scrobble_history 
+    ORDER BY scrobbled_at DESC 
+    LIMIT ?
+'''
+
+_SQL_RECENT_HISTORY_SINCE = f'''
+    SELECT {', '.join(_HISTORY_COLUMNS)} FROM scrobble_history 
+    WHERE scrobbled_at >= ? AND id > ?
+    ORDER BY scrobbled_at DESC 
+    LIMIT ?
+'''
+
+_SQL_RECENT_STATS = f'''
+    SELECT {', '.join(_STATS_COLUMNS)} FROM system_stats 
+    WHERE timestamp >= ?
+    ORDER BY timestamp DESC
+'''
+
+# One pass over the scrobbled_at range feeds every aggregate in get_scrobble_stats;
+# SQLite materializes a CTE that is referenced more than once. Rows are tagged
+# with their section and come back in UNION ALL order.
+_SQL_SCROBBLE_STATS = '''
+    WITH recent AS (
+        SELECT artist, recognition_provider FROM scrobble_history 
+        WHERE scrobbled_at >= ?
+    )
+    SELECT 'total', NULL, COUNT(*), COUNT(DISTINCT artist) FROM recent
+    UNION ALL
+    SELECT * FROM (
+        SELECT 'artist', artist, COUNT(*) AS count, NULL FROM recent 
+        GROUP BY artist 
+        ORDER BY count DESC 
+        LIMIT 10
+    )
+    UNION ALL
+    SELECT * FROM (
+        SELECT 'provider', recognition_provider, COUNT(*) AS count, NULL FROM recent 
+        GROUP BY recognition_provider 
+        ORDER BY count DESC
+    )
+'''
+
+_SQL_UPSERT_DUPLICATE = '''
+    INSERT INTO duplicate_cache 
+    (fingerprint, artist, title, timestamp, confidence, expires_at, artist_norm, title_norm)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(fingerprint) DO UPDATE SET
+        timestamp = excluded.timestamp,
+        confidence = excluded.confidence,
+        expires_at = excluded.expires_at,
+        artist_norm = COALESCE(excluded.artist_norm, artist_norm),
+        title_norm = COALESCE(excluded.title_norm, title_norm)
+'''
+
+_SQL_UPSERT_DUPLICATE_RETURNING = _SQL_UPSERT_DUPLICATE + ' RETURNING id'
+
+_SQL_FIND_DUPLICATE = '''
+    SELECT * FROM duplicate_cache 
+    WHERE fingerprint = ? AND expires_at > ?
+'''
+
+_SQL_RECENT_DUPLICATES = '''
+    SELECT * FROM duplicate_cache 
+    WHERE timestamp >= ? AND expires_at > ?
+    ORDER BY timestamp DESC 
+    LIMIT ?
+'''
+
+# Rows deleted per transaction by cleanup, so a large purge doesn't balloon the WAL
+CLEANUP_BATCH_SIZE = 5000
+
+# Extra BEGIN IMMEDIATE attempts when SQLite reports the database locked despite the busy timeout
+WRITE_RETRIES = 5
+WRITE_RETRY_BACKOFF = 0.01
+
+# Online backup copies this many pages per step, then sleeps so writers can get in
+BACKUP_PAGES_PER_STEP = 64
+BACKUP_STEP_SLEEP = 0.001
+
+# Metadata JSON longer than this is stored zlib-compressed as a BLOB
+METADATA_COMPRESS_THRESHOLD = 256
+
+# Bloom filter sizing for active duplicate fingerprints (~4.8KB at 1% false positives)
+DUPLICATE_FILTER_CAPACITY = 4096
+DUPLICATE_FILTER_ERROR_RATE = 0.01
+
+
+def _now_s() -> int:
+    """Current wall-clock time in whole seconds."""
+    return time.time_ns() // 1_000_000_000
+
+
+def encode_fingerprint(fingerprint: str) -> Any:
+    """
+    Convert a hex fingerprint to its storage form.
+    
+    64-bit fingerprints become a signed integer, so lookups compare one
+    machine word; other hex strings are stored as raw bytes and non-hex
+    fingerprints as text unchanged.
+    """
+    try:
+        raw = bytes.fromhex(fingerprint)
+    except ValueError:
+        return fingerprint
+    if len(raw) == 8:
+        return int.from_bytes(raw, 'big', signed=True)
+    return raw
+
+
+def decode_fingerprint(value: Any) -> str:
+    """Convert a stored fingerprint back to its string form."""
+    if isinstance(value, int):
+        return value.to_bytes(8, 'big', signed=True).hex()
+    if isinstance(value, bytes):
+        return value.hex()
+    return value
+
+
+def _encode_metadata(metadata: Optional[Dict]) -> Optional[Any]:
+    """Serialize metadata compactly, compressing large payloads; None when empty."""
+    if not metadata:
+        return None
+    
+    encoded = json.dumps(metadata, separators=(',', ':'))
+    if len(encoded) > METADATA_COMPRESS_THRESHOLD:
+        return zlib.compress(encoded.encode('utf-8'))
+    return encoded
+
+
+def _decode_metadata(value: Optional[Any]) -> Optional[Dict]:
+    """Decode a stored metadata value (compressed BLOB or JSON text)."""
+    if not value:
+        return None
+    
+    try:
+        if isinstance(value, bytes):
+            value = zlib.decompress(value)
+        if ORJSON_AVAILABLE:
+            return orjson.loads(value)
+        return json.loads(value)
+    except (zlib.error, ValueError):
+        return None
+
+
+def _close_connections(connections: List[sqlite3.Connection]) -> None:
+    """Close every connection in the list, ignoring ones already closed."""
+    while connections:
+        try:
+            connections.pop().close()
+        except sqlite3.Error:
+            pass
+
+
+class _ThreadConnections:
+    """
+    Connections opened by one thread.
+    
+    Kept only in the manager's thread-local storage, so when the thread ends
+    the holder is released and its connections are closed with it.
+    """
+    
+    def __init__(self):
+        self.conn: Optional[sqlite3.Connection] = None
+        self.read_conn: Optional[sqlite3.Connection] = None
+        self._opened: List[sqlite3.Connection] = []
+        # Also runs at interpreter exit for threads still alive then
+        self._finalizer = weakref.finalize(self, _close_connections, self._opened)
+    
+    def add(self, conn: sqlite3.Connection) -> sqlite3.Connection:
+        """Track a connection so it is closed with this holder."""
+        self._opened.append(conn)
+        return conn
+    
+    def close(self) -> None:
+        """Close this thread's connections now."""
+        self._finalizer()
+
+
+class _BloomFilter:
+    """
+    Fixed-size Bloom filter for fingerprint keys.
+    
+    Membership tests never give false negatives, so a miss proves a key was
+    never added. Keys are int, bytes or str as returned by encode_fingerprint().
+    """
+    
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+    
+    def _positions(self, key: Any):
+        """Bit positions for a key, via double hashing of one 128-bit digest."""
+        if isinstance(key, int):
+            key = key.to_bytes(8, 'big', signed=True)
+        elif isinstance(key, str):
+            key = key.encode('utf-8')
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+    
+    def add(self, key: Any) -> None:
+        """Add a key to the filter."""
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+    
+    def __contains__(self, key: Any) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
 
 @dataclass
 class ScrobbleEntry:
@@ -44,6 +330,9 @@ class DuplicateEntry:
     timestamp: int
     confidence: float
     id: Optional[int] = None
+    # Normalized artist/title as used by fuzzy matching, stored so they aren't recomputed
+    artist_norm: Optional[str] = None
+    title_norm: Optional[str] = None
 
 
 class DatabaseManager:
@@ -65,14 +354,40 @@ class DatabaseManager:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
-        self._lock = threading.Lock()
+        # Memory-mapped I/O size in bytes (0 disables it)
+        self.mmap_size = int(db_config.get('mmap_size', 256 * 1024 * 1024))
+        
+        # System stats rows to buffer before writing them in one transaction (1 = write-through)
+        self.stats_buffer_size = max(1, int(db_config.get('stats_buffer_size', 1)))
+        self._stats_buffer: List[Tuple] = []
+        self._stats_buffer_lock = threading.Lock()
+        
+        # One persistent connection per thread; WAL lets them read and write concurrently.
+        # The thread-local owns each thread's connections, so they close when it
+        # ends; the weak set only lets close() reach the ones still open.
+        self._tls = threading.local()
+        self._thread_connections: "weakref.WeakSet[_ThreadConnections]" = weakref.WeakSet()
+        self._connections_lock = threading.Lock()
+        
         self._initialize_database()
         
+        # Fingerprints in duplicate_cache, so find_duplicate can answer the common
+        # "never seen" case without a query. Writes made through this manager keep
+        # it current; it is rebuilt from the table on startup and expiry cleanup.
+        self._duplicate_filter_lock = threading.Lock()
+        self._rebuild_duplicate_filter()
+        
         logger.info(f"Database initialized at {self.db_path}")
     
     def _initialize_database(self):
         """Initialize database tables."""
         with self._get_connection() as conn:
+            # Page size only takes effect on a new database, and must be set before WAL
+            conn.execute('PRAGMA page_size=4096')
+            
+            # WAL is persistent, so switching once here covers all later connections
+            conn.execute('PRAGMA journal_mode=WAL')
+            
             # Scrobble queue table
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS scrobble_queue (
@@ -86,7 +401,7 @@ class DatabaseManager:
                     mbid TEXT,
                     retry_count INTEGER DEFAULT 0,
                     created_at INTEGER NOT NULL,
-                    metadata TEXT
+                    metadata BLOB
                 )
             ''')
             
@@ -104,22 +419,34 @@ class DatabaseManager:
                     scrobbled_at INTEGER NOT NULL,
                     recognition_provider TEXT,
                     recognition_confidence REAL,
-                    metadata TEXT
+                    metadata BLOB
                 )
             ''')
             
+            # Older versions declared fingerprint TEXT or BLOB; TEXT affinity would turn the
+            # integer keys back into strings, and the rows expire within one duplicate window
+            # anyway, so the cache is rebuilt rather than migrated
+            fingerprint_type = {row[1]: row[2] for row in conn.execute('PRAGMA table_info(duplicate_cache)')}.get('fingerprint')
+            if fingerprint_type not in (None, 'INTEGER'):
+                conn.execute('DROP TABLE duplicate_cache')
+            
             # Duplicate detection cache
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS duplicate_cache (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    fingerprint TEXT UNIQUE NOT NULL,
+                    fingerprint INTEGER UNIQUE NOT NULL,
                     artist TEXT NOT NULL,
                     title TEXT NOT NULL,
                     timestamp INTEGER NOT NULL,
                     confidence REAL NOT NULL,
-                    expires_at INTEGER NOT NULL
+                    expires_at INTEGER NOT NULL,
+                    artist_norm TEXT,
+                    title_norm TEXT
                 )
             ''')
+            # Databases created before the normalized columns existed; rows expire within
+            # one duplicate window, so old rows are left NULL rather than backfilled
+            self._add_missing_columns(conn, 'duplicate_cache', {'artist_norm': 'TEXT', 'title_norm': 'TEXT'})
             
             # System statistics
             conn.execute('''
@@ -148,25 +475,185 @@ class DatabaseManager:
             # Create indexes for better performance
             conn.execute('CREATE INDEX IF NOT EXISTS idx_scrobble_queue_created_at ON scrobble_queue(created_at)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_scrobble_history_timestamp ON scrobble_history(timestamp)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_duplicate_cache_fingerprint ON duplicate_cache(fingerprint)')
+            # Covering indexes for the scrobbled_at range scans in get_scrobble_stats; their
+            # scrobbled_at prefix also serves get_recent_scrobbles ordering
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_scrobble_history_scrobbled_artist ON scrobble_history(scrobbled_at, artist)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_scrobble_history_scrobbled_provider ON scrobble_history(scrobbled_at, recognition_provider)')
+            # fingerprint is UNIQUE, which already gives it an index; drop the old duplicate one
+            conn.execute('DROP INDEX IF EXISTS idx_duplicate_cache_fingerprint')
+            # expires_at is NOT NULL, so a partial index would hold the same rows; the plain index
+            # already makes expiry cleanup a range delete over only the expired entries
             conn.execute('CREATE INDEX IF NOT EXISTS idx_duplicate_cache_expires_at ON duplicate_cache(expires_at)')
+            # Lets "newest unexpired fingerprints" walk timestamp order and stop at the LIMIT;
+            # an (expires_at, timestamp) index would still need a sort after the range search
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_duplicate_cache_timestamp ON duplicate_cache(timestamp)')
             conn.execute('CREATE INDEX IF NOT EXISTS idx_system_stats_timestamp ON system_stats(timestamp)')
             
+            # Trigger-maintained queue length, so get_queue_size doesn't count rows
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS queue_counts (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    n INTEGER NOT NULL
+                )
+            ''')
+            
+            self._begin_immediate(conn)
+            conn.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_scrobble_queue_count_insert
+                AFTER INSERT ON scrobble_queue
+                BEGIN
+                    UPDATE queue_counts SET n = n + 1 WHERE id = 0;
+                END
+            ''')
+            conn.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_scrobble_queue_count_delete
+                AFTER DELETE ON scrobble_queue
+                BEGIN
+                    UPDATE queue_counts SET n = n - 1 WHERE id = 0;
+                END
+            ''')
+            # Resync once at startup in case the triggers are new or the file was edited externally
+            conn.execute('INSERT OR REPLACE INTO queue_counts (id, n) SELECT 0, COUNT(*) FROM scrobble_queue')
             conn.commit()
     
+    @staticmethod
+    def _add_missing_columns(conn: sqlite3.Connection, table: str, columns: Dict[str, str]):
+        """
+        Add columns that an older schema version of a table lacks.
+        
+        Args:
+            conn: Database connection
+            table: Table to migrate
+            columns: Column name to SQL type
+        """
+        existing = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+        for name, sql_type in columns.items():
+            if name not in existing:
+                conn.execute(f'ALTER TABLE {table} ADD COLUMN {name} {sql_type}')
+    
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """
+        Open and configure a new connection for the calling thread.
+        
+        Args:
+            read_only: Refuse writes on this connection (PRAGMA query_only)
+        """
+        # check_same_thread=False only so close() can run from another thread;
+        # each connection is still used by the thread that opened it
+        # Autocommit: single statements commit on their own and reads never hold a
+        # transaction open; multi-statement writes use _write_transaction
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE_SIZE, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        conn.execute(f'PRAGMA mmap_size={self.mmap_size}')
+        if read_only:
+            conn.execute('PRAGMA query_only=ON')
+        return conn
+    
+    def _local_connections(self) -> _ThreadConnections:
+        """Get the calling thread's connection holder, creating it on first use."""
+        holder = getattr(self._tls, 'holder', None)
+        if holder is None:
+            holder = self._tls.holder = _ThreadConnections()
+            with self._connections_lock:
+                self._thread_connections.add(holder)
+        return holder
+    
     @contextmanager
     def _get_connection(self):
-        """Get database connection with proper locking."""
-        with self._lock:
-            conn = sqlite3.connect(str(self.db_path), timeout=30.0)
-            conn.row_factory = sqlite3.Row
+        """Get this thread's database connection, opening it on first use."""
+        holder = self._local_connections()
+        conn = holder.conn
+        if conn is None:
+            conn = holder.conn = holder.add(self._connect())
+        
+        try:
+            yield conn
+        finally:
+            # An explicit transaction left open (e.g. by an exception) is discarded
+            if conn.in_transaction:
+                conn.rollback()
+    
+    @contextmanager
+    def _get_read_connection(self):
+        """Get this thread's read-only connection, opening it on first use."""
+        holder = self._local_connections()
+        conn = holder.read_conn
+        if conn is None:
+            conn = holder.read_conn = holder.add(self._connect(read_only=True))
+        
+        yield conn
+    
+    @staticmethod
+    def _begin_immediate(conn: sqlite3.Connection) -> None:
+        """Take the write lock up front, retrying with backoff if the database stays locked."""
+        for attempt in range(WRITE_RETRIES + 1):
             try:
-                yield conn
-            finally:
-                conn.close()
+                conn.execute('BEGIN IMMEDIATE')
+                return
+            except sqlite3.OperationalError as e:
+                if attempt == WRITE_RETRIES or 'locked' not in str(e):
+                    raise
+                logger.debug(f"Database locked, retrying write ({attempt + 1}/{WRITE_RETRIES})")
+                time.sleep(WRITE_RETRY_BACKOFF * (2 ** attempt))
+    
+    @contextmanager
+    def _write_transaction(self):
+        """Run a block inside a BEGIN IMMEDIATE transaction, committing on success."""
+        with self._get_connection() as conn:
+            self._begin_immediate(conn)
+            yield conn
+            conn.commit()
+    
+    def close(self) -> None:
+        """Flush buffered stats and close all cached connections. Threads reconnect on next use."""
+        self.flush_system_stats()
+        with self._connections_lock:
+            self._tls = threading.local()
+            holders = list(self._thread_connections)
+        for holder in holders:
+            holder.close()
+    
+    def _insert_many(self, sql: str, rows: List[Tuple]) -> List[int]:
+        """
+        Insert rows with executemany inside a single write transaction.
+        
+        Args:
+            sql: INSERT statement into an AUTOINCREMENT table
+            rows: Parameter tuples, one per row
+            
+        Returns:
+            IDs of the inserted rows, in order
+        """
+        if not rows:
+            return []
+        
+        with self._write_transaction() as conn:
+            conn.executemany(sql, rows)
+            # The write lock is held for the whole batch, so AUTOINCREMENT ids are consecutive
+            last_id = conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+        
+        return list(range(last_id - len(rows) + 1, last_id + 1))
     
     # Scrobble Queue Operations
     
+    @staticmethod
+    def _queue_params(entry: ScrobbleEntry, metadata: Optional[Dict], now: int) -> Tuple:
+        """Fill in queue timestamps and build the INSERT parameters for an entry."""
+        if entry.created_at is None:
+            entry.created_at = now
+        
+        if entry.timestamp is None:
+            entry.timestamp = entry.created_at
+        
+        return (
+            entry.artist, entry.title, entry.album, entry.timestamp,
+            entry.duration, entry.track_number, entry.mbid,
+            entry.retry_count, entry.created_at, _encode_metadata(metadata)
+        )
+    
     def add_to_scrobble_queue(self, entry: ScrobbleEntry, metadata: Optional[Dict] = None) -> int:
         """
         Add entry to scrobble queue.
@@ -178,30 +665,36 @@ class DatabaseManager:
         Returns:
             ID of inserted entry
         """
-        if entry.created_at is None:
-            entry.created_at = int(time.time())
-        
-        if entry.timestamp is None:
-            entry.timestamp = entry.created_at
-        
-        metadata_json = json.dumps(metadata) if metadata else None
+        params = self._queue_params(entry, metadata, _now_s())
         
         with self._get_connection() as conn:
-            cursor = conn.execute('''
-                INSERT INTO scrobble_queue 
-                (artist, title, album, timestamp, duration, track_number, mbid, retry_count, created_at, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                entry.artist, entry.title, entry.album, entry.timestamp,
-                entry.duration, entry.track_number, entry.mbid,
-                entry.retry_count, entry.created_at, metadata_json
-            ))
-            conn.commit()
+            cursor = conn.execute(_SQL_INSERT_QUEUE, params)
             entry.id = cursor.lastrowid
             
         logger.debug(f"Added to scrobble queue: {entry.artist} - {entry.title}")
         return entry.id
     
+    def add_many_to_scrobble_queue(self, entries: List[Tuple[ScrobbleEntry, Optional[Dict]]]) -> List[int]:
+        """
+        Add several entries to the scrobble queue in one transaction.
+        
+        Args:
+            entries: List of (ScrobbleEntry, metadata) pairs
+            
+        Returns:
+            IDs of inserted entries, in order
+        """
+        now = _now_s()
+        ids = self._insert_many(_SQL_INSERT_QUEUE, [
+            self._queue_params(entry, metadata, now) for entry, metadata in entries
+        ])
+        
+        for (entry, _), entry_id in zip(entries, ids):
+            entry.id = entry_id
+        
+        logger.debug(f"Added {len(ids)} entries to scrobble queue")
+        return ids
+    
     def get_scrobble_queue(self, limit: int = 100) -> List[ScrobbleEntry]:
         """
         Get entries from scrobble queue.
@@ -212,30 +705,82 @@ class DatabaseManager:
         Returns:
             List of ScrobbleEntry objects
         """
-        with self._get_connection() as conn:
+        with self._get_read_connection() as conn:
             cursor = conn.execute('''
                 SELECT * FROM scrobble_queue 
                 ORDER BY created_at ASC 
                 LIMIT ?
             ''', (limit,))
             
-            entries = []
-            for row in cursor.fetchall():
-                entry = ScrobbleEntry(
-                    id=row['id'],
-                    artist=row['artist'],
-                    title=row['title'],
-                    album=row['album'],
-                    timestamp=row['timestamp'],
-                    duration=row['duration'],
-                    track_number=row['track_number'],
-                    mbid=row['mbid'],
-                    retry_count=row['retry_count'],
-                    created_at=row['created_at']
-                )
-                entries.append(entry)
+            return [self._row_to_entry(row) for row in cursor.fetchall()]
+    
+    def get_scrobble_queue_dicts(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Get queue entries as plain dictionaries for display.
+        
+        Skips building ScrobbleEntry objects for callers that only serialize the rows.
+        
+        Args:
+            limit: Maximum number of entries to return
             
-            return entries
+        Returns:
+            List of queue entry dictionaries, oldest first
+        """
+        with self._get_read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(_SQL_QUEUE_VIEW, (limit,))
+            return [dict(zip(_QUEUE_VIEW_COLUMNS, row)) for row in cursor]
+    
+    @staticmethod
+    def _row_to_entry(row: sqlite3.Row) -> ScrobbleEntry:
+        """Build a ScrobbleEntry from a scrobble_queue row."""
+        return ScrobbleEntry(
+            id=row['id'],
+            artist=row['artist'],
+            title=row['title'],
+            album=row['album'],
+            timestamp=row['timestamp'],
+            duration=row['duration'],
+            track_number=row['track_number'],
+            mbid=row['mbid'],
+            retry_count=row['retry_count'],
+            created_at=row['created_at']
+        )
+    
+    def pop_scrobble_queue(self, limit: int = 100) -> List[ScrobbleEntry]:
+        """
+        Atomically remove and return the oldest entries from the scrobble queue.
+        
+        Args:
+            limit: Maximum number of entries to dequeue
+            
+        Returns:
+            List of removed ScrobbleEntry objects, oldest first
+        """
+        with self._write_transaction() as conn:
+            if _HAS_RETURNING:
+                rows = conn.execute('''
+                    DELETE FROM scrobble_queue
+                    WHERE id IN (
+                        SELECT id FROM scrobble_queue
+                        ORDER BY created_at ASC, id ASC
+                        LIMIT ?
+                    )
+                    RETURNING *
+                ''', (limit,)).fetchall()
+            else:
+                rows = conn.execute('''
+                    SELECT * FROM scrobble_queue
+                    ORDER BY created_at ASC, id ASC
+                    LIMIT ?
+                ''', (limit,)).fetchall()
+                conn.executemany('DELETE FROM scrobble_queue WHERE id = ?', [(row['id'],) for row in rows])
+        
+        # RETURNING does not guarantee row order
+        entries = [self._row_to_entry(row) for row in rows]
+        entries.sort(key=lambda entry: (entry.created_at, entry.id))
+        return entries
     
     def remove_from_scrobble_queue(self, entry_id: int) -> bool:
         """
@@ -249,7 +794,6 @@ class DatabaseManager:
         """
         with self._get_connection() as conn:
             cursor = conn.execute('DELETE FROM scrobble_queue WHERE id = ?', (entry_id,))
-            conn.commit()
             return cursor.rowcount > 0
     
     def increment_retry_count(self, entry_id: int) -> bool:
@@ -268,17 +812,72 @@ class DatabaseManager:
                 SET retry_count = retry_count + 1 
                 WHERE id = ?
             ''', (entry_id,))
-            conn.commit()
             return cursor.rowcount > 0
     
+    def finish_scrobble_batch(self, scrobbled: List[ScrobbleEntry], retry_ids: List[int],
+                              failed_ids: List[int], provider: str = 'lastfm',
+                              confidence: float = 1.0) -> int:
+        """
+        Record the outcome of a queue drain in one transaction.
+        
+        Scrobbled entries move from the queue to history, retried entries have
+        their retry count incremented and failed entries are removed.
+        
+        Args:
+            scrobbled: Queue entries that were scrobbled
+            retry_ids: IDs of entries to retry later
+            failed_ids: IDs of entries given up on
+            provider: Provider recorded in history for scrobbled entries
+            confidence: Confidence recorded in history for scrobbled entries
+            
+        Returns:
+            Number of entries removed from the queue
+        """
+        scrobbled_at = _now_s()
+        
+        with self._write_transaction() as conn:
+            conn.executemany(_SQL_INSERT_HISTORY, [
+                self._history_params(entry, provider, confidence, None, scrobbled_at)
+                for entry in scrobbled
+            ])
+            conn.executemany('UPDATE scrobble_queue SET retry_count = retry_count + 1 WHERE id = ?',
+                             [(entry_id,) for entry_id in retry_ids])
+            removed = conn.executemany('DELETE FROM scrobble_queue WHERE id = ?', [
+                (entry_id,) for entry_id in [entry.id for entry in scrobbled] + list(failed_ids)
+            ]).rowcount
+        
+        logger.debug(f"Queue batch finished: {len(scrobbled)} scrobbled, "
+                     f"{len(retry_ids)} to retry, {len(failed_ids)} failed")
+        return removed
+    
+    def clear_scrobble_queue(self) -> int:
+        """
+        Remove every entry from the scrobble queue.
+        
+        Returns:
+            Number of entries removed
+        """
+        with self._get_connection() as conn:
+            return conn.execute('DELETE FROM scrobble_queue').rowcount
+    
     def get_queue_size(self) -> int:
         """Get current scrobble queue size."""
-        with self._get_connection() as conn:
-            cursor = conn.execute('SELECT COUNT(*) FROM scrobble_queue')
+        with self._get_read_connection() as conn:
+            cursor = conn.execute('SELECT n FROM queue_counts WHERE id = 0')
             return cursor.fetchone()[0]
     
     # Scrobble History Operations
     
+    @staticmethod
+    def _history_params(entry: ScrobbleEntry, provider: str, confidence: float,
+                        metadata: Optional[Dict], scrobbled_at: int) -> Tuple:
+        """Build the INSERT parameters for a history entry."""
+        return (
+            entry.artist, entry.title, entry.album, entry.timestamp,
+            entry.duration, entry.track_number, entry.mbid,
+            scrobbled_at, provider, confidence, _encode_metadata(metadata)
+        )
+    
     def add_to_history(self, entry: ScrobbleEntry, provider: str, confidence: float, metadata: Optional[Dict] = None) -> int:
         """
         Add successfully scrobbled entry to history.
@@ -292,55 +891,86 @@ class DatabaseManager:
         Returns:
             ID of inserted history entry
         """
-        scrobbled_at = int(time.time())
-        metadata_json = json.dumps(metadata) if metadata else None
+        params = self._history_params(entry, provider, confidence, metadata, _now_s())
         
         with self._get_connection() as conn:
-            cursor = conn.execute('''
-                INSERT INTO scrobble_history 
-                (artist, title, album, timestamp, duration, track_number, mbid, 
-                 scrobbled_at, recognition_provider, recognition_confidence, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                entry.artist, entry.title, entry.album, entry.timestamp,
-                entry.duration, entry.track_number, entry.mbid,
-                scrobbled_at, provider, confidence, metadata_json
-            ))
-            conn.commit()
+            cursor = conn.execute(_SQL_INSERT_HISTORY, params)
             history_id = cursor.lastrowid
             
         logger.info(f"Added to scrobble history: {entry.artist} - {entry.title}")
         return history_id
     
-    def get_recent_scrobbles(self, limit: int = 50) -> List[Dict[str, Any]]:
+    def add_many_to_history(self, entries: List[Tuple[ScrobbleEntry, str, float, Optional[Dict]]]) -> List[int]:
+        """
+        Add several scrobbled entries to history in one transaction.
+        
+        Args:
+            entries: List of (ScrobbleEntry, provider, confidence, metadata) tuples
+            
+        Returns:
+            IDs of inserted history entries, in order
+        """
+        scrobbled_at = _now_s()
+        ids = self._insert_many(_SQL_INSERT_HISTORY, [
+            self._history_params(entry, provider, confidence, metadata, scrobbled_at)
+            for entry, provider, confidence, metadata in entries
+        ])
+        
+        logger.info(f"Added {len(ids)} entries to scrobble history")
+        return ids
+    
+    def get_recent_scrobbles(self, limit: int = 50, include_metadata: bool = True) -> List[Dict[str, Any]]:
         """
         Get recent scrobbles from history.
         
         Args:
             limit: Maximum number of entries to return
+            include_metadata: Read and decode the metadata column
             
         Returns:
             List of scrobble dictionaries
         """
-        with self._get_connection() as conn:
-            cursor = conn.execute('''
-                SELECT * FROM scrobble_history 
-                ORDER BY scrobbled_at DESC 
-                LIMIT ?
-            ''', (limit,))
+        with self._get_read_connection() as conn:
+            # Plain tuples zipped with a fixed column list are cheaper than dict(sqlite3.Row)
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            
+            if not include_metadata:
+                cursor.execute(_SQL_RECENT_HISTORY, (limit,))
+                return [dict(zip(_HISTORY_COLUMNS, row)) for row in cursor]
             
+            cursor.execute(_SQL_RECENT_HISTORY_WITH_METADATA, (limit,))
+            
+            # Iterate the cursor directly rather than materializing fetchall()
             scrobbles = []
-            for row in cursor.fetchall():
-                scrobble = dict(row)
-                if scrobble['metadata']:
-                    try:
-                        scrobble['metadata'] = json.loads(scrobble['metadata'])
-                    except json.JSONDecodeError:
-                        scrobble['metadata'] = None
+            for row in cursor:
+                scrobble = dict(zip(_HISTORY_COLUMNS, row))
+                scrobble['metadata'] = _decode_metadata(row[-1])
                 scrobbles.append(scrobble)
             
             return scrobbles
     
+    def get_recent_scrobbles_since(self, since: int, limit: int = 100, after_id: int = 0) -> List[Dict[str, Any]]:
+        """
+        Get scrobbles from history made at or after a given time.
+        
+        The time filter runs in SQL on the scrobbled_at indexes, so only
+        scrobbles inside the window are read. Metadata is not included.
+        
+        Args:
+            since: Unix timestamp of the oldest scrobble to include
+            limit: Maximum number of entries to return
+            after_id: Only return entries with a larger history id
+            
+        Returns:
+            List of scrobble dictionaries, newest first
+        """
+        with self._get_read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(_SQL_RECENT_HISTORY_SINCE, (since, after_id, limit))
+            return [dict(zip(_HISTORY_COLUMNS, row)) for row in cursor]
+    
     def get_scrobble_stats(self, days: int = 30) -> Dict[str, Any]:
         """
         Get scrobble statistics for the specified period.
@@ -351,41 +981,20 @@ class DatabaseManager:
         Returns:
             Dictionary with statistics
         """
-        since_timestamp = int(time.time()) - (days * 24 * 60 * 60)
+        since_timestamp = _now_s() - (days * 24 * 60 * 60)
         
-        with self._get_connection() as conn:
-            # Total scrobbles
-            cursor = conn.execute('''
-                SELECT COUNT(*) FROM scrobble_history 
-                WHERE scrobbled_at >= ?
-            ''', (since_timestamp,))
-            total_scrobbles = cursor.fetchone()[0]
-            
-            # Unique artists
-            cursor = conn.execute('''
-                SELECT COUNT(DISTINCT artist) FROM scrobble_history 
-                WHERE scrobbled_at >= ?
-            ''', (since_timestamp,))
-            unique_artists = cursor.fetchone()[0]
-            
-            # Top artists
-            cursor = conn.execute('''
-                SELECT artist, COUNT(*) as count FROM scrobble_history 
-                WHERE scrobbled_at >= ?
-                GROUP BY artist 
-                ORDER BY count DESC 
-                LIMIT 10
-            ''', (since_timestamp,))
-            top_artists = [dict(row) for row in cursor.fetchall()]
-            
-            # Recognition providers
-            cursor = conn.execute('''
-                SELECT recognition_provider, COUNT(*) as count FROM scrobble_history 
-                WHERE scrobbled_at >= ?
-                GROUP BY recognition_provider 
-                ORDER BY count DESC
-            ''', (since_timestamp,))
-            providers = [dict(row) for row in cursor.fetchall()]
+        total_scrobbles = unique_artists = 0
+        top_artists = []
+        providers = []
+        
+        with self._get_read_connection() as conn:
+            for kind, name, count, distinct in conn.execute(_SQL_SCROBBLE_STATS, (since_timestamp,)):
+                if kind == 'total':
+                    total_scrobbles, unique_artists = count, distinct
+                elif kind == 'artist':
+                    top_artists.append({'artist': name, 'count': count})
+                else:
+                    providers.append({'recognition_provider': name, 'count': count})
             
             return {
                 'period_days': days,
@@ -397,30 +1006,58 @@ class DatabaseManager:
     
     # Duplicate Detection Operations
     
+    def _rebuild_duplicate_filter(self, empty: bool = False):
+        """
+        Replace the Bloom filter with one built from the current duplicate_cache.
+        
+        Args:
+            empty: Start from an empty filter instead of reading the table
+        """
+        duplicate_filter = _BloomFilter(DUPLICATE_FILTER_CAPACITY, DUPLICATE_FILTER_ERROR_RATE)
+        
+        # Held while reading so an entry committed meanwhile is added to the new filter
+        with self._duplicate_filter_lock:
+            if not empty:
+                with self._get_read_connection() as conn:
+                    for (fingerprint,) in conn.execute(
+                        'SELECT fingerprint FROM duplicate_cache WHERE expires_at > ?', (_now_s(),)
+                    ):
+                        duplicate_filter.add(fingerprint)
+            self._duplicate_filter = duplicate_filter
+    
     def add_duplicate_entry(self, entry: DuplicateEntry, ttl_seconds: int = 900) -> int:
         """
         Add entry to duplicate detection cache.
         
+        An existing entry with the same fingerprint is updated in place,
+        keeping its row ID.
+        
         Args:
             entry: DuplicateEntry to add
             ttl_seconds: Time to live in seconds
             
         Returns:
-            ID of inserted entry
+            ID of inserted or updated entry
         """
-        expires_at = int(time.time()) + ttl_seconds
+        expires_at = _now_s() + ttl_seconds
+        fingerprint_key = encode_fingerprint(entry.fingerprint)
+        params = (
+            fingerprint_key, entry.artist, entry.title,
+            entry.timestamp, entry.confidence, expires_at,
+            entry.artist_norm, entry.title_norm
+        )
         
-        with self._get_connection() as conn:
-            cursor = conn.execute('''
-                INSERT OR REPLACE INTO duplicate_cache 
-                (fingerprint, artist, title, timestamp, confidence, expires_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                entry.fingerprint, entry.artist, entry.title,
-                entry.timestamp, entry.confidence, expires_at
-            ))
-            conn.commit()
-            return cursor.lastrowid
+        with self._write_transaction() as conn:
+            if _HAS_RETURNING:
+                entry_id = conn.execute(_SQL_UPSERT_DUPLICATE_RETURNING, params).fetchone()[0]
+            else:
+                conn.execute(_SQL_UPSERT_DUPLICATE, params)
+                entry_id = conn.execute('SELECT id FROM duplicate_cache WHERE fingerprint = ?',
+                                        (fingerprint_key,)).fetchone()[0]
+        
+        with self._duplicate_filter_lock:
+            self._duplicate_filter.add(fingerprint_key)
+        return entry_id
     
     def find_duplicate(self, fingerprint: str) -> Optional[DuplicateEntry]:
         """
@@ -432,26 +1069,49 @@ class DatabaseManager:
         Returns:
             DuplicateEntry if found, None otherwise
         """
-        current_time = int(time.time())
+        fingerprint_key = encode_fingerprint(fingerprint)
+        if fingerprint_key not in self._duplicate_filter:
+            return None
         
-        with self._get_connection() as conn:
-            cursor = conn.execute('''
-                SELECT * FROM duplicate_cache 
-                WHERE fingerprint = ? AND expires_at > ?
-            ''', (fingerprint, current_time))
+        current_time = _now_s()
+        
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(_SQL_FIND_DUPLICATE, (fingerprint_key, current_time))
             
             row = cursor.fetchone()
             if row:
-                return DuplicateEntry(
-                    id=row['id'],
-                    fingerprint=row['fingerprint'],
-                    artist=row['artist'],
-                    title=row['title'],
-                    timestamp=row['timestamp'],
-                    confidence=row['confidence']
-                )
+                return self._row_to_duplicate(row)
             return None
     
+    def get_recent_duplicates(self, since: int, limit: int = 100) -> List[DuplicateEntry]:
+        """
+        Get unexpired duplicate cache entries added at or after a given time.
+        
+        Args:
+            since: Unix timestamp of the oldest entry to include
+            limit: Maximum number of entries to return
+            
+        Returns:
+            List of DuplicateEntry objects, newest first
+        """
+        with self._get_read_connection() as conn:
+            cursor = conn.execute(_SQL_RECENT_DUPLICATES, (since, _now_s(), limit))
+            return [self._row_to_duplicate(row) for row in cursor]
+    
+    @staticmethod
+    def _row_to_duplicate(row: sqlite3.Row) -> DuplicateEntry:
+        """Build a DuplicateEntry from a duplicate_cache row."""
+        return DuplicateEntry(
+            id=row['id'],
+            fingerprint=decode_fingerprint(row['fingerprint']),
+            artist=row['artist'],
+            title=row['title'],
+            timestamp=row['timestamp'],
+            confidence=row['confidence'],
+            artist_norm=row['artist_norm'],
+            title_norm=row['title_norm']
+        )
+    
     def cleanup_expired_duplicates(self) -> int:
         """
         Clean up expired duplicate entries.
@@ -459,49 +1119,109 @@ class DatabaseManager:
         Returns:
             Number of entries cleaned up
         """
-        current_time = int(time.time())
+        current_time = _now_s()
         
         with self._get_connection() as conn:
-            cursor = conn.execute('DELETE FROM duplicate_cache WHERE expires_at <= ?', (current_time,))
-            conn.commit()
-            return cursor.rowcount
+            deleted = self._delete_in_batches(conn, 'duplicate_cache', 'expires_at <= ?', (current_time,))
+        
+        # Bloom filters can't remove keys; start over from what is left
+        if deleted:
+            self._rebuild_duplicate_filter()
+        return deleted
+    
+    def clear_duplicate_cache(self) -> int:
+        """
+        Remove every entry from the duplicate detection cache.
+        
+        Returns:
+            Number of entries removed
+        """
+        with self._get_connection() as conn:
+            # A single unqualified DELETE lets SQLite drop the table's pages wholesale
+            count = conn.execute('DELETE FROM duplicate_cache').rowcount
+        
+        self._rebuild_duplicate_filter(empty=True)
+        return count
     
     # System Statistics Operations
     
-    def add_system_stats(self, stats: Dict[str, Any]) -> int:
+    @staticmethod
+    def _stats_params(stats: Dict[str, Any], timestamp: int) -> Tuple:
+        """Build the INSERT parameters for a system statistics entry."""
+        return (
+            timestamp,
+            stats.get('cpu_usage'),
+            stats.get('memory_usage'),
+            stats.get('disk_usage'),
+            stats.get('temperature'),
+            stats.get('recognition_count', 0),
+            stats.get('scrobble_count', 0),
+            stats.get('error_count', 0)
+        )
+    
+    def add_system_stats(self, stats: Dict[str, Any]) -> Optional[int]:
         """
         Add system statistics entry.
         
+        With stats_buffer_size > 1 the entry is buffered in memory and written
+        together with the others once the buffer is full. Stats are not
+        authoritative, so a crash may lose at most one buffer.
+        
         Args:
             stats: Dictionary of system statistics
             
         Returns:
-            ID of inserted entry
+            ID of inserted entry, or None if it was buffered
         """
-        timestamp = int(time.time())
+        params = self._stats_params(stats, _now_s())
+        
+        if self.stats_buffer_size > 1:
+            with self._stats_buffer_lock:
+                self._stats_buffer.append(params)
+                if len(self._stats_buffer) < self.stats_buffer_size:
+                    return None
+            self.flush_system_stats()
+            return None
         
         with self._get_connection() as conn:
-            cursor = conn.execute('''
-                INSERT INTO system_stats 
-                (timestamp, cpu_usage, memory_usage, disk_usage, temperature,
-                 recognition_count, scrobble_count, error_count)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                timestamp,
-                stats.get('cpu_usage'),
-                stats.get('memory_usage'),
-                stats.get('disk_usage'),
-                stats.get('temperature'),
-                stats.get('recognition_count', 0),
-                stats.get('scrobble_count', 0),
-                stats.get('error_count', 0)
-            ))
-            conn.commit()
+            cursor = conn.execute(_SQL_INSERT_STATS, params)
             return cursor.lastrowid
     
+    def flush_system_stats(self) -> int:
+        """
+        Write any buffered system statistics in a single transaction.
+        
+        Returns:
+            Number of entries written
+        """
+        with self._stats_buffer_lock:
+            rows, self._stats_buffer = self._stats_buffer, []
+        
+        return len(self._insert_many(_SQL_INSERT_STATS, rows))
+    
+    def add_many_system_stats(self, stats_list: List[Dict[str, Any]]) -> List[int]:
+        """
+        Add several system statistics entries in one transaction.
+        
+        Entries may carry their own 'timestamp'; otherwise the current time is used.
+        
+        Args:
+            stats_list: List of system statistics dictionaries
+            
+        Returns:
+            IDs of inserted entries, in order
+        """
+        now = _now_s()
+        return self._insert_many(_SQL_INSERT_STATS, [
+            self._stats_params(stats, stats.get('timestamp') or now) for stats in stats_list
+        ])
+    
     def get_recent_stats(self, hours: int = 24) -> List[Dict[str, Any]]:
         """
-        Get recent system statistics.
+        Get recent system statistics, newest first.
+        
+        Buffered entries are included without being written out; they have
+        no id yet, so theirs is None.
         
         Args:
             hours: Number of hours to include
@@ -509,16 +1229,19 @@ class DatabaseManager:
         Returns:
             List of statistics dictionaries
         """
-        since_timestamp = int(time.time()) - (hours * 60 * 60)
+        since_timestamp = _now_s() - (hours * 60 * 60)
         
-        with self._get_connection() as conn:
-            cursor = conn.execute('''
-                SELECT * FROM system_stats 
-                WHERE timestamp >= ?
-                ORDER BY timestamp DESC
-            ''', (since_timestamp,))
+        with self._stats_buffer_lock:
+            buffered = [row for row in self._stats_buffer if row[0] >= since_timestamp]
+        
+        with self._get_read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(_SQL_RECENT_STATS, (since_timestamp,))
             
-            return [dict(row) for row in cursor.fetchall()]
+            recent = [dict(zip(_STATS_COLUMNS, (None, *row))) for row in reversed(buffered)]
+            recent.extend(dict(zip(_STATS_COLUMNS, row)) for row in cursor)
+            return recent
     
     # Database Maintenance
     
@@ -532,34 +1255,63 @@ class DatabaseManager:
         Returns:
             Dictionary with cleanup counts
         """
-        cutoff_timestamp = int(time.time()) - (days * 24 * 60 * 60)
+        current_time = _now_s()
+        cutoff_timestamp = current_time - (days * 24 * 60 * 60)
         cleanup_counts = {}
         
         with self._get_connection() as conn:
             # Clean up old system stats
-            cursor = conn.execute('DELETE FROM system_stats WHERE timestamp < ?', (cutoff_timestamp,))
-            cleanup_counts['system_stats'] = cursor.rowcount
+            cleanup_counts['system_stats'] = self._delete_in_batches(
+                conn, 'system_stats', 'timestamp < ?', (cutoff_timestamp,))
             
             # Clean up expired duplicates (do it directly here to avoid nested connections)
-            current_time = int(time.time())
-            cursor = conn.execute('DELETE FROM duplicate_cache WHERE expires_at <= ?', (current_time,))
-            cleanup_counts['duplicate_cache'] = cursor.rowcount
+            cleanup_counts['duplicate_cache'] = self._delete_in_batches(
+                conn, 'duplicate_cache', 'expires_at <= ?', (current_time,))
             
-            conn.commit()
+            # Keep the WAL file from growing without bound
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
         
         logger.info(f"Database cleanup completed: {cleanup_counts}")
         return cleanup_counts
     
+    @staticmethod
+    def _delete_in_batches(conn: sqlite3.Connection, table: str, where: str, params: Tuple,
+                           batch_size: Optional[int] = None) -> int:
+        """
+        Delete matching rows in fixed-size transactions.
+        
+        Args:
+            conn: Connection to use
+            table: Table name (trusted, not user input)
+            where: WHERE clause with ? placeholders (trusted, not user input)
+            params: Parameters for the WHERE clause
+            batch_size: Rows per transaction (default CLEANUP_BATCH_SIZE)
+            
+        Returns:
+            Total number of rows deleted
+        """
+        batch_size = batch_size or CLEANUP_BATCH_SIZE
+        sql = f'DELETE FROM {table} WHERE rowid IN (SELECT rowid FROM {table} WHERE {where} LIMIT ?)'
+        
+        # Each batch is its own autocommit transaction
+        total = 0
+        while True:
+            deleted = conn.execute(sql, (*params, batch_size)).rowcount
+            total += deleted
+            if deleted < batch_size:
+                return total
+    
     def vacuum_database(self):
         """Vacuum database to reclaim space."""
         with self._get_connection() as conn:
             conn.execute('VACUUM')
-            conn.commit()
+            # Refresh planner statistics so the covering indexes get picked
+            conn.execute('ANALYZE')
         logger.info("Database vacuumed")
     
     def get_database_stats(self) -> Dict[str, Any]:
-        """Get database statistics."""
-        with self._get_connection() as conn:
+        """Get database statistics; buffered system stats count as rows."""
+        with self._get_read_connection() as conn:
             stats = {}
             
             # Table row counts
@@ -567,11 +1319,32 @@ class DatabaseManager:
                 cursor = conn.execute(f'SELECT COUNT(*) FROM {table}')
                 stats[f'{table}_count'] = cursor.fetchone()[0]
             
+            with self._stats_buffer_lock:
+                stats['system_stats_count'] += len(self._stats_buffer)
+            
             # Database file size
             stats['file_size'] = self.db_path.stat().st_size if self.db_path.exists() else 0
             
             return stats
     
+    def _default_backup_path(self) -> str:
+        """Build a timestamped backup path next to the database."""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        return str(self.db_path.parent / f"vinyl_recognizer_backup_{timestamp}.db")
+    
+    @staticmethod
+    def _copy_to(source: sqlite3.Connection, backup_path: str) -> None:
+        """Copy the database in small steps so other connections can interleave."""
+        def progress(status, remaining, total):
+            logger.debug(f"Database backup: {total - remaining}/{total} pages copied")
+        
+        backup_conn = sqlite3.connect(backup_path)
+        try:
+            source.backup(backup_conn, pages=BACKUP_PAGES_PER_STEP, progress=progress,
+                          sleep=BACKUP_STEP_SLEEP)
+        finally:
+            backup_conn.close()
+    
     def backup_database(self, backup_path: Optional[str] = None) -> str:
         """
         Create database backup.
@@ -583,13 +1356,44 @@ class DatabaseManager:
             Path to backup file
         """
         if backup_path is None:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            backup_path = str(self.db_path.parent / f"vinyl_recognizer_backup_{timestamp}.db")
+            backup_path = self._default_backup_path()
         
         with self._get_connection() as conn:
-            backup_conn = sqlite3.connect(backup_path)
-            conn.backup(backup_conn)
-            backup_conn.close()
+            self._copy_to(conn, backup_path)
         
         logger.info(f"Database backed up to {backup_path}")
-        return backup_path
\ No newline at end of file
+        return backup_path
+    
+    def backup_database_async(self, backup_path: Optional[str] = None) -> Future:
+        """
+        Create database backup in a background thread.
+        
+        Args:
+            backup_path: Optional backup file path
+            
+        Returns:
+            Future resolving to the path of the backup file
+        """
+        if backup_path is None:
+            backup_path = self._default_backup_path()
+        
+        future: Future = Future()
+        
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                # Short-lived connection so the worker thread doesn't leave one cached
+                source = sqlite3.connect(str(self.db_path), timeout=30.0)
+                try:
+                    self._copy_to(source, backup_path)
+                finally:
+                    source.close()
+                logger.info(f"Database backed up to {backup_path}")
+                future.set_result(backup_path)
+            except Exception as e:
+                logger.error(f"Database backup failed: {e}")
+                future.set_exception(e)
+        
+        threading.Thread(target=run, name="database-backup", daemon=True).start()
+        return future
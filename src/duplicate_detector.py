@@ -6,19 +6,141 @@ and checking them against a time-windowed cache.
 """
 
 import hashlib
+import re
 import time
 import logging
+import threading
+from collections import Counter, OrderedDict, deque
+from functools import lru_cache
 from typing import Optional, Dict, Any, Tuple, List
 from dataclasses import dataclass
-import difflib
+
+try:
+    import numpy as np
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
 
 from config_manager import get_config
-from database import DatabaseManager, DuplicateEntry
+from database import DatabaseManager, DuplicateEntry, decode_fingerprint
 from music_recognizer import RecognitionResult
 
 logger = logging.getLogger(__name__)
 
 
+# Normalized forms of recently seen artists/titles, so each string in the
+# fuzzy-match window is normalized once rather than on every comparison.
+# Hot paths call the cached _normalize directly; lru_cache's C wrapper makes a
+# hit cheaper than going through a Python-level method.
+NORMALIZE_CACHE_SIZE = 4096
+
+# Below this many candidates, starting scoring threads costs more than it saves
+PARALLEL_MIN_CANDIDATES = 500
+
+_NORMALIZE_TABLE = str.maketrans({'&': 'and', '+': 'and', '\t': ' ', '\n': ' ', '\r': ' '})
+_SPACE_RUN_RE = re.compile(' {2,}')
+_STRIP_CHARS = ' .,!?-_()[]{}"\'\t\n\r'
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize(text: Optional[str]) -> str:
+    """
+    Normalize string for consistent comparison.
+    
+    Lowercases, spells out '&'/'+' as 'and', turns tabs and newlines into
+    spaces, strips punctuation at the edges and collapses runs of spaces.
+    Other whitespace (NBSP, vertical tab, ...) is kept, as fingerprints
+    depend on it.
+    
+    Args:
+        text: String to normalize; None is treated as empty
+        
+    Returns:
+        Normalized string
+    """
+    if not text:
+        return ''
+    
+    return _SPACE_RUN_RE.sub(' ', text.lower().translate(_NORMALIZE_TABLE).strip(_STRIP_CHARS))
+
+
+def _length_bound(a: str, b: str) -> float:
+    """
+    Upper bound on the similarity ratio of two strings from their lengths.
+    
+    Both SequenceMatcher and InDel ratios are 2*M/T with M <= min(len), so
+    strings of very different lengths can never score above this.
+    
+    Args:
+        a, b: Strings to compare
+        
+    Returns:
+        Maximum reachable ratio (0.0 to 1.0)
+    """
+    total = len(a) + len(b)
+    return 2 * min(len(a), len(b)) / total if total else 1.0
+
+
+def _trigrams(text: str) -> Counter:
+    """Multiset of the character trigrams in a string."""
+    return Counter(text[i:i + 3] for i in range(len(text) - 2))
+
+
+def _shares_enough_trigrams(a: str, b: str, a_grams: Counter, b_grams: Counter, min_ratio: float) -> bool:
+    """
+    Trigram count filter: False only if the pair cannot reach min_ratio.
+    
+    Reaching min_ratio allows at most (len(a)+len(b))*(1-min_ratio) inserts
+    and deletes, and each edit destroys at most three trigrams, so the
+    strings must share at least max(len) - 2 - 3*edits trigrams (the q-gram
+    lemma). difflib ratios never exceed the InDel ratio, so the bound holds
+    for both scorers.
+    
+    Args:
+        a, b: Normalized strings
+        a_grams, b_grams: Their trigram multisets
+        min_ratio: Ratio the pair has to reach
+        
+    Returns:
+        True if the pair may still reach min_ratio
+    """
+    max_edits = int((len(a) + len(b)) * (1.0 - min_ratio) + 1e-9)
+    required = max(len(a), len(b)) - 2 - 3 * max_edits
+    if required <= 0:
+        return True
+    return sum((a_grams & b_grams).values()) >= required
+
+
+def _ratio(a: str, b: str, score_cutoff: float = 0.0) -> float:
+    """
+    Similarity ratio of two strings, 0.0 when below score_cutoff.
+    
+    Uses rapidfuzz's bit-parallel InDel ratio when installed and falls back
+    to difflib.SequenceMatcher otherwise.
+    
+    Args:
+        a, b: Strings to compare
+        score_cutoff: Minimum ratio (0.0 to 1.0) worth reporting
+        
+    Returns:
+        Similarity ratio (0.0 to 1.0)
+    """
+    # Equal strings are the common case for repeat plays, and SequenceMatcher
+    # would still index and match them in full
+    if a == b:
+        return 1.0
+    
+    if RAPIDFUZZ_AVAILABLE:
+        return fuzz.ratio(a, b, score_cutoff=score_cutoff * 100) / 100.0
+    
+    # Only imported when needed; rapidfuzz installs never load difflib
+    import difflib
+    
+    ratio = difflib.SequenceMatcher(None, a, b).ratio()
+    return ratio if ratio >= score_cutoff else 0.0
+
+
 @dataclass
 class DuplicateCheck:
     """Result of duplicate detection check."""
@@ -49,9 +171,59 @@ class DuplicateDetector:
         self.time_window = duplicate_config.get('time_window', 900)  # 15 minutes
         self.similarity_threshold = duplicate_config.get('similarity_threshold', 0.9)
         self.cache_size = duplicate_config.get('cache_size', 1000)
+        # rapidfuzz threads for large candidate windows; 1 keeps scoring on the calling thread
+        self.scoring_workers = duplicate_config.get('scoring_workers', 1)
+        
+        # In-process LRU of recently seen fingerprints so repeat recognitions of
+        # the same track are answered without touching the database
+        self._fp_cache: "OrderedDict[str, DuplicateEntry]" = OrderedDict()
+        self._fp_cache_lock = threading.Lock()
+        
+        # Sliding window of recent tracks for fuzzy matching, oldest first. It is
+        # seeded from duplicate_cache (with its stored normalized forms), then fed
+        # by add_track and by scrobble history rows newer than _recent_history_id,
+        # so each check only reads history it hasn't seen.
+        self._recent: deque = deque(maxlen=self.cache_size)
+        self._recent_history_id = 0
+        self._recent_lock = threading.Lock()
+        
+        # Tracks recognized before a restart but not scrobbled yet
+        for entry in reversed(self.database.get_recent_duplicates(int(time.time()) - self.time_window)):
+            self._remember_recent(entry.artist, entry.title, entry.timestamp,
+                                  entry.artist_norm, entry.title_norm)
         
         logger.info(f"Duplicate detector initialized - enabled: {self.enabled}, window: {self.time_window}s")
     
+    @property
+    def enabled(self) -> bool:
+        """Whether duplicate detection is active."""
+        return self._enabled
+    
+    @enabled.setter
+    def enabled(self, value: bool):
+        # Swap the hot-path methods once here instead of checking the flag per call
+        self._enabled = bool(value)
+        if self._enabled:
+            self.__dict__.pop('is_duplicate', None)
+            self.__dict__.pop('add_track', None)
+        else:
+            self.is_duplicate = self._is_duplicate_disabled
+            self.add_track = self._add_track_disabled
+    
+    @staticmethod
+    def _is_duplicate_disabled(recognition_result: RecognitionResult) -> DuplicateCheck:
+        """is_duplicate() while detection is disabled: nothing is a duplicate."""
+        return DuplicateCheck(
+            is_duplicate=False,
+            confidence=0.0,
+            fingerprint=None
+        )
+    
+    @staticmethod
+    def _add_track_disabled(recognition_result: RecognitionResult, fingerprint: Optional[str] = None) -> bool:
+        """add_track() while detection is disabled: nothing is recorded."""
+        return False
+    
     def is_duplicate(self, recognition_result: RecognitionResult) -> DuplicateCheck:
         """
         Check if a recognition result is a duplicate.
@@ -62,13 +234,6 @@ class DuplicateDetector:
         Returns:
             DuplicateCheck with detection result
         """
-        if not self.enabled:
-            return DuplicateCheck(
-                is_duplicate=False,
-                confidence=0.0,
-                fingerprint=None
-            )
-        
         if not recognition_result.success or not recognition_result.artist or not recognition_result.title:
             return DuplicateCheck(
                 is_duplicate=False,
@@ -79,8 +244,12 @@ class DuplicateDetector:
         # Create fingerprint for the track
         fingerprint = self._create_fingerprint(recognition_result)
         
-        # Check for exact fingerprint match
-        existing_entry = self.database.find_duplicate(fingerprint)
+        # Check for exact fingerprint match, locally first
+        existing_entry = self._get_cached_fingerprint(fingerprint)
+        if existing_entry is None:
+            existing_entry = self.database.find_duplicate(fingerprint)
+            if existing_entry:
+                self._cache_fingerprint(existing_entry)
         
         if existing_entry:
             time_since_last = int(time.time()) - existing_entry.timestamp
@@ -104,6 +273,41 @@ class DuplicateDetector:
         
         return similar_check
     
+    def _get_cached_fingerprint(self, fingerprint: str) -> Optional[DuplicateEntry]:
+        """
+        Look up a fingerprint in the local LRU cache.
+        
+        Args:
+            fingerprint: Fingerprint to look up
+            
+        Returns:
+            Cached DuplicateEntry if seen within the time window, None otherwise
+        """
+        with self._fp_cache_lock:
+            entry = self._fp_cache.get(fingerprint)
+            if entry is None:
+                return None
+            
+            if int(time.time()) - entry.timestamp >= self.time_window:
+                del self._fp_cache[fingerprint]
+                return None
+            
+            self._fp_cache.move_to_end(fingerprint)
+            return entry
+    
+    def _cache_fingerprint(self, entry: DuplicateEntry):
+        """
+        Remember a fingerprint in the local LRU cache, evicting the oldest.
+        
+        Args:
+            entry: DuplicateEntry to cache
+        """
+        with self._fp_cache_lock:
+            self._fp_cache[entry.fingerprint] = entry
+            self._fp_cache.move_to_end(entry.fingerprint)
+            while len(self._fp_cache) > self.cache_size:
+                self._fp_cache.popitem(last=False)
+    
     def _create_fingerprint(self, recognition_result: RecognitionResult) -> str:
         """
         Create a unique fingerprint for a track.
@@ -115,9 +319,9 @@ class DuplicateDetector:
             Fingerprint string
         """
         # Normalize strings for consistent fingerprinting
-        artist = self._normalize_string(recognition_result.artist or '')
-        title = self._normalize_string(recognition_result.title or '')
-        album = self._normalize_string(recognition_result.album or '')
+        artist = _normalize(recognition_result.artist)
+        title = _normalize(recognition_result.title)
+        album = _normalize(recognition_result.album)
         
         # Create fingerprint from normalized metadata
         fingerprint_data = f"{artist}|{title}|{album}"
@@ -128,7 +332,7 @@ class DuplicateDetector:
             fingerprint_data += f"|{duration_rounded}"
         
         # Create hash
-        fingerprint = hashlib.sha256(fingerprint_data.encode('utf-8')).hexdigest()[:16]
+        fingerprint = hashlib.blake2b(fingerprint_data.encode('utf-8'), digest_size=8).hexdigest()
         
         logger.debug(f"Created fingerprint: {fingerprint} for {artist} - {title}")
         return fingerprint
@@ -143,33 +347,7 @@ class DuplicateDetector:
         Returns:
             Normalized string
         """
-        if not text:
-            return ''
-        
-        # Convert to lowercase
-        normalized = text.lower()
-        
-        # Remove common variations
-        replacements = {
-            '&': 'and',
-            '+': 'and',
-            '  ': ' ',  # Double spaces
-            '\t': ' ',
-            '\n': ' ',
-            '\r': ' '
-        }
-        
-        for old, new in replacements.items():
-            normalized = normalized.replace(old, new)
-        
-        # Remove extra whitespace and punctuation at edges
-        normalized = normalized.strip(' .,!?-_()[]{}"\'\t\n\r')
-        
-        # Remove multiple spaces
-        while '  ' in normalized:
-            normalized = normalized.replace('  ', ' ')
-        
-        return normalized
+        return _normalize(text or '')
     
     def _check_similar_tracks(self, recognition_result: RecognitionResult, fingerprint: str) -> DuplicateCheck:
         """
@@ -185,21 +363,19 @@ class DuplicateDetector:
         current_time = int(time.time())
         cutoff_time = current_time - self.time_window
         
-        # Get recent tracks from database for comparison
-        recent_stats = self.database.get_recent_stats(hours=int(self.time_window / 3600) + 1)
-        recent_scrobbles = self.database.get_recent_scrobbles(limit=100)
+        # Score every track inside the window and keep the closest match. This stays
+        # in memory on purpose: FTS5/BM25 ranks whole tokens, so it would miss the
+        # character-level variants ("Song" vs "Songs") this check exists for, and
+        # editdist3 needs the spellfix1 extension, which stock SQLite builds lack.
+        candidates = self._get_recent_tracks(cutoff_time)
         
-        # Check recent scrobbles for similarity
-        for scrobble in recent_scrobbles:
-            if scrobble['scrobbled_at'] < cutoff_time:
-                continue
-            
-            similarity = self._calculate_similarity(
-                recognition_result.artist, recognition_result.title,
-                scrobble['artist'], scrobble['title']
-            )
+        if candidates:
+            similarities = self._score_candidates(recognition_result.artist, recognition_result.title, candidates)
+            best = max(range(len(candidates)), key=similarities.__getitem__)
+            similarity = similarities[best]
             
             if similarity >= self.similarity_threshold:
+                scrobble = candidates[best]
                 time_since_last = current_time - scrobble['scrobbled_at']
                 
                 logger.debug(f"Similar track found: {recognition_result.artist} - {recognition_result.title} "
@@ -223,6 +399,108 @@ class DuplicateDetector:
             fingerprint=fingerprint
         )
     
+    def _remember_recent(self, artist: str, title: str, timestamp: int,
+                         artist_norm: Optional[str] = None, title_norm: Optional[str] = None):
+        """
+        Append a track to the fuzzy-match window.
+        
+        Args:
+            artist, title: Track to remember
+            timestamp: Unix timestamp the track was seen
+            artist_norm, title_norm: Already-normalized forms, if known
+        """
+        if title_norm is None:
+            title_norm = _normalize(title)
+        self._recent.append({
+            'artist': artist,
+            'title': title,
+            'scrobbled_at': timestamp,
+            'artist_norm': _normalize(artist) if artist_norm is None else artist_norm,
+            'title_norm': title_norm,
+            'title_grams': _trigrams(title_norm)
+        })
+    
+    def _get_recent_tracks(self, cutoff_time: int) -> List[Dict[str, Any]]:
+        """
+        Get tracks in the fuzzy-match window, newest first.
+        
+        Args:
+            cutoff_time: Unix timestamp of the oldest track to include
+            
+        Returns:
+            List of track dictionaries
+        """
+        with self._recent_lock:
+            new_scrobbles = self.database.get_recent_scrobbles_since(
+                cutoff_time, limit=100, after_id=self._recent_history_id
+            )
+            for scrobble in reversed(new_scrobbles):
+                self._remember_recent(scrobble['artist'], scrobble['title'], scrobble['scrobbled_at'])
+                self._recent_history_id = max(self._recent_history_id, scrobble['id'])
+            
+            while self._recent and self._recent[0]['scrobbled_at'] < cutoff_time:
+                self._recent.popleft()
+            
+            # History rows can arrive after newer add_track entries
+            recent = [track for track in self._recent if track['scrobbled_at'] >= cutoff_time]
+            recent.sort(key=lambda track: track['scrobbled_at'], reverse=True)
+            return recent
+    
+    def _score_candidates(self, artist: str, title: str, candidates: List[Dict[str, Any]]) -> List[float]:
+        """
+        Calculate similarity between one track and a list of candidates.
+        
+        With rapidfuzz the whole candidate list is scored in two cdist calls
+        instead of one Python-level comparison per scrobble.
+        
+        Args:
+            artist, title: Track to compare
+            candidates: Track dictionaries with 'artist_norm' and 'title_norm' keys,
+                and optionally precomputed 'title_grams'
+            
+        Returns:
+            Similarity scores (0.0 to 1.0), one per candidate
+        """
+        artist_norm = _normalize(artist)
+        title_norm = _normalize(title)
+        artists = [candidate['artist_norm'] for candidate in candidates]
+        titles = [candidate['title_norm'] for candidate in candidates]
+        
+        if not RAPIDFUZZ_AVAILABLE:
+            # difflib has no score_cutoff, so skip pairs whose lengths or shared
+            # trigrams alone rule them out before building a SequenceMatcher
+            title_cutoff = self._title_cutoff()
+            title_grams = _trigrams(title_norm)
+            scores = []
+            for candidate, candidate_artist, candidate_title in zip(candidates, artists, titles):
+                length_bound = (0.7 * _length_bound(title_norm, candidate_title) +
+                                0.3 * _length_bound(artist_norm, candidate_artist))
+                candidate_grams = candidate.get('title_grams') or _trigrams(candidate_title)
+                
+                if (length_bound < self.similarity_threshold or
+                        not _shares_enough_trigrams(title_norm, candidate_title, title_grams,
+                                                    candidate_grams, title_cutoff)):
+                    scores.append(0.0)
+                else:
+                    scores.append(self._normalized_similarity(artist_norm, title_norm,
+                                                              candidate_artist, candidate_title))
+            return scores
+        
+        # cdist releases the GIL while scoring, so its worker threads run in parallel
+        workers = self.scoring_workers if len(candidates) >= PARALLEL_MIN_CANDIDATES else 1
+        title_scores = process.cdist([title_norm], titles, scorer=fuzz.ratio,
+                                     score_cutoff=self._title_cutoff() * 100, dtype=np.float64,
+                                     workers=workers)[0]
+        artist_scores = process.cdist([artist_norm], artists, scorer=fuzz.ratio, dtype=np.float64,
+                                      workers=workers)[0]
+        
+        return ((title_scores * 0.7 + artist_scores * 0.3) / 100.0).tolist()
+    
+    def _title_cutoff(self) -> float:
+        """Title ratio below which a pair cannot reach the similarity threshold."""
+        # Titles carry 0.7 of the weight, artists the remaining 0.3
+        return max(0.0, (self.similarity_threshold - 0.3) / 0.7)
+    
     def _calculate_similarity(self, artist1: str, title1: str, artist2: str, title2: str) -> float:
         """
         Calculate similarity between two tracks.
@@ -234,46 +512,69 @@ class DuplicateDetector:
         Returns:
             Similarity score (0.0 to 1.0)
         """
-        # Normalize strings
-        artist1_norm = self._normalize_string(artist1 or '')
-        title1_norm = self._normalize_string(title1 or '')
-        artist2_norm = self._normalize_string(artist2 or '')
-        title2_norm = self._normalize_string(title2 or '')
+        return self._normalized_similarity(
+            _normalize(artist1), _normalize(title1),
+            _normalize(artist2), _normalize(title2)
+        )
+    
+    def _normalized_similarity(self, artist1_norm: str, title1_norm: str,
+                               artist2_norm: str, title2_norm: str) -> float:
+        """
+        Calculate similarity between two already-normalized tracks.
+        
+        Args:
+            artist1_norm, title1_norm: First track, normalized
+            artist2_norm, title2_norm: Second track, normalized
+            
+        Returns:
+            Similarity score (0.0 to 1.0)
+        """
+        if artist1_norm == artist2_norm and title1_norm == title2_norm:
+            return 1.0
         
-        # Calculate similarity using SequenceMatcher
-        artist_similarity = difflib.SequenceMatcher(None, artist1_norm, artist2_norm).ratio()
-        title_similarity = difflib.SequenceMatcher(None, title1_norm, title2_norm).ratio()
+        # Titles that can't reach the threshold are allowed to bail out early
+        artist_similarity = _ratio(artist1_norm, artist2_norm)
+        title_similarity = _ratio(title1_norm, title2_norm, score_cutoff=self._title_cutoff())
         
         # Weight title similarity more heavily
         overall_similarity = (title_similarity * 0.7) + (artist_similarity * 0.3)
         
         return overall_similarity
     
-    def add_track(self, recognition_result: RecognitionResult) -> bool:
+    def add_track(self, recognition_result: RecognitionResult, fingerprint: Optional[str] = None) -> bool:
         """
         Add a track to the duplicate detection cache.
         
         Args:
             recognition_result: RecognitionResult to add
+            fingerprint: Fingerprint from a preceding is_duplicate() check, to
+                avoid computing it again
             
         Returns:
             True if added successfully
         """
-        if not self.enabled or not recognition_result.success:
+        if not recognition_result.success:
             return False
         
-        fingerprint = self._create_fingerprint(recognition_result)
+        if fingerprint is None:
+            fingerprint = self._create_fingerprint(recognition_result)
         
         entry = DuplicateEntry(
             fingerprint=fingerprint,
             artist=recognition_result.artist or '',
             title=recognition_result.title or '',
             timestamp=int(time.time()),
-            confidence=recognition_result.confidence
+            confidence=recognition_result.confidence,
+            artist_norm=_normalize(recognition_result.artist),
+            title_norm=_normalize(recognition_result.title)
         )
         
         try:
             self.database.add_duplicate_entry(entry, self.time_window)
+            self._cache_fingerprint(entry)
+            with self._recent_lock:
+                self._remember_recent(entry.artist, entry.title, entry.timestamp,
+                                      entry.artist_norm, entry.title_norm)
             logger.debug(f"Added to duplicate cache: {entry.artist} - {entry.title}")
             return True
         except Exception as e:
@@ -323,17 +624,12 @@ class DuplicateDetector:
             Number of entries cleared
         """
         try:
-            # Get all entries and remove them
-            current_time = int(time.time())
-            
-            # Force cleanup by setting expiry time to past
-            with self.database._get_connection() as conn:
-                cursor = conn.execute('UPDATE duplicate_cache SET expires_at = 0')
-                count = cursor.rowcount
-                conn.commit()
+            with self._fp_cache_lock:
+                self._fp_cache.clear()
+            with self._recent_lock:
+                self._recent.clear()
             
-            # Now cleanup expired entries
-            self.cleanup_expired()
+            count = self.database.clear_duplicate_cache()
             
             logger.info(f"Cleared {count} entries from duplicate cache")
             return count
@@ -377,25 +673,27 @@ class DuplicateDetector:
             List of fingerprint dictionaries
         """
         try:
-            with self.database._get_connection() as conn:
+            now = int(time.time())
+            
+            with self.database._get_read_connection() as conn:
                 cursor = conn.execute('''
                     SELECT fingerprint, artist, title, timestamp, confidence, expires_at
                     FROM duplicate_cache 
                     WHERE expires_at > ?
                     ORDER BY timestamp DESC 
                     LIMIT ?
-                ''', (int(time.time()), limit))
+                ''', (now, limit))
                 
                 fingerprints = []
                 for row in cursor.fetchall():
                     fingerprints.append({
-                        'fingerprint': row['fingerprint'],
+                        'fingerprint': decode_fingerprint(row['fingerprint']),
                         'artist': row['artist'],
                         'title': row['title'],
                         'timestamp': row['timestamp'],
                         'confidence': row['confidence'],
                         'expires_at': row['expires_at'],
-                        'age_seconds': int(time.time()) - row['timestamp']
+                        'age_seconds': now - row['timestamp']
                     })
                 
                 return fingerprints
@@ -9,8 +9,8 @@ import pylast
 import time
 import threading
 import logging
-import asyncio
-from typing import Optional, Dict, Any, List
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Callable, Hashable
 from dataclasses import dataclass
 
 from config_manager import get_config
@@ -19,6 +19,78 @@ from music_recognizer import RecognitionResult
 
 logger = logging.getLogger(__name__)
 
+# HTTP client module pylast sends its requests through (httpx since pylast 5)
+_pylast_httpx = getattr(pylast, 'httpx', None)
+KEEPALIVE_AVAILABLE = hasattr(_pylast_httpx, 'HTTPTransport')
+
+# Seconds an idle Last.fm connection is kept open for reuse
+KEEPALIVE_EXPIRY = 60.0
+
+# Seconds Last.fm user details (name, playcount) are reused before refetching
+USER_INFO_TTL = 300
+
+if KEEPALIVE_AVAILABLE:
+    class _KeepAliveTransport(_pylast_httpx.HTTPTransport):
+        """
+        HTTPS transport shared by every pylast request.
+        
+        pylast opens a new client per API call and closes its mounted transports
+        when done, which would drop the pooled connection each time; this
+        transport stays open until close() is called explicitly.
+        """
+        
+        def __exit__(self, *args):
+            pass
+
+
+class _TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed time-to-live."""
+    
+    def __init__(self, ttl: float, max_keys: int = 1024):
+        """
+        Initialize cache.
+        
+        Args:
+            ttl: Seconds an entry stays valid
+            max_keys: Entries kept before the least recently used is evicted
+        """
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, calling loader on a miss or expiry.
+        
+        Args:
+            key: Cache key
+            loader: Fetches the value; exceptions propagate and nothing is cached
+            
+        Returns:
+            Cached or freshly loaded value
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] > now:
+                self._entries.move_to_end(key)
+                return cached[1]
+        
+        value = loader()
+        
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+        return value
+    
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
 
 @dataclass
 class ScrobbleResult:
@@ -61,11 +133,23 @@ class LastFMScrobbler:
         self.network = None
         self.user = None
         self._authenticated = False
+        self._transport = None
+        self._user_info_cache = _TTLCache(USER_INFO_TTL)
         
         # Threading
         self._running = False
         self._scrobble_thread = None
         self._lock = threading.Lock()
+        # Set to end the processor's wait early, on new queue entries or shutdown
+        self._wake = threading.Event()
+        
+        # Queue length as of the last database read, adjusted by this scrobbler's own
+        # enqueues and removals; None means reload it on next use. Each queue pass
+        # rereads it, picking up changes made outside this scrobbler.
+        self._queue_size: Optional[int] = None
+        
+        # Called after the queue or history changes, e.g. to push a dashboard update
+        self.on_change: Optional[Callable[[], None]] = None
         
         # Statistics
         self.stats = {
@@ -95,6 +179,7 @@ class LastFMScrobbler:
                 api_secret=self.api_secret,
                 session_key=self.session_key
             )
+            self._enable_keepalive()
             
             # Test authentication
             self.user = self.network.get_authenticated_user()
@@ -108,6 +193,20 @@ class LastFMScrobbler:
             self._authenticated = False
             self.stats['authentication_errors'] += 1
     
+    def _enable_keepalive(self):
+        """Route pylast's requests through one pooled transport so TLS connections are reused."""
+        if not KEEPALIVE_AVAILABLE or self.network.proxy:
+            return
+        
+        if self._transport is None:
+            self._transport = _KeepAliveTransport(
+                verify=getattr(pylast, 'SSL_CONTEXT', True),
+                limits=_pylast_httpx.Limits(max_connections=4, max_keepalive_connections=4,
+                                            keepalive_expiry=KEEPALIVE_EXPIRY)
+            )
+        # pylast hands its proxy setting to the client as transport mounts
+        self.network.proxy = {'https://': self._transport}
+    
     def is_available(self) -> bool:
         """Check if Last.fm scrobbling is available."""
         return self.enabled and self._authenticated and self.network is not None
@@ -123,6 +222,7 @@ class LastFMScrobbler:
             return
         
         self._running = True
+        self._wake.clear()
         self._scrobble_thread = threading.Thread(target=self._scrobble_loop, daemon=True)
         self._scrobble_thread.start()
         logger.info("Scrobble processor started")
@@ -130,6 +230,7 @@ class LastFMScrobbler:
     def stop_scrobble_processor(self):
         """Stop the scrobble queue processor."""
         self._running = False
+        self._wake.set()
         
         if self._scrobble_thread and self._scrobble_thread.is_alive():
             self._scrobble_thread.join(timeout=10.0)
@@ -139,18 +240,32 @@ class LastFMScrobbler:
     def _scrobble_loop(self):
         """Main scrobble processing loop."""
         while self._running:
+            # Cleared before draining, so a wake-up arriving at any point after
+            # this ends the next wait instead of being lost
+            self._wake.clear()
             try:
                 self._process_scrobble_queue()
-                time.sleep(self.retry_interval)
+                timeout = self.retry_interval
             except Exception as e:
                 logger.error(f"Error in scrobble loop: {e}")
-                time.sleep(60)  # Wait longer on error
+                timeout = 60  # Wait longer on error
+            
+            # Newly queued tracks are submitted right away; failures still wait out the interval
+            self._wake.wait(timeout=timeout)
     
     def _process_scrobble_queue(self):
         """Process pending scrobbles in the queue."""
         if not self.is_available():
             return
         
+        # A single trigger-maintained row, so this stays cheap on every pass
+        queue_size = self.database.get_queue_size()
+        self._set_queue_size(queue_size)
+        
+        if queue_size == 0:
+            # Nothing pending; skip loading queue rows
+            return
+        
         queue_entries = self.database.get_scrobble_queue(limit=50)
         
         if not queue_entries:
@@ -158,91 +273,89 @@ class LastFMScrobbler:
         
         logger.debug(f"Processing {len(queue_entries)} queued scrobbles")
         
-        for entry in queue_entries:
-            if not self._running:
-                break
-            
-            try:
-                result = self._attempt_scrobble(entry)
-                
-                if result.success:
-                    # Remove from queue and add to history
-                    self.database.remove_from_scrobble_queue(entry.id)
-                    self.database.add_to_history(entry, 'lastfm', 1.0)
-                    self.stats['scrobbles_successful'] += 1
-                    self.stats['queue_processed'] += 1
-                    
-                elif result.should_retry and entry.retry_count < self.max_retries:
-                    # Increment retry count
-                    self.database.increment_retry_count(entry.id)
-                    self.stats['scrobbles_failed'] += 1
-                    
-                else:
-                    # Max retries reached or permanent failure
-                    self.database.remove_from_scrobble_queue(entry.id)
-                    logger.error(f"Giving up on scrobble after {entry.retry_count} retries: {entry.artist} - {entry.title}")
-                    self.stats['scrobbles_failed'] += 1
-                    self.stats['queue_processed'] += 1
-                
-            except Exception as e:
-                logger.error(f"Error processing scrobble: {e}")
-                if entry.retry_count < self.max_retries:
-                    self.database.increment_retry_count(entry.id)
+        if not self._running:
+            return
+        
+        results = self._scrobble_batch(queue_entries)
+        
+        scrobbled, retry_ids, failed_ids = [], [], []
+        for entry, result in zip(queue_entries, results):
+            if result.success:
+                scrobbled.append(entry)
+            elif result.should_retry and entry.retry_count < self.max_retries:
+                retry_ids.append(entry.id)
+            else:
+                # Max retries reached or permanent failure
+                failed_ids.append(entry.id)
+                logger.error(f"Giving up on scrobble after {entry.retry_count} retries: {entry.artist} - {entry.title}")
+        
+        try:
+            # Queue removals, history rows and retry counts are written together
+            removed = self.database.finish_scrobble_batch(scrobbled, retry_ids, failed_ids)
+            self._adjust_queue_size(-removed)
+        except Exception as e:
+            logger.error(f"Error recording scrobble results: {e}")
+            # Part of the batch may have been committed
+            self._set_queue_size(None)
+            return
+        
+        self.stats['scrobbles_successful'] += len(scrobbled)
+        self.stats['scrobbles_failed'] += len(retry_ids) + len(failed_ids)
+        self.stats['queue_processed'] += len(scrobbled) + len(failed_ids)
+        self._notify_change()
     
-    def _attempt_scrobble(self, entry: ScrobbleEntry) -> ScrobbleResult:
+    def _validate_entry(self, entry: ScrobbleEntry) -> Optional[ScrobbleResult]:
         """
-        Attempt to scrobble a single entry.
+        Check an entry can be scrobbled at all.
         
         Args:
-            entry: ScrobbleEntry to scrobble
+            entry: ScrobbleEntry to check
             
         Returns:
-            ScrobbleResult with attempt result
+            A non-retryable failure, or None if the entry is valid
         """
-        try:
-            # Validate entry
-            if not entry.artist or not entry.title:
-                return ScrobbleResult(
-                    success=False,
-                    error_message="Missing artist or title",
-                    should_retry=False
-                )
-            
-            # Check minimum play time
-            if entry.duration and entry.duration < self.min_play_time:
-                return ScrobbleResult(
-                    success=False,
-                    error_message=f"Track too short ({entry.duration}s < {self.min_play_time}s)",
-                    should_retry=False
-                )
-            
-            # Perform scrobble
-            timestamp = entry.timestamp or int(time.time())
-            
-            track = self.network.get_track(entry.artist, entry.title)
-            
-            # Scrobble the track
-            self.network.scrobble(
-                artist=entry.artist,
-                title=entry.title,
-                timestamp=timestamp,
-                album=entry.album,
-                duration=entry.duration,
-                track_number=entry.track_number,
-                mbid=entry.mbid
+        if not entry.artist or not entry.title:
+            return ScrobbleResult(
+                success=False,
+                error_message="Missing artist or title",
+                should_retry=False
             )
-            
-            logger.info(f"Successfully scrobbled: {entry.artist} - {entry.title}")
-            self.stats['scrobbles_attempted'] += 1
-            
+        
+        if entry.duration and entry.duration < self.min_play_time:
             return ScrobbleResult(
-                success=True,
-                entry_id=entry.id
+                success=False,
+                error_message=f"Track too short ({entry.duration}s < {self.min_play_time}s)",
+                should_retry=False
             )
+        
+        return None
+    
+    @staticmethod
+    def _scrobble_params(entry: ScrobbleEntry, now: int) -> Dict[str, Any]:
+        """Keyword arguments for pylast's scrobble() / scrobble_many() for an entry."""
+        return {
+            'artist': entry.artist,
+            'title': entry.title,
+            'timestamp': entry.timestamp or now,
+            'album': entry.album,
+            'duration': entry.duration,
+            'track_number': entry.track_number,
+            'mbid': entry.mbid
+        }
+    
+    def _error_result(self, error: Exception, description: str) -> ScrobbleResult:
+        """
+        Build the failure result for an exception raised by a scrobble request.
+        
+        Args:
+            error: Exception raised by pylast
+            description: What was being scrobbled, for the log message
             
-        except pylast.WSError as e:
-            error_code = getattr(e, 'error_code', None)
-            error_message = str(e)
+        Returns:
+            ScrobbleResult marked retryable unless Last.fm rejected the request itself
+        """
+        if isinstance(error, pylast.WSError):
+            error_code = getattr(error, 'error_code', None)
             
             # Determine if we should retry based on error code
             should_retry = error_code not in [
@@ -258,25 +371,95 @@ class LastFMScrobbler:
                 26,   # Suspended API key
             ]
             
-            logger.error(f"Last.fm API error scrobbling {entry.artist} - {entry.title}: {error_message}")
-            self.stats['scrobbles_attempted'] += 1
-            
-            return ScrobbleResult(
-                success=False,
-                error_message=error_message,
-                should_retry=should_retry
-            )
+            logger.error(f"Last.fm API error scrobbling {description}: {error}")
+        else:
+            logger.error(f"Network error scrobbling {description}: {error}")
+            self.stats['network_errors'] += 1
+            should_retry = True  # Retry network errors
+        
+        return ScrobbleResult(
+            success=False,
+            error_message=str(error),
+            should_retry=should_retry
+        )
+    
+    def _scrobble_batch(self, entries: List[ScrobbleEntry]) -> List[ScrobbleResult]:
+        """
+        Scrobble up to 50 entries in a single track.scrobble request.
+        
+        Last.fm accepts or rejects the request as a whole, so every valid entry
+        shares the outcome of the one call. A permanent rejection of several
+        entries may be caused by just one of them, so those are resubmitted one
+        at a time and only the entries Last.fm refuses on their own are failed.
+        
+        Args:
+            entries: ScrobbleEntry objects to scrobble
             
+        Returns:
+            ScrobbleResult for each entry, in the same order
+        """
+        results = [self._validate_entry(entry) for entry in entries]
+        batch = [entry for entry, result in zip(entries, results) if result is None]
+        
+        if not batch:
+            return results
+        
+        self.stats['scrobbles_attempted'] += len(batch)
+        try:
+            now = int(time.time())
+            self.network.scrobble_many([self._scrobble_params(entry, now) for entry in batch])
+            logger.info(f"Successfully scrobbled {len(batch)} tracks")
+            failure = None
         except Exception as e:
-            logger.error(f"Network error scrobbling {entry.artist} - {entry.title}: {e}")
-            self.stats['scrobbles_attempted'] += 1
-            self.stats['network_errors'] += 1
+            failure = self._error_result(e, f"batch of {len(batch)} tracks")
+            if not failure.should_retry and len(batch) > 1:
+                logger.info(f"Batch rejected, scrobbling {len(batch)} tracks individually")
+                return [result if result is not None else self._attempt_scrobble(entry)
+                        for entry, result in zip(entries, results)]
+        
+        for i, entry in enumerate(entries):
+            if results[i] is not None:
+                continue
+            if failure is None:
+                results[i] = ScrobbleResult(success=True, entry_id=entry.id)
+            else:
+                results[i] = ScrobbleResult(
+                    success=False,
+                    entry_id=entry.id,
+                    error_message=failure.error_message,
+                    should_retry=failure.should_retry
+                )
+        
+        return results
+    
+    def _attempt_scrobble(self, entry: ScrobbleEntry) -> ScrobbleResult:
+        """
+        Attempt to scrobble a single entry.
+        
+        Args:
+            entry: ScrobbleEntry to scrobble
+            
+        Returns:
+            ScrobbleResult with attempt result
+        """
+        invalid = self._validate_entry(entry)
+        if invalid is not None:
+            return invalid
+        
+        self.stats['scrobbles_attempted'] += 1
+        try:
+            # Scrobble the track
+            self.network.scrobble(**self._scrobble_params(entry, int(time.time())))
+            
+            logger.info(f"Successfully scrobbled: {entry.artist} - {entry.title}")
             
             return ScrobbleResult(
-                success=False,
-                error_message=str(e),
-                should_retry=True  # Retry network errors
+                success=True,
+                entry_id=entry.id
             )
+            
+        except Exception as e:
+            return self._error_result(e, f"{entry.artist} - {entry.title}")
     
     def queue_scrobble(self, recognition_result: RecognitionResult, timestamp: Optional[int] = None) -> bool:
         """
@@ -298,7 +481,7 @@ class LastFMScrobbler:
             return False
         
         # Check queue size
-        current_queue_size = self.database.get_queue_size()
+        current_queue_size = self._cached_queue_size()
         if current_queue_size >= self.max_queue_size:
             logger.warning(f"Scrobble queue is full ({current_queue_size} >= {self.max_queue_size})")
             return False
@@ -316,11 +499,40 @@ class LastFMScrobbler:
         try:
             entry_id = self.database.add_to_scrobble_queue(entry, recognition_result.metadata)
             logger.info(f"Queued scrobble: {entry.artist} - {entry.title} (ID: {entry_id})")
+            self._adjust_queue_size(1)
+            self._wake.set()
+            self._notify_change()
             return True
         except Exception as e:
             logger.error(f"Failed to queue scrobble: {e}")
             return False
     
+    def _notify_change(self):
+        """Invoke the on_change callback, if one is registered."""
+        if self.on_change is not None:
+            try:
+                self.on_change()
+            except Exception as e:
+                logger.error(f"Error in change callback: {e}")
+    
+    def _cached_queue_size(self) -> int:
+        """Get the queue length, reading it from the database only when not cached."""
+        with self._lock:
+            if self._queue_size is None:
+                self._queue_size = self.database.get_queue_size()
+            return self._queue_size
+    
+    def _set_queue_size(self, size: Optional[int]):
+        """Replace the cached queue length; None forces a reload on next use."""
+        with self._lock:
+            self._queue_size = size
+    
+    def _adjust_queue_size(self, delta: int):
+        """Apply an enqueue or removal to the cached queue length, if one is cached."""
+        with self._lock:
+            if self._queue_size is not None:
+                self._queue_size = max(0, self._queue_size + delta)
+    
     def scrobble_now(self, recognition_result: RecognitionResult, timestamp: Optional[int] = None) -> ScrobbleResult:
         """
         Immediately attempt to scrobble a track (bypass queue).
@@ -374,8 +586,7 @@ class LastFMScrobbler:
                 self._initialize_lastfm()
             
             if self._authenticated and self.user:
-                user_info = self.user.get_name()
-                playcount = self.user.get_playcount()
+                user_info, playcount = self._cached_user_info()
                 
                 return {
                     'status': 'success',
@@ -395,6 +606,18 @@ class LastFMScrobbler:
                 'message': f'Connection test failed: {e}'
             }
     
+    def _cached_user_info(self) -> tuple:
+        """
+        Get the authenticated user's name and playcount, refetched at most every USER_INFO_TTL seconds.
+        
+        Returns:
+            Tuple of (user name, playcount)
+        """
+        user = self.user
+        return self._user_info_cache.get_or_load(
+            self.session_key, lambda: (user.get_name(), user.get_playcount())
+        )
+    
     def get_status(self) -> Dict[str, Any]:
         """Get scrobbler status and statistics."""
         queue_size = self.database.get_queue_size()
@@ -423,35 +646,22 @@ class LastFMScrobbler:
         Returns:
             Number of entries cleared
         """
-        count = 0
-        entries = self.database.get_scrobble_queue(limit=1000)
-        
-        for entry in entries:
-            if self.database.remove_from_scrobble_queue(entry.id):
-                count += 1
+        count = self.database.clear_scrobble_queue()
+        self._set_queue_size(0)
         
         logger.info(f"Cleared {count} entries from scrobble queue")
         return count
     
     def get_queue_entries(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get current queue entries for inspection."""
-        entries = self.database.get_scrobble_queue(limit)
-        
-        return [
-            {
-                'id': entry.id,
-                'artist': entry.artist,
-                'title': entry.title,
-                'album': entry.album,
-                'timestamp': entry.timestamp,
-                'duration': entry.duration,
-                'retry_count': entry.retry_count,
-                'created_at': entry.created_at
-            }
-            for entry in entries
-        ]
+        return self.database.get_scrobble_queue_dicts(limit)
     
     def cleanup(self):
         """Clean up scrobbler resources."""
         self.stop_scrobble_processor()
+        
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        
         logger.info("Last.fm scrobbler cleaned up")
\ No newline at end of file
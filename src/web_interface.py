@@ -6,18 +6,88 @@ and configuration of the vinyl recognition system.
 """
 
 import json
+import os
+import secrets
+import tempfile
 import time
 import threading
-from typing import Optional, Dict, Any
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from functools import wraps
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable, Tuple
+from flask import Flask, Response, render_template, request, redirect, url_for, make_response
 from flask_socketio import SocketIO, emit
 import logging
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from config_manager import get_config
 from database import DatabaseManager
 
 logger = logging.getLogger(__name__)
 
+# Bytes read per step when scanning a log file backwards
+LOG_TAIL_CHUNK = 8192
+
+# Status fields that change on every read and are ignored when deciding
+# whether a status update is worth broadcasting
+VOLATILE_STATUS_FIELDS = ('uptime', 'stale_since')
+
+# Seconds after which a status differing only in volatile fields is re-sent,
+# so the dashboard's uptime keeps advancing
+STATUS_REFRESH_INTERVAL = 60
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes with sorted keys, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str,
+                            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def _tail(path: str, lines: int) -> str:
+    """
+    Read the last lines of a text file without reading the whole file.
+    
+    Args:
+        path: File to read
+        lines: Number of lines to return; the whole file if not positive
+        
+    Returns:
+        The requested lines, with their line endings
+    """
+    with open(path, 'rb') as f:
+        if lines <= 0:
+            return f.read().decode('utf-8', errors='replace')
+        
+        position = f.seek(0, os.SEEK_END)
+        data = b''
+        # One extra newline guarantees the oldest returned line is complete
+        while position > 0 and data.count(b'\n') <= lines:
+            step = min(LOG_TAIL_CHUNK, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    
+    text = data.decode('utf-8', errors='replace')
+    return ''.join(text.splitlines(keepends=True)[-lines:])
+
+
+def _json_response(obj: Any) -> Response:
+    """Build a JSON response; Flask's jsonify equivalent backed by _json_dumps."""
+    return Response(_json_dumps(obj), mimetype='application/json')
+
+
+def _stable_status(status: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Status without the fields that change on every read, for change detection."""
+    if not status:
+        return status
+    return {key: value for key, value in status.items() if key not in VOLATILE_STATUS_FIELDS}
+
 
 class WebInterface:
     """Web interface for vinyl recognition system monitoring and control."""
@@ -48,14 +118,16 @@ class WebInterface:
         # Configure secret key
         secret_key = self.config.get_secret('FLASK_SECRET_KEY')
         if not secret_key:
-            import secrets
-            secret_key = secrets.token_hex(32)
-            logger.warning("No Flask secret key configured, using temporary key")
+            secret_key_file = web_config.get('secret_key_file', 'data/flask_secret.key')
+            secret_key = self._load_secret_key(secret_key_file)
+            logger.warning(f"No Flask secret key configured, using generated key from {secret_key_file}")
         
         self.app.config['SECRET_KEY'] = secret_key
         
-        # Initialize SocketIO
-        self.socketio = SocketIO(self.app, cors_allowed_origins="*")
+        # Initialize SocketIO; without an explicit async_mode Flask-SocketIO uses
+        # eventlet or gevent when installed and falls back to threading
+        self.async_mode = web_config.get('async_mode')
+        self.socketio = SocketIO(self.app, cors_allowed_origins="*", async_mode=self.async_mode)
         
         # Real-time update configuration
         self.update_interval = web_config.get('update_interval', 5)
@@ -65,68 +137,248 @@ class WebInterface:
         self._update_thread = None
         self._running = False
         
+        # Serialized bodies of recent GET responses: key -> (expires_at, body)
+        self._resp_cache: Dict[Tuple, Tuple[float, bytes]] = {}
+        self._resp_cache_lock = threading.Lock()
+        
+        # Rendered HTML pages: (template, script root) -> html. The pages take
+        # no context, so they only need rendering once per mount point.
+        self._page_cache: Dict[Tuple[str, str], str] = {}
+        
+        # Set when system state changes so the update loop pushes immediately;
+        # what was last sent per event (and when) lets unchanged data be
+        # skipped. The event comes from the async mode in use so waiting on it
+        # cooperates.
+        self._dirty = self.socketio.server.eio.create_event()
+        self._last_emitted: Dict[str, Tuple[str, float]] = {}
+        
+        # Set when the update loop exits. Background tasks differ per async mode
+        # (eventlet's has no is_alive() or join timeout, gevent's no is_alive()),
+        # so stop_updates() waits on this instead of the task itself.
+        self._update_done = self.socketio.server.eio.create_event()
+        self._update_done.set()
+        
+        # (time, status) of the last successful get_status(), served while the system restarts
+        self._last_good_status: Optional[Tuple[float, Dict[str, Any]]] = None
+        if vinyl_system is not None:
+            vinyl_system.set_change_callback(self.mark_dirty)
+        
         # Setup routes
         self._setup_routes()
         self._setup_socketio_events()
         
         logger.info(f"Web interface initialized on {self.host}:{self.port}")
     
+    @staticmethod
+    def _load_secret_key(path: str) -> str:
+        """
+        Read the generated Flask secret key, creating it on first use.
+        
+        Reusing the key across restarts keeps existing session cookies valid.
+        
+        Args:
+            path: Key file, created with owner-only permissions
+            
+        Returns:
+            Secret key
+        """
+        key_file = Path(path)
+        try:
+            existing_key = key_file.read_text().strip()
+        except FileNotFoundError:
+            existing_key = None
+        if existing_key:
+            return existing_key
+        
+        secret_key = secrets.token_hex(32)
+        temp_path = None
+        try:
+            key_file.parent.mkdir(parents=True, exist_ok=True)
+            # Written in full before it appears under the real name, so other
+            # processes never read a partial key
+            fd, temp_path = tempfile.mkstemp(dir=key_file.parent, prefix=f".{key_file.name}.", suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                f.write(secret_key)
+            
+            if existing_key is None:
+                try:
+                    os.link(temp_path, key_file)
+                    return secret_key
+                except FileExistsError:
+                    # Another process created it first
+                    existing_key = key_file.read_text().strip()
+                    if existing_key:
+                        return existing_key
+                except OSError:
+                    # No hard links on this filesystem
+                    pass
+            
+            # An empty key file is treated as missing
+            os.replace(temp_path, key_file)
+            temp_path = None
+        except OSError as e:
+            logger.warning(f"Could not save Flask secret key to {key_file}, using temporary key: {e}")
+        finally:
+            if temp_path is not None:
+                os.unlink(temp_path)
+        
+        return secret_key
+    
+    def _cached(self, ttl: float) -> Callable:
+        """
+        Decorator caching a JSON view's successful responses for ttl seconds.
+        
+        Responses are keyed on path and query arguments, so dashboards polling
+        the same endpoint share one database read per TTL.
+        
+        Args:
+            ttl: Seconds a response is reused
+            
+        Returns:
+            Route decorator
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                key = (request.path, tuple(sorted(request.args.items(multi=True))))
+                now = time.monotonic()
+                
+                with self._resp_cache_lock:
+                    cached = self._resp_cache.get(key)
+                if cached is not None and cached[0] > now:
+                    return self.app.response_class(cached[1], mimetype='application/json')
+                
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200:
+                    with self._resp_cache_lock:
+                        self._resp_cache[key] = (now + ttl, response.get_data())
+                return response
+            return wrapper
+        return decorator
+    
+    def _render_page(self, template: str) -> Response:
+        """
+        Serve a static dashboard page, rendering its template only on first use.
+        
+        Args:
+            template: Template file name
+            
+        Returns:
+            HTML response
+        """
+        key = (template, request.script_root)
+        html = self._page_cache.get(key)
+        if html is None:
+            html = self._page_cache[key] = render_template(template)
+        
+        response = self.app.response_class(html, mimetype='text/html')
+        response.headers['Cache-Control'] = 'public, max-age=60'
+        return response
+    
+    def _get_status(self) -> Optional[Dict[str, Any]]:
+        """
+        Get system status, falling back to the last good status while it is unavailable.
+        
+        A fallback status is marked with 'stale': True and 'stale_since', the
+        time it was read.
+        
+        Returns:
+            Status dictionary, or None if there is no system and no earlier status
+            
+        Raises:
+            Exception: From get_status() when no earlier status exists to fall back on
+        """
+        try:
+            if not self.vinyl_system:
+                raise RuntimeError('System not initialized')
+            status = self.vinyl_system.get_status()
+        except Exception as e:
+            if self._last_good_status is None:
+                if not self.vinyl_system:
+                    return None
+                raise
+            
+            logger.debug(f"Serving last known status: {e}")
+            read_at, status = self._last_good_status
+            return dict(status, stale=True, stale_since=read_at)
+        
+        self._last_good_status = (time.time(), status)
+        return status
+    
+    def mark_dirty(self):
+        """Signal that system state changed, so clients are updated without waiting for the next poll."""
+        self._invalidate_cache()
+        self._dirty.set()
+    
+    def _invalidate_cache(self):
+        """Drop cached responses after an action that changes system state."""
+        with self._resp_cache_lock:
+            self._resp_cache.clear()
+    
     def _setup_routes(self):
         """Setup Flask routes."""
         
         @self.app.route('/')
         def index():
             """Main dashboard."""
-            return render_template('index.html')
+            return self._render_page('index.html')
         
         @self.app.route('/api/status')
+        @self._cached(ttl=2)
         def api_status():
             """Get system status."""
-            if self.vinyl_system:
-                status = self.vinyl_system.get_status()
-            else:
+            try:
+                status = self._get_status()
+            except Exception as e:
+                logger.error(f"Error getting system status: {e}")
+                return _json_response({'error': str(e)}), 500
+            
+            if status is None:
                 status = {'running': False, 'error': 'System not initialized'}
-            return jsonify(status)
+            return _json_response(status)
         
         @self.app.route('/api/recent-scrobbles')
+        @self._cached(ttl=5)
         def api_recent_scrobbles():
             """Get recent scrobbles."""
             limit = request.args.get('limit', 20, type=int)
             scrobbles = self.database.get_recent_scrobbles(limit)
-            return jsonify(scrobbles)
+            return _json_response(scrobbles)
         
         @self.app.route('/api/queue')
+        @self._cached(ttl=3)
         def api_queue():
             """Get scrobble queue status."""
             if self.vinyl_system and hasattr(self.vinyl_system, 'lastfm_scrobbler'):
                 queue_entries = self.vinyl_system.lastfm_scrobbler.get_queue_entries()
-                return jsonify(queue_entries)
-            return jsonify([])
+                return _json_response(queue_entries)
+            return _json_response([])
         
         @self.app.route('/api/stats')
+        @self._cached(ttl=30)
         def api_stats():
             """Get system statistics."""
             try:
                 stats = self.database.get_scrobble_stats(days=30)
                 system_stats = self.database.get_recent_stats(hours=24)
                 
-                return jsonify({
+                return _json_response({
                     'scrobble_stats': stats,
                     'system_stats': system_stats
                 })
             except Exception as e:
-                return jsonify({'error': str(e)}), 500
+                return _json_response({'error': str(e)}), 500
         
         @self.app.route('/api/config', methods=['GET'])
         def api_get_config():
             """Get current configuration."""
             if not self.enable_config_editing:
-                return jsonify({'error': 'Configuration editing disabled'}), 403
+                return _json_response({'error': 'Configuration editing disabled'}), 403
             
             config_dict = self.config.get_config_dict()
             secrets_validation = self.config.validate_secrets()
             
-            return jsonify({
+            return _json_response({
                 'config': config_dict,
                 'secrets': secrets_validation
             })
@@ -135,86 +387,89 @@ class WebInterface:
         def api_update_config():
             """Update configuration."""
             if not self.enable_config_editing:
-                return jsonify({'error': 'Configuration editing disabled'}), 403
+                return _json_response({'error': 'Configuration editing disabled'}), 403
             
             try:
                 updates = request.get_json()
                 if not updates:
-                    return jsonify({'error': 'No configuration data provided'}), 400
+                    return _json_response({'error': 'No configuration data provided'}), 400
                 
                 # Update configuration
                 self.config.update_config(updates)
                 self.config.save_config()
                 
-                return jsonify({'success': True, 'message': 'Configuration updated'})
+                return _json_response({'success': True, 'message': 'Configuration updated'})
             
             except Exception as e:
                 logger.error(f"Error updating configuration: {e}")
-                return jsonify({'error': str(e)}), 500
+                return _json_response({'error': str(e)}), 500
         
         @self.app.route('/api/test-components')
         def api_test_components():
             """Test all system components."""
             if self.vinyl_system:
                 results = self.vinyl_system.test_components()
-                return jsonify(results)
-            return jsonify({'error': 'System not initialized'}), 500
+                return _json_response(results)
+            return _json_response({'error': 'System not initialized'}), 500
         
         @self.app.route('/api/control/<action>', methods=['POST'])
         def api_control(action):
             """Control system (start/stop/restart)."""
             if not self.vinyl_system:
-                return jsonify({'error': 'System not initialized'}), 500
+                return _json_response({'error': 'System not initialized'}), 500
             
+            self._invalidate_cache()
             try:
                 if action == 'start':
                     if not self.vinyl_system.running:
                         self.vinyl_system.start()
-                        return jsonify({'success': True, 'message': 'System started'})
+                        return _json_response({'success': True, 'message': 'System started'})
                     else:
-                        return jsonify({'error': 'System already running'})
+                        return _json_response({'error': 'System already running'})
                 
                 elif action == 'stop':
                     if self.vinyl_system.running:
                         self.vinyl_system.stop()
-                        return jsonify({'success': True, 'message': 'System stopped'})
+                        return _json_response({'success': True, 'message': 'System stopped'})
                     else:
-                        return jsonify({'error': 'System not running'})
+                        return _json_response({'error': 'System not running'})
                 
                 elif action == 'restart':
                     if self.vinyl_system.running:
                         self.vinyl_system.stop()
                         time.sleep(2)
                     self.vinyl_system.start()
-                    return jsonify({'success': True, 'message': 'System restarted'})
+                    return _json_response({'success': True, 'message': 'System restarted'})
                 
                 else:
-                    return jsonify({'error': f'Unknown action: {action}'}), 400
+                    return _json_response({'error': f'Unknown action: {action}'}), 400
             
             except Exception as e:
                 logger.error(f"Error controlling system: {e}")
-                return jsonify({'error': str(e)}), 500
+                return _json_response({'error': str(e)}), 500
         
         @self.app.route('/api/clear-queue', methods=['POST'])
         def api_clear_queue():
             """Clear scrobble queue."""
             if self.vinyl_system and hasattr(self.vinyl_system, 'lastfm_scrobbler'):
                 count = self.vinyl_system.lastfm_scrobbler.clear_queue()
-                return jsonify({'success': True, 'cleared': count})
-            return jsonify({'error': 'Scrobbler not available'}), 500
+                self._invalidate_cache()
+                return _json_response({'success': True, 'cleared': count})
+            return _json_response({'error': 'Scrobbler not available'}), 500
         
         @self.app.route('/api/clear-duplicates', methods=['POST'])
         def api_clear_duplicates():
             """Clear duplicate detection cache."""
             if self.vinyl_system and hasattr(self.vinyl_system, 'duplicate_detector'):
                 count = self.vinyl_system.duplicate_detector.clear_cache()
-                return jsonify({'success': True, 'cleared': count})
-            return jsonify({'error': 'Duplicate detector not available'}), 500
+                self._invalidate_cache()
+                return _json_response({'success': True, 'cleared': count})
+            return _json_response({'error': 'Duplicate detector not available'}), 500
         
         @self.app.route('/logs')
         def logs():
             """View system logs."""
-            return render_template('logs.html')
+            return self._render_page('logs.html')
         
         @self.app.route('/api/logs')
         def api_logs():
@@ -224,22 +479,19 @@ class WebInterface:
                 lines = request.args.get('lines', 100, type=int)
                 
                 try:
-                    with open(log_file, 'r') as f:
-                        log_lines = f.readlines()
-                        recent_lines = log_lines[-lines:] if len(log_lines) > lines else log_lines
-                        return jsonify({'logs': ''.join(recent_lines)})
+                    return _json_response({'logs': _tail(log_file, lines)})
                 except FileNotFoundError:
-                    return jsonify({'logs': 'Log file not found'})
+                    return _json_response({'logs': 'Log file not found'})
                 
             except Exception as e:
-                return jsonify({'error': str(e)}), 500
+                return _json_response({'error': str(e)}), 500
         
         @self.app.route('/config')
         def config_page():
             """Configuration page."""
             if not self.enable_config_editing:
                 return redirect(url_for('index'))
-            return render_template('config.html')
+            return self._render_page('config.html')
     
     def _setup_socketio_events(self):
         """Setup SocketIO event handlers."""
@@ -260,13 +512,13 @@ class WebInterface:
             """Handle status request."""
             if self.vinyl_system:
                 status = self.vinyl_system.get_status()
-                emit('status_update', status)
+                emit('status_update', _json_dumps(status).decode('utf-8'))
         
         @self.socketio.on('request_recent_scrobbles')
         def handle_request_recent_scrobbles():
             """Handle recent scrobbles request."""
             scrobbles = self.database.get_recent_scrobbles(10)
-            emit('recent_scrobbles', scrobbles)
+            emit('recent_scrobbles', _json_dumps(scrobbles).decode('utf-8'))
     
     def start_updates(self):
         """Start real-time updates thread."""
@@ -274,35 +526,73 @@ class WebInterface:
             return
         
         self._running = True
-        self._update_thread = threading.Thread(target=self._update_loop, daemon=True)
-        self._update_thread.start()
+        self._update_done.clear()
+        # Runs as a greenlet under eventlet/gevent so it doesn't block the event loop
+        self._update_thread = self.socketio.start_background_task(self._update_loop)
         logger.info("Started real-time updates")
     
     def stop_updates(self):
         """Stop real-time updates."""
         self._running = False
-        if self._update_thread and self._update_thread.is_alive():
-            self._update_thread.join(timeout=5.0)
+        self._dirty.set()
+        if not self._update_done.wait(timeout=5.0):
+            logger.warning("Real-time update loop did not stop within 5s")
         logger.info("Stopped real-time updates")
     
     def _update_loop(self):
         """Real-time update loop."""
+        try:
+            self._run_updates()
+        finally:
+            self._update_done.set()
+    
+    def _run_updates(self):
+        """Emit updates until stop_updates() is called."""
         while self._running:
             try:
                 # Emit status updates
                 if self.vinyl_system:
-                    status = self.vinyl_system.get_status()
-                    self.socketio.emit('status_update', status)
+                    status = self._get_status()
+                    self._emit_if_changed('status_update', status,
+                                          compare=_stable_status(status),
+                                          max_age=STATUS_REFRESH_INTERVAL)
                 
                 # Emit recent scrobbles
                 recent_scrobbles = self.database.get_recent_scrobbles(5)
-                self.socketio.emit('recent_scrobbles', recent_scrobbles)
+                self._emit_if_changed('recent_scrobbles', recent_scrobbles)
                 
-                time.sleep(self.update_interval)
+                # Wake early when mark_dirty() reports a change
+                self._dirty.wait(timeout=self.update_interval)
+                self._dirty.clear()
                 
             except Exception as e:
                 logger.error(f"Error in update loop: {e}")
-                time.sleep(10)
+                self.socketio.sleep(10)
+    
+    def _emit_if_changed(self, event: str, data: Any, compare: Any = None,
+                         max_age: Optional[float] = None):
+        """
+        Broadcast data to clients unless it matches what was last sent for the event.
+        
+        The payload is serialized once and sent as a JSON string, so the same
+        text serves for the change check and for every connected client.
+        
+        Args:
+            event: SocketIO event name
+            data: JSON-serializable payload
+            compare: Projection of data to compare instead of the full payload
+            max_age: Seconds after which an unchanged payload is sent again
+        """
+        payload = _json_dumps(data).decode('utf-8')
+        key = payload if compare is None else _json_dumps(compare).decode('utf-8')
+        now = time.monotonic()
+        
+        last = self._last_emitted.get(event)
+        if last is not None and last[0] == key and (max_age is None or now - last[1] < max_age):
+            return
+        
+        self.socketio.emit(event, payload)
+        self._last_emitted[event] = (key, now)
     
     def run(self, **kwargs):
         """Run the web interface."""
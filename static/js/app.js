@@ -24,6 +24,8 @@ function initializeWebSocket() {
         console.log('Connected to server');
         updateConnectionStatus(true);
         socket.emit('request_status');
+        // Scrobbles are only broadcast when they change, so fetch the current list
+        socket.emit('request_recent_scrobbles');
     });
     
     socket.on('disconnect', function() {
@@ -31,12 +33,13 @@ function initializeWebSocket() {
         updateConnectionStatus(false);
     });
     
+    // Updates arrive as pre-serialized JSON strings
     socket.on('status_update', function(data) {
-        updateSystemStatus(data);
+        updateSystemStatus(JSON.parse(data));
     });
     
     socket.on('recent_scrobbles', function(data) {
-        updateRecentScrobbles(data);
+        updateRecentScrobbles(JSON.parse(data));
     });
     
     socket.on('error', function(error) {
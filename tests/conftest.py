@@ -3,10 +3,11 @@ Pytest configuration and fixtures for vinyl recognition system tests.
 """
 
 import pytest
-import tempfile
-import os
+import copy
 import json
+import shutil
 from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
 from unittest.mock import Mock, patch
 import sys
 
@@ -17,17 +18,16 @@ from config_manager import ConfigManager
 
 
 @pytest.fixture
-def temp_config_dir():
+def temp_config_dir(tmp_path):
     """Create a temporary configuration directory for testing."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        config_dir = Path(temp_dir) / "config"
-        config_dir.mkdir()
-        yield config_dir
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    return config_dir
 
 
-@pytest.fixture
-def sample_config():
-    """Sample configuration data for testing."""
+@pytest.fixture(scope="session")
+def sample_config_template():
+    """Sample configuration data, built once per session; use sample_config for a mutable copy."""
     return {
         "audio": {
             "device_name": "USB Audio CODEC",
@@ -87,49 +87,96 @@ def sample_config():
 
 
 @pytest.fixture
+def sample_config(sample_config_template):
+    """Sample configuration data for testing."""
+    return copy.deepcopy(sample_config_template)
+
+
+@pytest.fixture(scope="session")
 def sample_secrets():
-    """Sample secrets data for testing."""
-    return {
+    """Sample secrets data for testing (read-only, shared by the session)."""
+    return MappingProxyType({
         "LASTFM_API_KEY": "test_api_key",
         "LASTFM_API_SECRET": "test_api_secret",
         "LASTFM_SESSION_KEY": "test_session_key",
         "AUDD_API_KEY": "test_audd_key",
         "FLASK_SECRET_KEY": "test_flask_key"
-    }
+    })
+
+
+@pytest.fixture(scope="session")
+def sample_secrets_env(sample_secrets):
+    """Sample secrets rendered as secrets.env file contents."""
+    return "".join(f"{key}={value}\n" for key, value in sample_secrets.items())
+
+
+@pytest.fixture(scope="session")
+def config_template_dir(tmp_path_factory, sample_config_template, sample_secrets_env):
+    """Write the sample config and secrets files once per session."""
+    template_dir = tmp_path_factory.mktemp("config_template")
+    (template_dir / "config.json").write_text(json.dumps(sample_config_template))
+    (template_dir / "secrets.env").write_text(sample_secrets_env)
+    return template_dir
 
 
 @pytest.fixture
-def config_manager(temp_config_dir, sample_config, sample_secrets):
+def populated_config_dir(temp_config_dir, config_template_dir):
+    """Config directory holding the sample config.json and secrets.env."""
+    # Tests save and edit these files, so each gets its own copy of the template
+    shutil.copytree(config_template_dir, temp_config_dir, dirs_exist_ok=True)
+    return temp_config_dir
+
+
+@pytest.fixture
+def config_manager(populated_config_dir):
     """Create a ConfigManager instance with test data."""
-    # Create config file
-    config_file = temp_config_dir / "config.json"
-    with open(config_file, 'w') as f:
-        json.dump(sample_config, f)
+    return ConfigManager(str(populated_config_dir))
+
+
+@pytest.fixture(scope="session")
+def pyaudio_module_mock():
+    """Mock pyaudio module with a PyAudio instance and stream, wired once per session.
+    
+    Tests should take the function-scoped fixture that resets it rather than
+    using this directly.
+    """
+    module = Mock()
     
-    # Create secrets file
-    secrets_file = temp_config_dir / "secrets.env"
-    with open(secrets_file, 'w') as f:
-        for key, value in sample_secrets.items():
-            f.write(f"{key}={value}\n")
+    # PyAudio constants
+    module.paInt16 = 8
+    module.paInt24 = 9
+    module.paInt32 = 10
+    module.paFloat32 = 11
+    
+    audio = module.PyAudio.return_value
+    audio.get_device_count.return_value = 3
+    audio.get_default_input_device_info.return_value = {
+        'name': 'Default Device',
+        'index': 0
+    }
     
-    return ConfigManager(str(temp_config_dir))
+    stream = audio.open.return_value
+    stream.is_active.return_value = True
+    stream.read.return_value = b'\x00\x01\x02\x03' * 1024
+    
+    return module
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_audio_device():
-    """Mock audio device for testing."""
-    device = Mock()
-    device.name = "USB Audio CODEC"
-    device.index = 1
-    device.maxInputChannels = 2
-    device.defaultSampleRate = 44100
-    return device
+    """Mock audio device for testing (attributes only, shared by the session)."""
+    return SimpleNamespace(
+        name="USB Audio CODEC",
+        index=1,
+        maxInputChannels=2,
+        defaultSampleRate=44100
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_recognition_result():
-    """Mock recognition result for testing."""
-    return {
+    """Mock recognition result for testing (read-only, shared by the session)."""
+    return MappingProxyType({
         "success": True,
         "confidence": 0.85,
         "artist": "Test Artist",
@@ -137,34 +184,25 @@ def mock_recognition_result():
         "album": "Test Album",
         "provider": "audd",
         "duration": 180
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_scrobble_data():
-    """Mock scrobble data for testing."""
-    return {
+    """Mock scrobble data for testing (read-only, shared by the session)."""
+    return MappingProxyType({
         "artist": "Test Artist",
         "title": "Test Song",
         "album": "Test Album",
         "timestamp": 1640995200,
         "duration": 180
-    }
+    })
 
 
 @pytest.fixture
-def temp_database():
-    """Create a temporary database for testing."""
-    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-        db_path = f.name
-    
-    yield db_path
-    
-    # Cleanup
-    try:
-        os.unlink(db_path)
-    except OSError:
-        pass
+def temp_database(tmp_path):
+    """Create a temporary database path for testing."""
+    return str(tmp_path / "test.db")
 
 
 @pytest.fixture
@@ -4,10 +4,55 @@ import tempfile
 import os
 import time
 import threading
+import wave
 from unittest.mock import Mock, patch, MagicMock, call
 
+from src import audio_processor
 from src.audio_processor import AudioProcessor
 
+AUDIO_CONFIG = {
+    'device_name': 'Test Device',
+    'sample_rate': 44100,
+    'chunk_size': 1024,
+    'channels': 2,
+    'format': 'int16',
+    'silence_threshold': 0.01,
+    'silence_duration': 2.0,
+    'recording_duration': 30.0,
+    'max_recording_duration': 120.0
+}
+
+# Shared read-only chunks; a constant 500 gives an RMS above the 0.01 silence threshold
+MUSIC_CHUNK = np.full(1024, 500, dtype=np.int16)
+SILENT_CHUNK = np.zeros(1024, dtype=np.int16)
+
+
+class FakeClock:
+    """Clock for AudioProcessor that moves only by `step` per reading or when a test sets `now`."""
+    
+    def __init__(self, now: float = 1_000_000.0, step: float = 0.0):
+        self.now = now
+        self.step = step
+    
+    def __call__(self) -> float:
+        current = self.now
+        self.now += self.step
+        return current
+
+
+@pytest.fixture(scope="class")
+def shared_processor(pyaudio_module_mock):
+    """AudioProcessor built once per class, with its initial state for resetting."""
+    audio = pyaudio_module_mock.PyAudio.return_value
+    audio.get_device_info_by_index.side_effect = [{'name': 'Test Device', 'maxInputChannels': 2}]
+    
+    with patch.object(audio_processor, 'get_config') as mock_get_config, \
+            patch.object(audio_processor, 'pyaudio', pyaudio_module_mock):
+        mock_get_config.return_value.get_audio_config.return_value = dict(AUDIO_CONFIG)
+        processor = AudioProcessor()
+    
+    return processor, dict(vars(processor))
+
 
 class TestAudioProcessor:
     """Test AudioProcessor class."""
@@ -15,59 +60,81 @@ class TestAudioProcessor:
     @pytest.fixture
     def mock_config(self):
         """Mock configuration."""
-        with patch('src.audio_processor.get_config') as mock_get_config:
+        with patch.object(audio_processor, 'get_config') as mock_get_config:
             config_mock = Mock()
-            config_mock.get_audio_config.return_value = {
-                'device_name': 'Test Device',
-                'sample_rate': 44100,
-                'chunk_size': 1024,
-                'channels': 2,
-                'format': 'int16',
-                'silence_threshold': 0.01,
-                'silence_duration': 2.0,
-                'recording_duration': 30.0,
-                'max_recording_duration': 120.0
-            }
+            config_mock.get_audio_config.return_value = dict(AUDIO_CONFIG)
             mock_get_config.return_value = config_mock
             yield mock_get_config
     
     @pytest.fixture
-    def mock_pyaudio(self):
+    def mock_pyaudio(self, monkeypatch, pyaudio_module_mock):
         """Mock PyAudio."""
-        with patch('src.audio_processor.pyaudio') as mock_pyaudio_module:
-            # Mock PyAudio constants
-            mock_pyaudio_module.paInt16 = 8
-            mock_pyaudio_module.paInt24 = 9
-            mock_pyaudio_module.paInt32 = 10
-            mock_pyaudio_module.paFloat32 = 11
-            
-            # Mock PyAudio class
-            mock_pyaudio = Mock()
-            mock_pyaudio_module.PyAudio.return_value = mock_pyaudio
-            
-            # Mock device info - provide enough devices to avoid StopIteration
-            mock_pyaudio.get_device_count.return_value = 3
-            mock_pyaudio.get_device_info_by_index.side_effect = [
-                {'name': 'Test Device', 'maxInputChannels': 2},
-                {'name': 'Other Device', 'maxInputChannels': 1},
-                {'name': 'Another Device', 'maxInputChannels': 0}
-            ]
-            mock_pyaudio.get_default_input_device_info.return_value = {
-                'name': 'Default Device',
-                'index': 0
-            }
-            
-            # Mock stream
-            mock_stream = Mock()
-            mock_stream.is_active.return_value = True
-            mock_stream.read.return_value = b'\x00\x01\x02\x03' * 1024
-            mock_pyaudio.open.return_value = mock_stream
-            
-            yield mock_pyaudio
+        # Clear calls and side effects left by the previous test; reset_mock
+        # does not pass side_effect on to return values, so reset each level
+        mock_pyaudio = pyaudio_module_mock.PyAudio.return_value
+        for mock in (pyaudio_module_mock, mock_pyaudio, mock_pyaudio.open.return_value):
+            mock.reset_mock(side_effect=True)
+        
+        # Mock device info - provide enough devices to avoid StopIteration
+        mock_pyaudio.get_device_info_by_index.side_effect = [
+            {'name': 'Test Device', 'maxInputChannels': 2},
+            {'name': 'Other Device', 'maxInputChannels': 1},
+            {'name': 'Another Device', 'maxInputChannels': 0}
+        ]
+        
+        monkeypatch.setattr(audio_processor, 'pyaudio', pyaudio_module_mock)
+        return mock_pyaudio
     
-    def test_audio_processor_creation(self, mock_config, mock_pyaudio):
+    @pytest.fixture
+    def clock(self):
+        """Fake clock driving the processor fixture."""
+        return FakeClock()
+    
+    @pytest.fixture
+    def processor(self, shared_processor, mock_pyaudio, clock):
+        """Shared AudioProcessor restored to its just-constructed state."""
+        processor, initial_state = shared_processor
+        vars(processor).clear()
+        vars(processor).update(initial_state)
+        
+        # Fresh mutable state, as tests append to and lock these
+        processor.current_recording = []
+        processor._lock = threading.Lock()
+        processor._clock = clock
+        return processor
+    
+    @pytest.fixture
+    def pyaudio_scenario(self, request, monkeypatch, mock_pyaudio):
+        """PyAudio mock with the device setup named by the test parameter."""
+        scenario = request.param
+        other_devices = [
+            {'name': 'Other Device 1', 'maxInputChannels': 2},
+            {'name': 'Other Device 2', 'maxInputChannels': 1}
+        ]
+        no_default = Exception("No default device")
+        
+        # Return values persist on the shared mock, so change them through monkeypatch
+        if scenario == 'fallback':
+            monkeypatch.setattr(mock_pyaudio.get_device_count, 'return_value', 2)
+            mock_pyaudio.get_device_info_by_index.side_effect = other_devices
+            monkeypatch.setattr(mock_pyaudio.get_default_input_device_info, 'return_value', {
+                'name': 'Default Device',
+                'index': 5
+            })
+        elif scenario == 'no_devices':
+            monkeypatch.setattr(mock_pyaudio.get_device_count, 'return_value', 0)
+            mock_pyaudio.get_default_input_device_info.side_effect = no_default
+        elif scenario == 'not_found':
+            monkeypatch.setattr(mock_pyaudio.get_device_count, 'return_value', 2)
+            mock_pyaudio.get_device_info_by_index.side_effect = other_devices
+            mock_pyaudio.get_default_input_device_info.side_effect = no_default
+        elif scenario == 'pyaudio_fail':
+            mock_pyaudio.get_device_count.side_effect = Exception("PyAudio failed")
+        
+        return mock_pyaudio
+    
+    def test_audio_processor_creation(self, processor):
         """Test AudioProcessor creation."""
-        processor = AudioProcessor()
         assert processor.device_name == 'Test Device'
         assert processor.sample_rate == 44100
         assert processor.chunk_size == 1024
@@ -76,10 +143,8 @@ class TestAudioProcessor:
         assert processor.is_running is False
         assert processor.is_recording is False
     
-    def test_audio_processor_start_stop(self, mock_config, mock_pyaudio):
+    def test_audio_processor_start_stop(self, processor):
         """Test AudioProcessor start and stop monitoring."""
-        processor = AudioProcessor()
-        
         # Mock the audio loop to avoid infinite loop
         with patch.object(processor, '_audio_loop'):
             processor.start_monitoring()
@@ -90,9 +155,8 @@ class TestAudioProcessor:
             processor.stop_monitoring()
             assert processor.is_running is False
     
-    def test_audio_processor_get_status(self, mock_config, mock_pyaudio):
+    def test_audio_processor_get_status(self, processor):
         """Test AudioProcessor get_status method."""
-        processor = AudioProcessor()
         status = processor.get_status()
         
         assert 'is_running' in status
@@ -105,87 +169,49 @@ class TestAudioProcessor:
         assert 'music_detected' in status
         assert 'silence_duration' in status
     
-    def test_audio_processor_cleanup(self, mock_config, mock_pyaudio):
+    def test_audio_processor_cleanup(self, processor, mock_pyaudio):
         """Test AudioProcessor cleanup."""
-        processor = AudioProcessor()
         processor.cleanup()
         
         # Verify PyAudio was terminated
         mock_pyaudio.terminate.assert_called_once()
     
-    def test_find_input_device_success(self, mock_config, mock_pyaudio):
-        """Test finding input device successfully."""
-        processor = AudioProcessor()
-        # The device should already be found during initialization
-        assert processor.input_device_index == 0  # First device matches
-    
-    def test_find_input_device_fallback(self, mock_config, mock_pyaudio):
-        """Test finding input device with fallback to default."""
-        # Create a new processor with different mock setup
-        with patch('src.audio_processor.pyaudio') as mock_pyaudio_module:
-            # Mock PyAudio constants
-            mock_pyaudio_module.paInt16 = 8
-            
-            # Mock PyAudio class
-            mock_audio_instance = Mock()
-            mock_pyaudio_module.PyAudio.return_value = mock_audio_instance
-            
-            # Mock no matching devices but provide default
-            mock_audio_instance.get_device_count.return_value = 2
-            mock_audio_instance.get_device_info_by_index.side_effect = [
-                {'name': 'Other Device 1', 'maxInputChannels': 2},
-                {'name': 'Other Device 2', 'maxInputChannels': 1}
-            ]
-            mock_audio_instance.get_default_input_device_info.return_value = {
-                'name': 'Default Device',
-                'index': 5
-            }
-            
-            # Mock stream
-            mock_stream = Mock()
-            mock_audio_instance.open.return_value = mock_stream
-            
-            processor = AudioProcessor()
-            assert processor.input_device_index == 5
-    
-    def test_find_input_device_no_devices(self, mock_config, mock_pyaudio):
-        """Test finding input device when no devices available."""
-        # Create a new processor with different mock setup
-        with patch('src.audio_processor.pyaudio') as mock_pyaudio_module:
-            # Mock PyAudio constants
-            mock_pyaudio_module.paInt16 = 8
-            
-            # Mock PyAudio class
-            mock_audio_instance = Mock()
-            mock_pyaudio_module.PyAudio.return_value = mock_audio_instance
-            
-            # Mock no devices and no default device
-            mock_audio_instance.get_device_count.return_value = 0
-            mock_audio_instance.get_default_input_device_info.side_effect = Exception("No default device")
-            
-            # This should raise an exception during initialization
-            with pytest.raises(RuntimeError, match="Audio device 'Test Device' not found"):
-                AudioProcessor()
-    
-    def test_open_stream_success(self, mock_config, mock_pyaudio):
+    @pytest.mark.parametrize('pyaudio_scenario, expected_index', [
+        ('success', 0),  # First device matches
+        ('fallback', 5)  # No match, default device used
+    ], indirect=['pyaudio_scenario'])
+    def test_find_input_device(self, mock_config, pyaudio_scenario, expected_index):
+        """Test finding the input device by name or falling back to the default."""
+        processor = AudioProcessor()
+        assert processor.input_device_index == expected_index
+    
+    @pytest.mark.parametrize('pyaudio_scenario, error, match', [
+        ('no_devices', RuntimeError, "Audio device 'Test Device' not found"),
+        ('not_found', RuntimeError, "Audio device 'Test Device' not found"),
+        # Implementation raises the original PyAudio exception
+        ('pyaudio_fail', Exception, "PyAudio failed")
+    ], indirect=['pyaudio_scenario'])
+    def test_initialize_audio_failure(self, mock_config, pyaudio_scenario, error, match):
+        """Test audio initialization failures."""
+        with pytest.raises(error, match=match):
+            AudioProcessor()
+    
+    def test_open_stream_success(self, processor, mock_pyaudio):
         """Test opening audio stream successfully."""
-        processor = AudioProcessor()
         processor._open_stream()
         
         mock_pyaudio.open.assert_called_once()
         assert processor.stream is not None
     
-    def test_open_stream_failure(self, mock_config, mock_pyaudio):
+    def test_open_stream_failure(self, processor, mock_pyaudio):
         """Test opening audio stream with failure."""
         mock_pyaudio.open.side_effect = Exception("Stream open failed")
         
-        processor = AudioProcessor()
         with pytest.raises(Exception, match="Stream open failed"):
             processor._open_stream()
     
-    def test_close_stream(self, mock_config, mock_pyaudio):
+    def test_close_stream(self, processor):
         """Test closing audio stream."""
-        processor = AudioProcessor()
         # Create a proper mock stream
         mock_stream = Mock()
         processor.stream = mock_stream
@@ -195,38 +221,25 @@ class TestAudioProcessor:
         mock_stream.close.assert_called_once()
         assert processor.stream is None
     
-    def test_close_stream_none(self, mock_config, mock_pyaudio):
+    def test_close_stream_none(self, processor):
         """Test closing audio stream when stream is None."""
-        processor = AudioProcessor()
         processor.stream = None
         processor._close_stream()  # Should not raise exception
     
-    def test_process_audio_chunk_silence(self, mock_config, mock_pyaudio):
+    def test_process_audio_chunk_silence(self, processor):
         """Test processing audio chunk with silence."""
-        processor = AudioProcessor()
-        
-        # Create silent audio data
-        silent_data = np.zeros(1024, dtype=np.int16)
-        
         with patch.object(processor, '_handle_silence') as mock_handle_silence:
-            processor._process_audio_chunk(silent_data)
+            processor._process_audio_chunk(SILENT_CHUNK)
             mock_handle_silence.assert_called_once()
     
-    def test_process_audio_chunk_music(self, mock_config, mock_pyaudio):
+    def test_process_audio_chunk_music(self, processor):
         """Test processing audio chunk with music."""
-        processor = AudioProcessor()
-        
-        # Create music audio data (non-zero)
-        music_data = np.random.randint(-1000, 1000, 1024, dtype=np.int16)
-        
         with patch.object(processor, '_handle_music') as mock_handle_music:
-            processor._process_audio_chunk(music_data)
+            processor._process_audio_chunk(MUSIC_CHUNK)
             mock_handle_music.assert_called_once()
     
-    def test_process_audio_chunk_empty(self, mock_config, mock_pyaudio):
+    def test_process_audio_chunk_empty(self, processor):
         """Test processing empty audio chunk."""
-        processor = AudioProcessor()
-        
         # Create empty audio data
         empty_data = np.array([], dtype=np.int16)
         
@@ -234,72 +247,62 @@ class TestAudioProcessor:
             processor._process_audio_chunk(empty_data)
             mock_handle_silence.assert_called_once()
     
-    def test_handle_silence_start_recording(self, mock_config, mock_pyaudio):
+    def test_handle_silence_start_recording(self, processor, clock):
         """Test handling silence when recording should start."""
-        processor = AudioProcessor()
         processor.is_recording = True
         processor.current_recording = [1, 2, 3]  # Some data
-        processor.silence_start_time = time.time() - 3.0  # Silence for 3 seconds
+        processor.silence_start_time = clock.now - 3.0  # Silence for 3 seconds
         
         with patch.object(processor, '_finish_recording') as mock_finish:
-            processor._handle_silence(time.time())
+            processor._handle_silence(clock.now)
             mock_finish.assert_called_once()
     
-    def test_handle_silence_not_long_enough(self, mock_config, mock_pyaudio):
+    def test_handle_silence_not_long_enough(self, processor, clock):
         """Test handling silence when not long enough to finish recording."""
-        processor = AudioProcessor()
         processor.is_recording = True
         processor.current_recording = [1, 2, 3]
-        processor.silence_start_time = time.time() - 0.5  # Short silence
+        processor.silence_start_time = clock.now - 0.5  # Short silence
         
         with patch.object(processor, '_finish_recording') as mock_finish:
-            processor._handle_silence(time.time())
+            processor._handle_silence(clock.now)
             mock_finish.assert_not_called()
     
-    def test_handle_music_start_recording(self, mock_config, mock_pyaudio):
+    def test_handle_music_start_recording(self, processor, clock):
         """Test handling music when recording should start."""
-        processor = AudioProcessor()
-        processor.last_track_end_time = time.time() - 5.0  # Enough time passed
-        music_data = np.random.randint(-1000, 1000, 1024, dtype=np.int16)
+        processor.last_track_end_time = clock.now - 5.0  # Enough time passed
         
         with patch.object(processor, '_start_recording') as mock_start:
-            processor._handle_music(time.time(), music_data)
+            processor._handle_music(clock.now, MUSIC_CHUNK)
             mock_start.assert_called_once()
     
-    def test_handle_music_continue_recording(self, mock_config, mock_pyaudio):
+    def test_handle_music_continue_recording(self, processor, clock):
         """Test handling music when already recording."""
-        processor = AudioProcessor()
         processor.is_recording = True
         processor.current_recording = [1, 2, 3]
-        music_data = np.random.randint(-1000, 1000, 1024, dtype=np.int16)
         
-        processor._handle_music(time.time(), music_data)
+        processor._handle_music(clock.now, MUSIC_CHUNK)
         assert len(processor.current_recording) > 3  # Should have added more data
     
-    def test_handle_music_max_duration(self, mock_config, mock_pyaudio):
+    def test_handle_music_max_duration(self, processor, clock):
         """Test handling music when max duration is reached."""
-        processor = AudioProcessor()
         processor.is_recording = True
         processor.current_recording = [1, 2, 3]
-        processor.music_start_time = time.time() - 125.0  # Exceeds max duration
-        music_data = np.random.randint(-1000, 1000, 1024, dtype=np.int16)
+        processor.music_start_time = clock.now - 125.0  # Exceeds max duration
         
         with patch.object(processor, '_finish_recording') as mock_finish:
-            processor._handle_music(time.time(), music_data)
+            processor._handle_music(clock.now, MUSIC_CHUNK)
             mock_finish.assert_called_once()
     
-    def test_start_recording(self, mock_config, mock_pyaudio):
+    def test_start_recording(self, processor):
         """Test starting recording."""
-        processor = AudioProcessor()
         processor.is_recording = False
         
         processor._start_recording()
         assert processor.is_recording is True
         assert processor.current_recording == []
     
-    def test_start_recording_already_recording(self, mock_config, mock_pyaudio):
+    def test_start_recording_already_recording(self, processor):
         """Test starting recording when already recording."""
-        processor = AudioProcessor()
         processor.is_recording = True
         processor.current_recording = [1, 2, 3]
         
@@ -308,9 +311,8 @@ class TestAudioProcessor:
         # When already recording, the method should not reset current_recording
         assert processor.current_recording == [1, 2, 3]  # Should NOT be reset
     
-    def test_finish_recording_too_short(self, mock_config, mock_pyaudio):
+    def test_finish_recording_too_short(self, processor):
         """Test finishing recording that's too short."""
-        processor = AudioProcessor()
         processor.is_recording = True
         processor.current_recording = [1, 2, 3]  # Very short recording
         
@@ -319,14 +321,13 @@ class TestAudioProcessor:
             mock_save.assert_not_called()
             assert processor.current_recording == []
     
-    def test_finish_recording_success(self, mock_config, mock_pyaudio):
+    def test_finish_recording_success(self, processor):
         """Test finishing recording successfully."""
-        processor = AudioProcessor()
         processor.is_recording = True
-        processor.sample_rate = 44100
+        # A low sample rate keeps a 35 second recording small
+        processor.sample_rate = 100
         processor.channels = 2
-        # Create recording with enough duration
-        processor.current_recording = [1] * (44100 * 2 * 35)  # 35 seconds
+        processor.current_recording = [1] * (100 * 2 * 35)  # 35 seconds
         
         with patch.object(processor, '_save_recording') as mock_save:
             mock_save.return_value = '/tmp/test.wav'
@@ -335,52 +336,47 @@ class TestAudioProcessor:
                 mock_save.assert_called_once()
                 mock_callback.assert_called_once_with('/tmp/test.wav')
     
-    def test_finish_recording_no_callback(self, mock_config, mock_pyaudio):
+    def test_finish_recording_no_callback(self, processor):
         """Test finishing recording without callback."""
-        processor = AudioProcessor()
         processor.is_recording = True
         processor.on_track_detected = None
-        processor.sample_rate = 44100
+        processor.sample_rate = 100
         processor.channels = 2
-        processor.current_recording = [1] * (44100 * 2 * 35)
+        processor.current_recording = [1] * (100 * 2 * 35)
         
         with patch.object(processor, '_save_recording') as mock_save:
             mock_save.return_value = '/tmp/test.wav'
             processor._finish_recording()  # Should not raise exception
             mock_save.assert_called_once()
     
-    def test_save_recording_success(self, mock_config, mock_pyaudio):
+    def test_save_recording_success(self, processor, monkeypatch, tmp_path):
         """Test saving recording successfully."""
-        processor = AudioProcessor()
         processor.sample_rate = 44100
         processor.channels = 2
         processor.format = 8  # paInt16
+        monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+        monkeypatch.setattr(processor.audio.get_sample_size, 'return_value', 2)
         
         audio_data = [1, 2, 3, 4, 5, 6, 7, 8]
+        result = processor._save_recording(audio_data)
         
-        with patch('tempfile.mkstemp') as mock_mkstemp:
-            mock_mkstemp.return_value = (123, '/tmp/test.wav')  # Valid file descriptor
-            with patch('os.close') as mock_close:
-                with patch('builtins.open', create=True):
-                    with patch('wave.open') as mock_wave:
-                        with patch.object(processor.audio, 'get_sample_size', return_value=2):
-                            result = processor._save_recording(audio_data)
-                            assert result == '/tmp/test.wav'
-                            mock_wave.assert_called_once()
-                            mock_close.assert_called_once_with(123)
-    
-    def test_save_recording_failure(self, mock_config, mock_pyaudio):
+        assert os.path.dirname(result) == str(tmp_path)
+        with wave.open(result, 'rb') as wav_file:
+            assert wav_file.getnchannels() == 2
+            assert wav_file.getsampwidth() == 2
+            assert wav_file.getframerate() == 44100
+            assert wav_file.getnframes() == 4
+    
+    def test_save_recording_failure(self, processor):
         """Test saving recording with failure."""
-        processor = AudioProcessor()
-        
         with patch('tempfile.mkstemp', side_effect=Exception("Save failed")):
             result = processor._save_recording([1, 2, 3])
             assert result is None
     
-    def test_test_audio_input_success(self, mock_config, mock_pyaudio):
+    def test_test_audio_input_success(self, processor, clock):
         """Test audio input testing successfully."""
-        processor = AudioProcessor()
         processor.is_running = False
+        clock.step = 0.25  # Each reading advances a quarter second
         
         # Mock stream and audio data with proper bytes
         mock_stream = Mock()
@@ -395,10 +391,10 @@ class TestAudioProcessor:
                 assert 'successful' in message
                 assert stats is not None
                 assert 'avg_level' in stats
+                assert stats['samples'] == 3  # Reads at 0.25s, 0.5s and 0.75s
     
-    def test_test_audio_input_already_running(self, mock_config, mock_pyaudio):
+    def test_test_audio_input_already_running(self, processor):
         """Test audio input testing when already running."""
-        processor = AudioProcessor()
         processor.is_running = True
         
         success, message, stats = processor.test_audio_input()
@@ -407,10 +403,10 @@ class TestAudioProcessor:
         assert 'Cannot test while monitoring is active' in message
         assert stats is None
     
-    def test_test_audio_input_no_audio(self, mock_config, mock_pyaudio):
+    def test_test_audio_input_no_audio(self, processor, clock):
         """Test audio input testing with no audio detected."""
-        processor = AudioProcessor()
         processor.is_running = False
+        clock.step = 0.25  # Each reading advances a quarter second
         
         # Mock stream with silent audio
         mock_stream = Mock()
@@ -425,10 +421,10 @@ class TestAudioProcessor:
                 assert 'No audio detected' in message
                 assert stats is not None
     
-    def test_test_audio_input_stream_error(self, mock_config, mock_pyaudio):
+    def test_test_audio_input_stream_error(self, processor, clock):
         """Test audio input testing with stream error."""
-        processor = AudioProcessor()
         processor.is_running = False
+        clock.step = 0.25  # Each reading advances a quarter second
         
         # Mock stream that raises exception
         mock_stream = Mock()
@@ -443,16 +439,13 @@ class TestAudioProcessor:
                 assert 'failed' in message
                 assert stats is None
     
-    def test_audio_loop_exception(self, mock_config, mock_pyaudio):
+    def test_audio_loop_exception(self, processor):
         """Test audio loop with exception."""
-        processor = AudioProcessor()
-        
         with patch.object(processor, '_open_stream', side_effect=Exception("Open failed")):
             processor._audio_loop()  # Should handle exception gracefully
     
-    def test_audio_loop_stream_inactive(self, mock_config, mock_pyaudio):
+    def test_audio_loop_stream_inactive(self, processor):
         """Test audio loop with inactive stream."""
-        processor = AudioProcessor()
         processor.is_running = True
         
         # Mock inactive stream
@@ -467,9 +460,8 @@ class TestAudioProcessor:
                 processor._audio_loop()
                 mock_sleep.assert_called()
     
-    def test_audio_loop_read_exception(self, mock_config, mock_pyaudio):
+    def test_audio_loop_read_exception(self, processor):
         """Test audio loop with read exception."""
-        processor = AudioProcessor()
         processor.is_running = True
         
         # Mock stream that raises exception on read
@@ -485,66 +477,22 @@ class TestAudioProcessor:
                 processor._audio_loop()
                 mock_sleep.assert_called()
     
-    def test_stop_monitoring_no_thread(self, mock_config, mock_pyaudio):
+    def test_stop_monitoring_no_thread(self, processor):
         """Test stopping monitoring when no thread exists."""
-        processor = AudioProcessor()
         processor._audio_thread = None
         
         processor.stop_monitoring()  # Should not raise exception
     
-    def test_stop_monitoring_thread_timeout(self, mock_config, mock_pyaudio):
+    def test_stop_monitoring_thread_timeout(self, processor):
         """Test stopping monitoring with thread timeout."""
-        processor = AudioProcessor()
         processor._audio_thread = Mock()
         processor._audio_thread.is_alive.return_value = True
         processor._audio_thread.join.return_value = None  # Timeout
         
         processor.stop_monitoring()  # Should handle timeout gracefully
     
-    def test_destructor(self, mock_config, mock_pyaudio):
+    def test_destructor(self, processor):
         """Test destructor calls cleanup."""
-        processor = AudioProcessor()
-        
         with patch.object(processor, 'cleanup') as mock_cleanup:
             processor.__del__()
             mock_cleanup.assert_called_once()
-    
-    def test_initialize_audio_failure(self, mock_config, mock_pyaudio):
-        """Test audio initialization failure."""
-        # Create a new processor with different mock setup
-        with patch('src.audio_processor.pyaudio') as mock_pyaudio_module:
-            # Mock PyAudio constants
-            mock_pyaudio_module.paInt16 = 8
-            
-            # Mock PyAudio class
-            mock_audio_instance = Mock()
-            mock_pyaudio_module.PyAudio.return_value = mock_audio_instance
-            
-            # Mock PyAudio failure
-            mock_audio_instance.get_device_count.side_effect = Exception("PyAudio failed")
-            
-            # Should raise Exception when PyAudio fails (implementation raises original exception)
-            with pytest.raises(Exception, match="PyAudio failed"):
-                AudioProcessor()
-    
-    def test_initialize_audio_device_not_found(self, mock_config, mock_pyaudio):
-        """Test audio initialization when device not found."""
-        # Create a new processor with different mock setup
-        with patch('src.audio_processor.pyaudio') as mock_pyaudio_module:
-            # Mock PyAudio constants
-            mock_pyaudio_module.paInt16 = 8
-            
-            # Mock PyAudio class
-            mock_audio_instance = Mock()
-            mock_pyaudio_module.PyAudio.return_value = mock_audio_instance
-            
-            # Mock no matching devices and no default device
-            mock_audio_instance.get_device_count.return_value = 2
-            mock_audio_instance.get_device_info_by_index.side_effect = [
-                {'name': 'Other Device 1', 'maxInputChannels': 2},
-                {'name': 'Other Device 2', 'maxInputChannels': 1}
-            ]
-            mock_audio_instance.get_default_input_device_info.side_effect = Exception("No default device")
-            
-            with pytest.raises(RuntimeError, match="Audio device 'Test Device' not found"):
-                AudioProcessor() 
\ No newline at end of file
@@ -13,28 +13,17 @@ import sys
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from config_manager import ConfigManager, initialize_config, get_config
+from config_manager import ConfigManager, _LazyConfigManager, initialize_config, get_config
 
 
 class TestConfigManager:
     """Test cases for ConfigManager class."""
     
-    def test_init_with_valid_config_dir(self, temp_config_dir, sample_config, sample_secrets):
+    def test_init_with_valid_config_dir(self, populated_config_dir):
         """Test ConfigManager initialization with valid configuration."""
-        # Create config file
-        config_file = temp_config_dir / "config.json"
-        with open(config_file, 'w') as f:
-            json.dump(sample_config, f)
-        
-        # Create secrets file
-        secrets_file = temp_config_dir / "secrets.env"
-        with open(secrets_file, 'w') as f:
-            for key, value in sample_secrets.items():
-                f.write(f"{key}={value}\n")
+        config = ConfigManager(str(populated_config_dir))
         
-        config = ConfigManager(str(temp_config_dir))
-        
-        assert config.config_dir == temp_config_dir
+        assert config.config_dir == populated_config_dir
         assert config.get("audio.device_name") == "USB Audio CODEC"
         assert config.get_secret("LASTFM_API_KEY") == "test_api_key"
     
@@ -75,6 +64,23 @@ class TestConfigManager:
         config_manager.set("new.section.value", "test")
         assert config_manager.get("new.section.value") == "test"
     
+    def test_set_config_section(self, config_manager):
+        """Test setting a whole section keeps dotted lookups in sync."""
+        config_manager.set("audio", {"device_name": "Section Device"})
+        
+        assert config_manager.get("audio.device_name") == "Section Device"
+        assert config_manager.get("audio.sample_rate") is None
+        
+        config_manager.set("audio", "flat")
+        assert config_manager.get("audio") == "flat"
+        assert config_manager.get("audio.device_name") is None
+    
+    def test_get_section_and_nested_paths(self, config_manager):
+        """Test intermediate sections and non-dict paths resolve like nested lookups."""
+        assert config_manager.get("recognition.providers")["audd"]["enabled"] is True
+        assert config_manager.get("recognition.providers.order.0", "missing") == "missing"
+        assert config_manager.get("audio.sample_rate.value", "missing") == "missing"
+    
     def test_get_secret(self, config_manager):
         """Test getting secret values."""
         assert config_manager.get_secret("LASTFM_API_KEY") == "test_api_key"
@@ -99,6 +105,27 @@ class TestConfigManager:
         assert validation["AUDD_API_KEY"]["present"] is True
         assert validation["AUDD_API_KEY"]["required"] is False
     
+    def test_validate_secrets_cached(self, config_manager):
+        """Test secret validation is computed once until secrets reload."""
+        first = config_manager.validate_secrets()
+        
+        with patch.object(config_manager, 'has_secret') as mock_has_secret:
+            assert config_manager.validate_secrets() is first
+            mock_has_secret.assert_not_called()
+        
+        config_manager._load_secrets()
+        assert config_manager.validate_secrets() is not first
+    
+    def test_section_cache_invalidated_on_change(self, config_manager):
+        """Test section accessors reflect set and update_config changes."""
+        assert config_manager.get_audio_config() is config_manager.get_audio_config()
+        
+        config_manager.set("audio", {"device_name": "Set Device"})
+        assert config_manager.get_audio_config() == {"device_name": "Set Device"}
+        
+        config_manager.update_config({"audio": {"device_name": "Updated Device"}})
+        assert config_manager.get_audio_config()["device_name"] == "Updated Device"
+    
     def test_validate_secrets_missing_required(self, temp_config_dir, sample_config):
         """Test secret validation with missing required secrets."""
         # Create config file only
@@ -140,6 +167,65 @@ class TestConfigManager:
         
         assert backup_config["audio"]["device_name"] == "USB Audio CODEC"
     
+    def test_save_config_skipped_when_unchanged(self, config_manager, temp_config_dir):
+        """Test that saving without changes does not rewrite the file."""
+        config_file = temp_config_dir / "config.json"
+        
+        with patch.object(config_manager, '_atomic_write') as mock_write:
+            config_manager.save_config()
+            mock_write.assert_not_called()
+            
+            config_manager.save_config(force=True)
+            mock_write.assert_called_once()
+        
+        config_manager.update_config({"audio": {"sample_rate": 48000}})
+        config_manager.save_config()
+        assert json.loads(config_file.read_text())["audio"]["sample_rate"] == 48000
+        
+        # Saved state is clean again
+        with patch.object(config_manager, '_atomic_write') as mock_write:
+            config_manager.save_config()
+            mock_write.assert_not_called()
+    
+    def test_save_config_without_orjson(self, config_manager, temp_config_dir):
+        """Test saving and reloading configuration with the stdlib json fallback."""
+        with patch('config_manager.ORJSON_AVAILABLE', False):
+            config_manager.set("audio.device_name", "Fallback Device")
+            config_manager.save_config()
+            
+            config = ConfigManager(str(temp_config_dir))
+        
+        assert config.get("audio.device_name") == "Fallback Device"
+    
+    def test_save_config_with_backup(self, config_manager, temp_config_dir):
+        """Test saving configuration and writing a backup in one call."""
+        config_manager.set("audio.device_name", "Backed Up Device")
+        
+        with patch.object(config_manager, '_dump_bytes', wraps=config_manager._dump_bytes) as mock_dump:
+            backup_path = config_manager.save_config(backup=True)
+        
+        mock_dump.assert_called_once()
+        assert backup_path.read_bytes() == (temp_config_dir / "config.json").read_bytes()
+        assert json.loads(backup_path.read_text())["audio"]["device_name"] == "Backed Up Device"
+        
+        # No temp files left behind by the atomic writes
+        assert not list(temp_config_dir.glob("*.tmp"))
+    
+    def test_save_config_keeps_file_mode(self, config_manager, temp_config_dir):
+        """Test atomic saves keep the config file's mode and give new files the umask default."""
+        config_file = temp_config_dir / "config.json"
+        config_file.chmod(0o640)
+        
+        old_umask = os.umask(0o022)
+        try:
+            config_manager.set("audio.device_name", "Mode Device")
+            backup_path = config_manager.save_config(backup=True)
+        finally:
+            os.umask(old_umask)
+        
+        assert config_file.stat().st_mode & 0o777 == 0o640
+        assert backup_path.stat().st_mode & 0o777 == 0o644
+    
     def test_backup_config_auto_suffix(self, config_manager, temp_config_dir):
         """Test creating configuration backup with auto-generated suffix."""
         backup_path = config_manager.backup_config()
@@ -159,6 +245,14 @@ class TestConfigManager:
         config_dict["audio"]["device_name"] = "Modified"
         assert config_manager.get("audio.device_name") == "USB Audio CODEC"
     
+    def test_get_config_dict_without_orjson(self, config_manager):
+        """Test getting a configuration copy with the stdlib json fallback."""
+        with patch('config_manager.ORJSON_AVAILABLE', False):
+            config_dict = config_manager.get_config_dict()
+        
+        config_dict["audio"]["device_name"] = "Modified"
+        assert config_manager.get("audio.device_name") == "USB Audio CODEC"
+    
     def test_update_config(self, config_manager):
         """Test updating configuration with new values."""
         updates = {
@@ -177,6 +271,18 @@ class TestConfigManager:
         assert config_manager.get("audio.sample_rate") == 48000
         assert config_manager.get("new_section.value") == "test"
     
+    def test_update_config_deep_merge(self, config_manager):
+        """Test nested updates merge into existing sections without dropping siblings."""
+        config_manager.update_config({
+            "recognition": {"providers": {"audd": {"timeout": 99}}},
+            "audio": "replaced"
+        })
+        
+        assert config_manager.get("recognition.providers.audd.timeout") == 99
+        assert config_manager.get("recognition.providers.audd.enabled") is True
+        assert config_manager.get("recognition.providers.shazam.enabled") is True
+        assert config_manager.get("audio") == "replaced"
+    
     def test_get_audio_config(self, config_manager):
         """Test getting audio configuration section."""
         audio_config = config_manager.get_audio_config()
@@ -239,6 +345,49 @@ class TestConfigManager:
         
         assert order == ["audd", "shazam"]
     
+    def test_provider_settings_follow_changes(self, config_manager):
+        """Test provider order and enabled flags track set() and update_config()."""
+        config_manager.set("recognition.providers.audd.enabled", False)
+        assert config_manager.is_provider_enabled("audd") is False
+        
+        config_manager.update_config({"recognition": {"providers": {"order": ["shazam"]}}})
+        assert config_manager.get_provider_order() == ["shazam"]
+        assert config_manager.is_provider_enabled("shazam") is True
+        
+        config_manager.set("recognition", {"providers": {"audd": {"enabled": True}}})
+        assert config_manager.is_provider_enabled("audd") is True
+        assert config_manager.is_provider_enabled("shazam") is False
+        assert config_manager.get_provider_order() == ["audd", "shazam"]
+    
+    def test_config_cache_written_and_reused(self, config_manager, temp_config_dir):
+        """Test parsed config is cached and reused while config.json is unchanged."""
+        assert config_manager.cache_file.exists()
+        
+        with patch('config_manager._json_loads') as mock_loads:
+            config = ConfigManager(str(temp_config_dir))
+            mock_loads.assert_not_called()
+        
+        assert config.get("audio.device_name") == "USB Audio CODEC"
+    
+    def test_config_cache_invalidated_on_change(self, config_manager, temp_config_dir, sample_config):
+        """Test stale cache is ignored when config.json changes."""
+        sample_config["audio"]["device_name"] = "Edited Device"
+        with open(temp_config_dir / "config.json", 'w') as f:
+            json.dump(sample_config, f)
+        
+        config = ConfigManager(str(temp_config_dir))
+        
+        assert config.get("audio.device_name") == "Edited Device"
+    
+    def test_save_config_invalidates_cache(self, config_manager):
+        """Test saving configuration removes the parsed config cache."""
+        assert config_manager.cache_file.exists()
+        
+        config_manager.set("audio.device_name", "Changed Device")
+        config_manager.save_config()
+        
+        assert not config_manager.cache_file.exists()
+    
     def test_load_secrets_from_environment(self, temp_config_dir, sample_config):
         """Test loading secrets from environment variables."""
         # Create config file only
@@ -260,6 +409,20 @@ class TestConfigManager:
             os.environ.pop("LASTFM_API_KEY", None)
             os.environ.pop("AUDD_API_KEY", None)
     
+    def test_load_secrets_ignores_other_environment(self, temp_config_dir, sample_config):
+        """Test that only prefixed environment variables are loaded as secrets."""
+        config_file = temp_config_dir / "config.json"
+        with open(config_file, 'w') as f:
+            json.dump(sample_config, f)
+        
+        env = {"SHAZAM_TOKEN": "shazam", "MY_LASTFM_KEY": "nope", "lastfm_api_key": "nope"}
+        with patch.dict(os.environ, env):
+            config = ConfigManager(str(temp_config_dir))
+        
+        assert config.get_secret("SHAZAM_TOKEN") == "shazam"
+        assert not config.has_secret("MY_LASTFM_KEY")
+        assert not config.has_secret("lastfm_api_key")
+    
     def test_load_secrets_with_comments(self, temp_config_dir, sample_config):
         """Test loading secrets file with comments."""
         # Create config file
@@ -287,19 +450,9 @@ class TestConfigManager:
 class TestConfigManagerFunctions:
     """Test cases for ConfigManager utility functions."""
     
-    def test_initialize_config(self, temp_config_dir, sample_config, sample_secrets):
+    def test_initialize_config(self, populated_config_dir):
         """Test initialize_config function."""
-        # Create config files
-        config_file = temp_config_dir / "config.json"
-        with open(config_file, 'w') as f:
-            json.dump(sample_config, f)
-        
-        secrets_file = temp_config_dir / "secrets.env"
-        with open(secrets_file, 'w') as f:
-            for key, value in sample_secrets.items():
-                f.write(f"{key}={value}\n")
-        
-        config = initialize_config(str(temp_config_dir))
+        config = initialize_config(str(populated_config_dir))
         
         assert isinstance(config, ConfigManager)
         assert config.get("audio.device_name") == "USB Audio CODEC"
@@ -310,6 +463,30 @@ class TestConfigManagerFunctions:
         result = get_config()
         assert isinstance(result, ConfigManager)
     
+    def test_lazy_config_defers_loading(self, temp_config_dir, sample_config):
+        """Test lazy config manager reads files only on first access."""
+        lazy = _LazyConfigManager(str(temp_config_dir))
+        assert isinstance(lazy, ConfigManager)
+        
+        # Files can appear after construction since nothing has been read yet
+        with open(temp_config_dir / "config.json", 'w') as f:
+            json.dump(sample_config, f)
+        
+        assert lazy.get("audio.device_name") == "USB Audio CODEC"
+        assert type(lazy) is ConfigManager
+    
+    def test_lazy_config_retries_after_failure(self, temp_config_dir, sample_config):
+        """Test lazy config manager stays unloaded if loading fails."""
+        lazy = _LazyConfigManager(str(temp_config_dir))
+        
+        with pytest.raises(FileNotFoundError):
+            lazy.get("audio.device_name")
+        
+        with open(temp_config_dir / "config.json", 'w') as f:
+            json.dump(sample_config, f)
+        
+        assert lazy.get("audio.device_name") == "USB Audio CODEC"
+    
     def test_get_config_not_initialized(self):
         """Test get_config function when not initialized."""
         # The get_config function should always work since it creates a new instance
@@ -322,6 +499,8 @@ class TestConfigManagerErrorHandling:
     
     def test_save_config_error(self, config_manager, temp_config_dir):
         """Test error handling when saving config fails."""
+        config_manager.set("audio.device_name", "Unsaved Device")
+        
         # Make config directory read-only
         os.chmod(temp_config_dir, 0o444)
         
@@ -347,6 +526,22 @@ class TestConfigManagerErrorHandling:
         with pytest.raises(json.JSONDecodeError):
             ConfigManager(str(temp_config_dir))
     
+    def test_load_secrets_commented_assignment_and_equals_in_value(self, temp_config_dir, sample_config):
+        """Test commented-out assignments are skipped and values may contain '='."""
+        config_file = temp_config_dir / "config.json"
+        with open(config_file, 'w') as f:
+            json.dump(sample_config, f)
+        
+        secrets_file = temp_config_dir / "secrets.env"
+        with open(secrets_file, 'w') as f:
+            f.write("  # LASTFM_API_KEY=commented_out\n")
+            f.write(" FLASK_SECRET_KEY = abc==def \n")
+        
+        config = ConfigManager(str(temp_config_dir))
+        
+        assert config.get_secret("LASTFM_API_KEY") is None
+        assert config.get_secret("FLASK_SECRET_KEY") == "abc==def"
+    
     def test_load_secrets_malformed_line(self, temp_config_dir, sample_config):
         """Test handling malformed lines in secrets file."""
         # Create config file
@@ -15,7 +15,7 @@ from pathlib import Path
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from database import DatabaseManager, ScrobbleEntry, DuplicateEntry
+from database import DatabaseManager, ScrobbleEntry, DuplicateEntry, encode_fingerprint
 
 
 class TestDatabaseManager:
@@ -82,6 +82,42 @@ class TestDatabaseManager:
         queue = db.get_scrobble_queue(limit=3)
         assert len(queue) == 3
     
+    def test_add_many_to_scrobble_queue(self, temp_database):
+        """Test adding a batch of scrobbles in one transaction."""
+        db = DatabaseManager(temp_database)
+        db.add_to_scrobble_queue(ScrobbleEntry("Existing", "Song", created_at=1))
+        
+        entries = [
+            (ScrobbleEntry(f"Artist{i}", f"Song{i}", created_at=10 + i), {"index": i} if i else None)
+            for i in range(3)
+        ]
+        ids = db.add_many_to_scrobble_queue(entries)
+        
+        assert ids == [entry.id for entry, _ in entries]
+        assert len(set(ids)) == 3
+        
+        queue = db.get_scrobble_queue()
+        assert [entry.id for entry in queue[1:]] == ids
+        assert [entry.artist for entry in queue[1:]] == ["Artist0", "Artist1", "Artist2"]
+        assert db.add_many_to_scrobble_queue([]) == []
+        
+        batch = [ScrobbleEntry("Batch", f"Song{i}") for i in range(3)]
+        db.add_many_to_scrobble_queue([(entry, None) for entry in batch])
+        assert len({entry.created_at for entry in batch}) == 1
+    
+    def test_add_many_to_history_and_stats(self, temp_database):
+        """Test batch inserts into history and system stats."""
+        db = DatabaseManager(temp_database)
+        
+        entry = ScrobbleEntry("Artist", "Song", "Album", duration=180, timestamp=int(time.time()))
+        history_ids = db.add_many_to_history([(entry, "audd", 0.9, None), (entry, "shazam", 0.8, {"a": 1})])
+        assert len(history_ids) == 2
+        assert len(db.get_recent_scrobbles()) == 2
+        
+        stats_ids = db.add_many_system_stats([{"cpu_usage": 10.0}, {"cpu_usage": 20.0}])
+        assert len(stats_ids) == 2
+        assert sorted(s["cpu_usage"] for s in db.get_recent_stats()) == [10.0, 20.0]
+    
     def test_remove_from_scrobble_queue(self, temp_database):
         """Test removing scrobble from queue."""
         db = DatabaseManager(temp_database)
@@ -95,6 +131,57 @@ class TestDatabaseManager:
         queue = db.get_scrobble_queue()
         assert len(queue) == 0
     
+    def test_get_scrobble_queue_dicts(self, temp_database):
+        """Test queue rows are returned as display dictionaries, oldest first."""
+        db = DatabaseManager(temp_database)
+        
+        for created_at in [20, 10]:
+            db.add_to_scrobble_queue(ScrobbleEntry("Artist", f"Song{created_at}", "Album",
+                                                   duration=180, mbid="x", created_at=created_at))
+        
+        rows = db.get_scrobble_queue_dicts()
+        entries = db.get_scrobble_queue()
+        assert rows == [
+            {'id': e.id, 'artist': e.artist, 'title': e.title, 'album': e.album,
+             'timestamp': e.timestamp, 'duration': e.duration,
+             'retry_count': e.retry_count, 'created_at': e.created_at}
+            for e in entries
+        ]
+        assert [row['title'] for row in rows] == ["Song10", "Song20"]
+        assert len(db.get_scrobble_queue_dicts(limit=1)) == 1
+    
+    @pytest.mark.parametrize("has_returning", [True, False])
+    def test_pop_scrobble_queue(self, temp_database, has_returning):
+        """Test dequeuing the oldest entries in one step."""
+        db = DatabaseManager(temp_database)
+        
+        for i, created_at in enumerate([30, 10, 20, 40]):
+            db.add_to_scrobble_queue(ScrobbleEntry(f"Artist{i}", f"Song{i}", created_at=created_at))
+        
+        with patch('database._HAS_RETURNING', has_returning):
+            popped = db.pop_scrobble_queue(limit=3)
+        
+        assert [entry.created_at for entry in popped] == [10, 20, 30]
+        assert [entry.created_at for entry in db.get_scrobble_queue()] == [40]
+    
+    def test_queue_size_counter(self, temp_database):
+        """Test the trigger-maintained queue size tracks every insert and delete path."""
+        db = DatabaseManager(temp_database)
+        assert db.get_queue_size() == 0
+        
+        entry_id = db.add_to_scrobble_queue(ScrobbleEntry("Artist", "Song"))
+        db.add_many_to_scrobble_queue([(ScrobbleEntry(f"Artist{i}", "Song"), None) for i in range(4)])
+        assert db.get_queue_size() == 5
+        
+        db.remove_from_scrobble_queue(entry_id)
+        db.pop_scrobble_queue(limit=2)
+        assert db.get_queue_size() == 2
+        
+        # A fresh manager resyncs the counter with the table
+        with db._get_connection() as conn:
+            conn.execute('UPDATE queue_counts SET n = 99')
+        assert DatabaseManager(temp_database).get_queue_size() == 2
+    
     def test_increment_retry_count(self, temp_database):
         """Test incrementing retry count."""
         db = DatabaseManager(temp_database)
@@ -108,6 +195,33 @@ class TestDatabaseManager:
         queue = db.get_scrobble_queue()
         assert queue[0].retry_count == 1
     
+    def test_finish_scrobble_batch(self, temp_database):
+        """Test a queue drain's results are written together."""
+        db = DatabaseManager(temp_database)
+        
+        entries = [ScrobbleEntry(f"Artist{i}", "Song", timestamp=100 + i) for i in range(4)]
+        db.add_many_to_scrobble_queue([(entry, None) for entry in entries])
+        
+        removed = db.finish_scrobble_batch(entries[:2], [entries[2].id], [entries[3].id])
+        
+        assert removed == 3
+        queue = db.get_scrobble_queue()
+        assert [(entry.id, entry.retry_count) for entry in queue] == [(entries[2].id, 1)]
+        assert db.get_queue_size() == 1
+        
+        history = db.get_recent_scrobbles()
+        assert sorted(row["artist"] for row in history) == ["Artist0", "Artist1"]
+        assert {row["recognition_provider"] for row in history} == {"lastfm"}
+    
+    def test_clear_scrobble_queue(self, temp_database):
+        """Test clearing the queue in one statement, with no row cap."""
+        db = DatabaseManager(temp_database)
+        db.add_many_to_scrobble_queue([(ScrobbleEntry(f"Artist{i}", "Song"), None) for i in range(1001)])
+        
+        assert db.clear_scrobble_queue() == 1001
+        assert db.get_scrobble_queue() == []
+        assert db.get_queue_size() == 0
+    
     def test_add_to_history(self, temp_database):
         """Test adding scrobble to history."""
         db = DatabaseManager(temp_database)
@@ -124,6 +238,91 @@ class TestDatabaseManager:
         assert history[0]["recognition_provider"] == "audd"
         assert history[0]["recognition_confidence"] == 0.85
     
+    def test_get_scrobble_stats(self, temp_database):
+        """Test scrobble statistics aggregate the recent history window."""
+        db = DatabaseManager(temp_database)
+        assert db.get_scrobble_stats(days=7) == {
+            'period_days': 7,
+            'total_scrobbles': 0,
+            'unique_artists': 0,
+            'top_artists': [],
+            'recognition_providers': []
+        }
+        
+        for artist, provider in [("A", "audd"), ("A", "audd"), ("A", "shazam"), ("B", "audd")]:
+            db.add_to_history(ScrobbleEntry(artist, "Song", timestamp=int(time.time())), provider, 0.9)
+        with db._get_connection() as conn:
+            conn.execute("UPDATE scrobble_history SET scrobbled_at = 0 WHERE artist = 'B'")
+        
+        stats = db.get_scrobble_stats(days=7)
+        assert stats['total_scrobbles'] == 3
+        assert stats['unique_artists'] == 1
+        assert stats['top_artists'] == [{'artist': 'A', 'count': 3}]
+        assert stats['recognition_providers'] == [
+            {'recognition_provider': 'audd', 'count': 2},
+            {'recognition_provider': 'shazam', 'count': 1}
+        ]
+    
+    def test_history_metadata_round_trip(self, temp_database):
+        """Test small and large metadata are stored compactly and decoded on read."""
+        db = DatabaseManager(temp_database)
+        entry = ScrobbleEntry("Artist", "Song", "Album", duration=180, timestamp=int(time.time()))
+        
+        small = {"source": "audd"}
+        large = {"lyrics": "la " * 200}
+        db.add_to_history(entry, "audd", 0.9, small)
+        db.add_to_history(entry, "audd", 0.9, large)
+        db.add_to_history(entry, "audd", 0.9)
+        
+        with db._get_connection() as conn:
+            stored = [row[0] for row in conn.execute('SELECT metadata FROM scrobble_history ORDER BY id')]
+        assert stored[0] == '{"source":"audd"}'
+        assert isinstance(stored[1], bytes)
+        assert stored[2] is None
+        
+        decoded = [scrobble["metadata"] for scrobble in db.get_recent_scrobbles()]
+        assert small in decoded
+        assert large in decoded
+        assert None in decoded
+    
+    def test_get_recent_scrobbles_without_metadata(self, temp_database):
+        """Test recent scrobbles can skip reading the metadata column."""
+        db = DatabaseManager(temp_database)
+        entry = ScrobbleEntry("Artist", "Song", "Album", duration=180, timestamp=int(time.time()))
+        db.add_to_history(entry, "audd", 0.9, {"source": "audd"})
+        
+        with_metadata = db.get_recent_scrobbles()[0]
+        without_metadata = db.get_recent_scrobbles(include_metadata=False)[0]
+        
+        assert with_metadata["metadata"] == {"source": "audd"}
+        assert "metadata" not in without_metadata
+        assert without_metadata == {k: v for k, v in with_metadata.items() if k != "metadata"}
+    
+    def test_get_recent_scrobbles_since(self, temp_database):
+        """Test recent scrobbles are filtered by scrobble time in SQL."""
+        db = DatabaseManager(temp_database)
+        for i in range(3):
+            db.add_to_history(ScrobbleEntry(f"Artist{i}", "Song", timestamp=int(time.time())), "audd", 0.9)
+        with db._get_connection() as conn:
+            conn.execute("UPDATE scrobble_history SET scrobbled_at = 100 + id")
+        
+        recent = db.get_recent_scrobbles_since(102)
+        assert [s["artist"] for s in recent] == ["Artist2", "Artist1"]
+        assert "metadata" not in recent[0]
+        assert len(db.get_recent_scrobbles_since(0, limit=1)) == 1
+        assert [s["artist"] for s in db.get_recent_scrobbles_since(0, after_id=2)] == ["Artist2"]
+    
+    def test_history_metadata_without_orjson(self, temp_database):
+        """Test metadata decoding with the stdlib json fallback."""
+        db = DatabaseManager(temp_database)
+        entry = ScrobbleEntry("Artist", "Song", "Album", duration=180, timestamp=int(time.time()))
+        db.add_to_history(entry, "audd", 0.9, {"source": "audd"})
+        
+        with patch('database.ORJSON_AVAILABLE', False):
+            history = db.get_recent_scrobbles()
+        
+        assert history[0]["metadata"] == {"source": "audd"}
+    
     def test_add_duplicate_entry(self, temp_database):
         """Test adding duplicate entry."""
         db = DatabaseManager(temp_database)
@@ -139,6 +338,28 @@ class TestDatabaseManager:
         entry_id = db.add_duplicate_entry(entry)
         assert entry_id is not None
     
+    @pytest.mark.parametrize("has_returning", [True, False])
+    def test_add_duplicate_entry_updates_in_place(self, temp_database, has_returning):
+        """Test re-adding a fingerprint updates the existing row instead of replacing it."""
+        db = DatabaseManager(temp_database)
+        
+        entry = DuplicateEntry("fp", "Artist", "Song", timestamp=100, confidence=0.7)
+        other = DuplicateEntry("fp2", "Other", "Track", timestamp=100, confidence=0.7)
+        
+        with patch('database._HAS_RETURNING', has_returning):
+            first_id = db.add_duplicate_entry(entry)
+            db.add_duplicate_entry(other)
+            
+            entry.timestamp = 200
+            entry.confidence = 0.95
+            second_id = db.add_duplicate_entry(entry)
+        
+        assert second_id == first_id
+        found = db.find_duplicate("fp")
+        assert found.id == first_id
+        assert found.timestamp == 200
+        assert found.confidence == 0.95
+    
     def test_find_duplicate(self, temp_database):
         """Test finding duplicate entry."""
         db = DatabaseManager(temp_database)
@@ -158,6 +379,94 @@ class TestDatabaseManager:
         assert found.artist == "Artist"
         assert found.title == "Song"
     
+    def test_find_duplicate_expires(self, temp_database):
+        """Test duplicate entries stop matching once their TTL has passed."""
+        db = DatabaseManager(temp_database)
+        entry = DuplicateEntry("fp", "Artist", "Song", timestamp=1000, confidence=0.9)
+        
+        with patch('database._now_s', return_value=1000):
+            db.add_duplicate_entry(entry, ttl_seconds=60)
+            assert db.find_duplicate("fp") is not None
+        
+        with patch('database._now_s', return_value=1060):
+            assert db.find_duplicate("fp") is None
+            assert db.cleanup_expired_duplicates() == 1
+    
+    def test_no_redundant_fingerprint_index(self, temp_database):
+        """Test the explicit fingerprint index is dropped in favour of the UNIQUE one."""
+        conn = sqlite3.connect(temp_database)
+        conn.execute('''
+            CREATE TABLE duplicate_cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                fingerprint TEXT UNIQUE NOT NULL,
+                artist TEXT NOT NULL,
+                title TEXT NOT NULL,
+                timestamp INTEGER NOT NULL,
+                confidence REAL NOT NULL,
+                expires_at INTEGER NOT NULL
+            )
+        ''')
+        conn.execute('CREATE INDEX idx_duplicate_cache_fingerprint ON duplicate_cache(fingerprint)')
+        conn.commit()
+        conn.close()
+        
+        db = DatabaseManager(temp_database)
+        
+        with db._get_connection() as conn:
+            indexes = [row[1] for row in conn.execute("PRAGMA index_list('duplicate_cache')")]
+            plan = conn.execute(
+                'EXPLAIN QUERY PLAN SELECT * FROM duplicate_cache WHERE fingerprint = ?', ('fp',)
+            ).fetchall()
+        
+        assert 'idx_duplicate_cache_fingerprint' not in indexes
+        assert any('sqlite_autoindex_duplicate_cache' in row[3] for row in plan)
+    
+    def test_hex_fingerprint_stored_as_integer(self, temp_database):
+        """Test 64-bit hex fingerprints are stored as integers and returned as hex."""
+        db = DatabaseManager(temp_database)
+        
+        for fingerprint in ("0123456789abcdef", "fedcba9876543210"):
+            db.add_duplicate_entry(DuplicateEntry(fingerprint, "Artist", "Song", timestamp=1, confidence=0.9))
+        db.add_duplicate_entry(DuplicateEntry("abcd", "Artist", "Song", timestamp=1, confidence=0.9))
+        
+        with db._get_connection() as conn:
+            stored = [row[0] for row in conn.execute('SELECT fingerprint FROM duplicate_cache ORDER BY id')]
+        assert stored == [0x0123456789abcdef, 0xfedcba9876543210 - 2 ** 64, bytes.fromhex("abcd")]
+        
+        assert db.find_duplicate("0123456789abcdef").fingerprint == "0123456789abcdef"
+        assert db.find_duplicate("fedcba9876543210").fingerprint == "fedcba9876543210"
+        assert db.find_duplicate("abcd").fingerprint == "abcd"
+    
+    def test_legacy_fingerprint_column_rebuilt(self, temp_database):
+        """Test a duplicate cache with a non-integer fingerprint column is recreated."""
+        conn = sqlite3.connect(temp_database)
+        conn.execute('''
+            CREATE TABLE duplicate_cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                fingerprint BLOB UNIQUE NOT NULL,
+                artist TEXT NOT NULL,
+                title TEXT NOT NULL,
+                timestamp INTEGER NOT NULL,
+                confidence REAL NOT NULL,
+                expires_at INTEGER NOT NULL
+            )
+        ''')
+        conn.execute('''
+            INSERT INTO duplicate_cache (fingerprint, artist, title, timestamp, confidence, expires_at)
+            VALUES (?, 'Artist', 'Song', 1, 0.9, ?)
+        ''', (bytes.fromhex("0123456789abcdef"), int(time.time()) + 600))
+        conn.commit()
+        conn.close()
+        
+        db = DatabaseManager(temp_database)
+        with db._get_connection() as conn:
+            columns = {row[1]: row[2] for row in conn.execute('PRAGMA table_info(duplicate_cache)')}
+        assert columns['fingerprint'] == 'INTEGER'
+        assert db.find_duplicate("0123456789abcdef") is None
+        
+        db.add_duplicate_entry(DuplicateEntry("0123456789abcdef", "Artist", "Song", timestamp=1, confidence=0.9))
+        assert db.find_duplicate("0123456789abcdef") is not None
+    
     def test_find_duplicate_not_exists(self, temp_database):
         """Test finding non-existing duplicate."""
         db = DatabaseManager(temp_database)
@@ -165,6 +474,55 @@ class TestDatabaseManager:
         found = db.find_duplicate("nonexistent_fingerprint")
         assert found is None
     
+    def test_duplicate_normalized_columns(self, temp_database):
+        """Test normalized artist/title round trip and are added to older schemas."""
+        conn = sqlite3.connect(temp_database)
+        conn.execute('''
+            CREATE TABLE duplicate_cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                fingerprint TEXT UNIQUE NOT NULL,
+                artist TEXT NOT NULL,
+                title TEXT NOT NULL,
+                timestamp INTEGER NOT NULL,
+                confidence REAL NOT NULL,
+                expires_at INTEGER NOT NULL
+            )
+        ''')
+        conn.commit()
+        conn.close()
+        
+        db = DatabaseManager(temp_database)
+        now = int(time.time())
+        db.add_duplicate_entry(DuplicateEntry("00000000000000aa", "A & B", "Song!", now, 0.9,
+                                              artist_norm="a and b", title_norm="song"))
+        db.add_duplicate_entry(DuplicateEntry("00000000000000bb", "Old", "Entry", now - 10, 0.9))
+        
+        found = db.find_duplicate("00000000000000aa")
+        assert (found.artist_norm, found.title_norm) == ("a and b", "song")
+        
+        recent = db.get_recent_duplicates(now - 5)
+        assert [entry.fingerprint for entry in recent] == ["00000000000000aa"]
+        assert db.get_recent_duplicates(0)[1].title_norm is None
+    
+    def test_find_duplicate_bloom_filter(self, temp_database):
+        """Test unseen fingerprints are rejected by the Bloom filter without a query."""
+        db = DatabaseManager(temp_database)
+        now = int(time.time())
+        for i in range(50):
+            db.add_duplicate_entry(DuplicateEntry(f"{i:016x}", "Artist", "Song", now, 0.9))
+        
+        # No false negatives, including after a reload from the table
+        reopened = DatabaseManager(temp_database)
+        assert all(encode_fingerprint(f"{i:016x}") in reopened._duplicate_filter for i in range(50))
+        assert reopened.find_duplicate(f"{7:016x}") is not None
+        
+        with patch.object(db, '_get_read_connection') as mock_read:
+            assert db.find_duplicate("ffffffffffffffff") is None
+            mock_read.assert_not_called()
+        
+        db.clear_duplicate_cache()
+        assert encode_fingerprint(f"{7:016x}") not in db._duplicate_filter
+    
     def test_add_system_stats(self, temp_database):
         """Test adding system stats."""
         db = DatabaseManager(temp_database)
@@ -183,6 +541,37 @@ class TestDatabaseManager:
         assert recent_stats[0]["cpu_usage"] == 25.5
         assert recent_stats[0]["memory_usage"] == 512.0
     
+    def test_buffered_system_stats(self, temp_database):
+        """Test system stats are buffered and written in batches when configured."""
+        with patch('database.get_config') as mock_get_config:
+            mock_get_config.return_value.get_database_config.return_value = {'stats_buffer_size': 3}
+            db = DatabaseManager(temp_database)
+        
+        with patch.object(db, '_insert_many', wraps=db._insert_many) as mock_insert:
+            assert db.add_system_stats({"cpu_usage": 1.0}) is None
+            assert db.add_system_stats({"cpu_usage": 2.0}) is None
+            mock_insert.assert_not_called()
+            
+            db.add_system_stats({"cpu_usage": 3.0})
+            mock_insert.assert_called_once()
+            assert len(mock_insert.call_args[0][1]) == 3
+        
+        # Reads include buffered entries without writing them out
+        db.add_system_stats({"cpu_usage": 4.0})
+        with patch.object(db, '_insert_many', wraps=db._insert_many) as mock_insert:
+            recent = db.get_recent_stats()
+            assert db.get_database_stats()["system_stats_count"] == 4
+            mock_insert.assert_not_called()
+        assert [s["cpu_usage"] for s in recent][0] == 4.0
+        assert recent[0]["id"] is None
+        assert sorted(s["cpu_usage"] for s in recent) == [1.0, 2.0, 3.0, 4.0]
+        
+        # close() writes out whatever is still buffered
+        db.add_system_stats({"cpu_usage": 5.0})
+        db.close()
+        assert db._stats_buffer == []
+        assert db.get_database_stats()["system_stats_count"] == 5
+    
     def test_get_database_stats(self, temp_database):
         """Test getting database statistics."""
         db = DatabaseManager(temp_database)
@@ -200,6 +589,51 @@ class TestDatabaseManager:
         assert "system_stats_count" in stats
         assert "file_size" in stats
     
+    def test_scrobble_stats_use_covering_indexes(self, temp_database):
+        """Test stats queries on scrobbled_at are served from covering indexes."""
+        db = DatabaseManager(temp_database)
+        
+        with db._get_connection() as conn:
+            plan = conn.execute('''
+                EXPLAIN QUERY PLAN
+                SELECT artist, COUNT(*) FROM scrobble_history
+                WHERE scrobbled_at >= ? GROUP BY artist
+            ''', (0,)).fetchall()
+            assert any('COVERING INDEX idx_scrobble_history_scrobbled_artist' in row[3] for row in plan)
+            
+            plan = conn.execute('''
+                EXPLAIN QUERY PLAN
+                SELECT recognition_provider, COUNT(*) FROM scrobble_history
+                WHERE scrobbled_at >= ? GROUP BY recognition_provider
+            ''', (0,)).fetchall()
+            assert any('COVERING INDEX idx_scrobble_history_scrobbled_provider' in row[3] for row in plan)
+    
+    def test_expired_duplicate_cleanup_is_range_delete(self, temp_database):
+        """Test expiry cleanup searches the expires_at index instead of scanning the cache."""
+        db = DatabaseManager(temp_database)
+        
+        with db._get_connection() as conn:
+            plan = conn.execute(
+                'EXPLAIN QUERY PLAN DELETE FROM duplicate_cache WHERE expires_at <= ?', (0,)
+            ).fetchall()
+        
+        assert any('USING' in row[3] and 'idx_duplicate_cache_expires_at (expires_at<?)' in row[3]
+                   for row in plan)
+    
+    def test_recent_fingerprints_avoid_sort(self, temp_database):
+        """Test newest-unexpired fingerprint lookups walk the timestamp index without sorting."""
+        db = DatabaseManager(temp_database)
+        
+        with db._get_connection() as conn:
+            plan = conn.execute('''
+                EXPLAIN QUERY PLAN
+                SELECT fingerprint FROM duplicate_cache
+                WHERE expires_at > ? ORDER BY timestamp DESC LIMIT ?
+            ''', (0, 20)).fetchall()
+        
+        assert any('idx_duplicate_cache_timestamp' in row[3] for row in plan)
+        assert not any('TEMP B-TREE' in row[3] for row in plan)
+    
     def test_cleanup_old_data(self, temp_database):
         """Test cleaning up old data."""
         db = DatabaseManager(temp_database)
@@ -214,6 +648,206 @@ class TestDatabaseManager:
         assert "system_stats" in cleanup_stats
         assert "duplicate_cache" in cleanup_stats
     
+    def test_wal_journal_mode(self, temp_database):
+        """Test database uses WAL journaling with NORMAL synchronous."""
+        db = DatabaseManager(temp_database)
+        
+        with db._get_connection() as conn:
+            assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+            assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1
+            assert conn.execute('PRAGMA temp_store').fetchone()[0] == 2
+            assert conn.execute('PRAGMA page_size').fetchone()[0] == 4096
+    
+    def test_mmap_size_from_config(self, temp_database):
+        """Test memory-mapped I/O size is applied to each connection."""
+        with patch('database.get_config') as mock_get_config:
+            mock_get_config.return_value.get_database_config.return_value = {'mmap_size': 1048576}
+            db = DatabaseManager(temp_database)
+        
+        with db._get_connection() as conn:
+            assert conn.execute('PRAGMA mmap_size').fetchone()[0] == 1048576
+    
+    def test_cleanup_old_data_checkpoints_wal(self, temp_database):
+        """Test cleanup truncates the WAL file."""
+        db = DatabaseManager(temp_database)
+        
+        entry = ScrobbleEntry("Artist", "Song", "Album", duration=180, timestamp=int(time.time()))
+        db.add_to_history(entry, "audd", 0.85)
+        db.cleanup_old_data(days=1)
+        
+        wal_file = Path(temp_database + "-wal")
+        assert not wal_file.exists() or wal_file.stat().st_size == 0
+    
+    def test_connection_reused_per_thread(self, temp_database):
+        """Test each thread keeps its own persistent connection."""
+        import threading
+        
+        db = DatabaseManager(temp_database)
+        
+        with db._get_connection() as conn1:
+            pass
+        with db._get_connection() as conn2:
+            pass
+        assert conn1 is conn2
+        
+        other = []
+        
+        def worker():
+            with db._get_connection() as conn:
+                other.append(conn)
+                conn.execute('SELECT COUNT(*) FROM scrobble_queue').fetchone()
+        
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        
+        assert other[0] is not conn1
+    
+    def test_connections_closed_when_thread_ends(self, temp_database):
+        """Test short-lived threads don't leave their connections open."""
+        import threading
+        
+        db = DatabaseManager(temp_database)
+        opened = []
+        
+        def worker():
+            with db._get_connection() as conn, db._get_read_connection() as read_conn:
+                opened.extend([conn, read_conn])
+                db.get_queue_size()
+        
+        for _ in range(20):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+        
+        assert len(opened) == 40
+        for conn in opened:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute('SELECT 1')
+        
+        # Only the main thread's holder is left
+        assert len(db._thread_connections) == 1
+    
+    def test_read_connection_is_query_only(self, temp_database):
+        """Test read helpers use a separate connection that refuses writes."""
+        db = DatabaseManager(temp_database)
+        
+        with db._get_read_connection() as read_conn:
+            with db._get_connection() as write_conn:
+                assert read_conn is not write_conn
+            
+            assert read_conn.execute('PRAGMA query_only').fetchone()[0] == 1
+            with pytest.raises(sqlite3.OperationalError):
+                read_conn.execute("INSERT INTO configuration (key, value, updated_at) VALUES ('k', 'v', 0)")
+        
+        # Writes on the main connection are visible to the reader
+        db.add_to_scrobble_queue(ScrobbleEntry("Artist", "Song"))
+        assert db.get_queue_size() == 1
+    
+    def test_reads_do_not_pin_wal_snapshot(self, temp_database):
+        """Test point reads leave no open transaction that blocks checkpoints."""
+        db = DatabaseManager(temp_database)
+        db.add_duplicate_entry(DuplicateEntry(fingerprint="abc123", artist="A", title="T",
+                                             timestamp=int(time.time()), confidence=0.9))
+        
+        assert db.find_duplicate("abc123") is not None
+        assert db.get_queue_size() == 0
+        db.add_to_scrobble_queue(ScrobbleEntry("Artist", "Song"))
+        
+        with db._get_read_connection() as read_conn:
+            assert not read_conn.in_transaction
+        with db._get_connection() as conn:
+            assert not conn.in_transaction
+            busy = conn.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchone()[0]
+        assert busy == 0
+    
+    def test_close_reopens_connection(self, temp_database):
+        """Test closing cached connections and reconnecting on next use."""
+        db = DatabaseManager(temp_database)
+        
+        with db._get_connection() as conn1:
+            pass
+        db.close()
+        
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn1.execute('SELECT 1')
+        
+        entry = ScrobbleEntry("Artist", "Song", "Album", duration=180, timestamp=int(time.time()))
+        db.add_to_scrobble_queue(entry)
+        assert db.get_queue_size() == 1
+    
+    def test_uncommitted_work_rolled_back(self, temp_database):
+        """Test an open transaction does not leak into the next use of the connection."""
+        db = DatabaseManager(temp_database)
+        
+        with db._get_connection() as conn:
+            conn.execute('BEGIN')
+            conn.execute("INSERT INTO configuration (key, value, updated_at) VALUES ('k', 'v', 0)")
+        
+        with db._get_connection() as conn:
+            assert not conn.in_transaction
+            assert conn.execute('SELECT COUNT(*) FROM configuration').fetchone()[0] == 0
+    
+    def test_write_transaction_rolls_back_on_error(self, temp_database):
+        """Test a failed write transaction leaves no partial batch behind."""
+        db = DatabaseManager(temp_database)
+        
+        with pytest.raises(RuntimeError):
+            with db._write_transaction() as conn:
+                conn.execute("INSERT INTO configuration (key, value, updated_at) VALUES ('k', 'v', 0)")
+                raise RuntimeError("boom")
+        
+        with db._get_connection() as conn:
+            assert conn.execute('SELECT COUNT(*) FROM configuration').fetchone()[0] == 0
+    
+    def test_concurrent_writers(self, temp_database):
+        """Test writers on separate threads don't lose rows without a global lock."""
+        import threading
+        
+        db = DatabaseManager(temp_database)
+        
+        def worker(n):
+            for i in range(10):
+                db.add_many_to_scrobble_queue([(ScrobbleEntry(f"Artist{n}", f"Song{i}"), None)] * 2)
+                db.add_to_scrobble_queue(ScrobbleEntry(f"Artist{n}", f"Single{i}"))
+        
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert db.get_queue_size() == 4 * 10 * 3
+    
+    def test_begin_immediate_retries_when_locked(self):
+        """Test BEGIN IMMEDIATE is retried with backoff while the database is locked."""
+        conn = Mock()
+        conn.execute.side_effect = [sqlite3.OperationalError("database is locked")] * 2 + [None]
+        
+        with patch('database.time.sleep') as mock_sleep:
+            DatabaseManager._begin_immediate(conn)
+        
+        assert conn.execute.call_count == 3
+        assert mock_sleep.call_count == 2
+        
+        conn.execute.side_effect = sqlite3.OperationalError("disk I/O error")
+        with pytest.raises(sqlite3.OperationalError):
+            DatabaseManager._begin_immediate(conn)
+    
+    def test_cleanup_old_data_in_batches(self, temp_database):
+        """Test cleanup deletes large backlogs across several small transactions."""
+        db = DatabaseManager(temp_database)
+        
+        old = int(time.time()) - 10 * 24 * 60 * 60
+        db.add_many_system_stats([{"timestamp": old, "cpu_usage": float(i)} for i in range(7)])
+        db.add_system_stats({"cpu_usage": 99.0})
+        
+        with patch('database.CLEANUP_BATCH_SIZE', 3):
+            cleanup_stats = db.cleanup_old_data(days=1)
+        
+        assert cleanup_stats["system_stats"] == 7
+        assert [s["cpu_usage"] for s in db.get_recent_stats(hours=24 * 30)] == [99.0]
+    
     def test_vacuum_database(self, temp_database):
         """Test database vacuum operation."""
         db = DatabaseManager(temp_database)
@@ -229,6 +863,41 @@ class TestDatabaseManager:
         # Database should still be accessible
         queue = db.get_scrobble_queue()
         assert len(queue) == 0
+    
+    def test_backup_database(self, temp_database, tmp_path):
+        """Test synchronous database backup."""
+        db = DatabaseManager(temp_database)
+        entry = ScrobbleEntry("Artist", "Song", "Album", duration=180, timestamp=int(time.time()))
+        db.add_to_history(entry, "audd", 0.85)
+        
+        backup_path = db.backup_database(str(tmp_path / "backup.db"))
+        
+        backup = DatabaseManager(backup_path)
+        assert len(backup.get_recent_scrobbles()) == 1
+        backup.close()
+    
+    def test_backup_database_async(self, temp_database, tmp_path):
+        """Test background database backup resolves to the backup path."""
+        db = DatabaseManager(temp_database)
+        db.add_many_to_scrobble_queue([(ScrobbleEntry(f"Artist{i}", "Song"), None) for i in range(50)])
+        
+        with patch('database.BACKUP_PAGES_PER_STEP', 1):
+            future = db.backup_database_async(str(tmp_path / "async.db"))
+            backup_path = future.result(timeout=10)
+        
+        assert backup_path == str(tmp_path / "async.db")
+        backup = DatabaseManager(backup_path)
+        assert backup.get_queue_size() == 50
+        backup.close()
+    
+    def test_backup_database_async_error(self, temp_database, tmp_path):
+        """Test background backup failures surface through the future."""
+        db = DatabaseManager(temp_database)
+        
+        future = db.backup_database_async(str(tmp_path / "missing_dir" / "backup.db"))
+        
+        with pytest.raises(sqlite3.OperationalError):
+            future.result(timeout=10)
 
 
 class TestScrobbleEntry:
@@ -3,15 +3,18 @@ Unit tests for duplicate detector module.
 """
 
 import pytest
+import difflib
 import tempfile
 import os
 import sys
 from pathlib import Path
 from datetime import datetime
+from unittest.mock import patch
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+import duplicate_detector
 from database import DatabaseManager
 from duplicate_detector import DuplicateDetector, DuplicateCheck
 from music_recognizer import RecognitionResult
@@ -70,6 +73,10 @@ class TestRecognitionResult:
         fingerprint = detector._create_fingerprint(result)
         assert fingerprint is not None
         assert len(fingerprint) > 0
+        
+        # 64-bit digest as 16 hex characters, stored as an 8-byte blob
+        assert len(fingerprint) == 16
+        int(fingerprint, 16)
     
     def test_recognition_result_fingerprint_case_insensitive(self):
         """Test fingerprint generation is case insensitive."""
@@ -236,6 +243,13 @@ class TestDuplicateDetector:
         )
         check = self.detector.is_duplicate(result)
         assert check.is_duplicate is False
+        assert self.detector.add_track(result) is False
+        assert self.db.find_duplicate(self.detector._create_fingerprint(result)) is None
+        
+        # Re-enabling restores the real methods
+        self.detector.enabled = True
+        assert self.detector.add_track(result) is True
+        assert self.detector.is_duplicate(result).is_duplicate is True
 
     def test_failed_recognition_result(self):
         result = RecognitionResult(
@@ -272,6 +286,231 @@ class TestDuplicateDetector:
         assert isinstance(similarity, float)
         assert 0.0 <= similarity <= 1.0
 
+    def test_normalize_string(self):
+        """Test normalization lowercases, expands ampersands and collapses whitespace."""
+        assert self.detector._normalize_string("  Simon  &\tGarfunkel!  ") == "simon and garfunkel"
+        assert self.detector._normalize_string("A \n\r  B") == "a b"
+        assert self.detector._normalize_string("(Rock + Roll.)") == "rock and roll"
+        assert self.detector._normalize_string(None) == ""
+        assert duplicate_detector._normalize(None) == ""
+        
+        duplicate_detector._normalize.cache_clear()
+        self.detector._normalize_string("Test Artist")
+        self.detector._normalize_string("Test Artist")
+        assert duplicate_detector._normalize.cache_info().hits == 1
+    
+    def test_normalize_string_keeps_other_whitespace(self):
+        """Test only spaces, tabs and newlines are collapsed, so existing fingerprints stay stable."""
+        assert self.detector._normalize_string("a\x0b b\x0b") == "a\x0b b\x0b"
+        assert self.detector._normalize_string("Sigur\xa0R\xf3s") == "sigur\xa0r\xf3s"
+        assert self.detector._normalize_string("\x0c\tA  B\n") == "\x0c a b"
+
+    @pytest.mark.parametrize("rapidfuzz_available", [True, False])
+    def test_similarity_score_cutoff(self, rapidfuzz_available):
+        """Test titles that cannot reach the threshold are cut off early."""
+        if rapidfuzz_available and not duplicate_detector.RAPIDFUZZ_AVAILABLE:
+            pytest.skip("rapidfuzz not installed")
+        
+        with patch('duplicate_detector.RAPIDFUZZ_AVAILABLE', rapidfuzz_available):
+            assert duplicate_detector._ratio("abcd", "abcd") == 1.0
+            assert duplicate_detector._ratio("abcd", "wxyz", score_cutoff=0.5) == 0.0
+            
+            identical = self.detector._calculate_similarity("Artist", "Song", "artist", "song")
+            unrelated = self.detector._calculate_similarity("Artist", "Song", "Artist", "Different Tune")
+        
+        assert identical == pytest.approx(1.0)
+        assert unrelated == pytest.approx(0.3)
+
+    def test_length_bound_prefilter(self):
+        """Test candidates whose lengths rule them out are skipped without difflib."""
+        assert duplicate_detector._length_bound("", "") == 1.0
+        assert duplicate_detector._length_bound("abcd", "ab") == pytest.approx(2 / 3)
+        
+        candidates = [
+            {'artist_norm': 'test artist', 'title_norm': 'test song'},
+            {'artist_norm': 'test artist', 'title_norm': 'test song extended live version'}
+        ]
+        with patch('duplicate_detector.RAPIDFUZZ_AVAILABLE', False), \
+             patch('difflib.SequenceMatcher', wraps=difflib.SequenceMatcher) as matcher:
+            scores = self.detector._score_candidates("Test Artist", "Test Song", candidates)
+        
+        assert scores == [1.0, 0.0]
+        matcher.assert_not_called()
+        
+        with patch('duplicate_detector.RAPIDFUZZ_AVAILABLE', False), \
+             patch('difflib.SequenceMatcher', wraps=difflib.SequenceMatcher) as matcher:
+            similarity = self.detector._calculate_similarity("Test Artist", "Test Song", "Test Artist", "Test Sung")
+        
+        # Only the differing title needs a matcher
+        assert similarity < 1.0
+        assert matcher.call_count == 1
+
+    def test_scoring_workers_only_for_large_windows(self):
+        """Test scoring threads are used only once the window is large enough."""
+        if not duplicate_detector.RAPIDFUZZ_AVAILABLE:
+            pytest.skip("rapidfuzz not installed")
+        
+        self.detector.scoring_workers = 4
+        small = [{'artist_norm': 'test artist', 'title_norm': 'test song'}]
+        large = small * duplicate_detector.PARALLEL_MIN_CANDIDATES
+        
+        with patch('duplicate_detector.process.cdist', wraps=duplicate_detector.process.cdist) as cdist:
+            assert self.detector._score_candidates("Test Artist", "Test Song", small) == [1.0]
+            assert {call.kwargs['workers'] for call in cdist.call_args_list} == {1}
+            
+            cdist.reset_mock()
+            scores = self.detector._score_candidates("Test Artist", "Test Song", large)
+            assert scores == [1.0] * len(large)
+            assert {call.kwargs['workers'] for call in cdist.call_args_list} == {4}
+
+    def test_trigram_filter_is_safe(self):
+        """Test the trigram filter never rejects a pair that reaches the ratio."""
+        import random
+        rng = random.Random(0)
+        
+        for _ in range(500):
+            a = ''.join(rng.choice('abc ') for _ in range(rng.randint(0, 30)))
+            b = list(a)
+            for _ in range(rng.randint(0, 4)):
+                if b and rng.random() < 0.5:
+                    del b[rng.randrange(len(b))]
+                else:
+                    b.insert(rng.randint(0, len(b)), rng.choice('abcd '))
+            b = ''.join(b)
+            ratio = difflib.SequenceMatcher(None, a, b).ratio()
+            for min_ratio in (0.5, 0.8, 0.857):
+                if ratio >= min_ratio:
+                    assert duplicate_detector._shares_enough_trigrams(
+                        a, b, duplicate_detector._trigrams(a), duplicate_detector._trigrams(b), min_ratio)
+        
+        a, b = "a long song title here", "completely other words"
+        assert not duplicate_detector._shares_enough_trigrams(
+            a, b, duplicate_detector._trigrams(a), duplicate_detector._trigrams(b), 0.857)
+
+    @pytest.mark.parametrize("rapidfuzz_available", [True, False])
+    def test_similar_track_best_match(self, rapidfuzz_available):
+        """Test fuzzy matching picks the closest scrobble inside the time window."""
+        if rapidfuzz_available and not duplicate_detector.RAPIDFUZZ_AVAILABLE:
+            pytest.skip("rapidfuzz not installed")
+        
+        from database import ScrobbleEntry
+        now = int(datetime.now().timestamp())
+        for title in ["Other Song", "Test Songs", "Test Song!"]:
+            self.db.add_to_history(ScrobbleEntry("Test Artist", title, timestamp=now), "audd", 0.9)
+        
+        result = RecognitionResult(
+            success=True,
+            confidence=0.85,
+            artist="Test Artist",
+            title="Test Song",
+            provider="audd"
+        )
+        with patch('duplicate_detector.RAPIDFUZZ_AVAILABLE', rapidfuzz_available):
+            check = self.detector._check_similar_tracks(result, "fp")
+            
+            assert check.is_duplicate is True
+            assert check.confidence == pytest.approx(1.0)
+            assert check.similar_track == {'artist': 'Test Artist', 'title': 'Test Song!'}
+            
+            self.detector.time_window = -60
+            assert self.detector._check_similar_tracks(result, "fp").is_duplicate is False
+
+    def test_recent_window_fed_by_add_track_and_new_history(self):
+        """Test the fuzzy-match window sees added tracks and only reads unseen history."""
+        from database import ScrobbleEntry
+        now = int(datetime.now().timestamp())
+        self.db.add_to_history(ScrobbleEntry("History Artist", "Old Song", timestamp=now), "audd", 0.9)
+        with self.db._get_connection() as conn:
+            conn.execute("UPDATE scrobble_history SET scrobbled_at = ?", (now - 30,))
+        
+        track = RecognitionResult(success=True, confidence=0.9, artist="Queued Artist",
+                                  title="Queued Song", provider="audd")
+        self.detector.add_track(track)
+        
+        recent = self.detector._get_recent_tracks(now - 60)
+        assert [t['artist'] for t in recent] == ["Queued Artist", "History Artist"]
+        assert recent[0]['title_norm'] == "queued song"
+        
+        remix = RecognitionResult(success=True, confidence=0.9, artist="Queued Artist",
+                                  title="Queued Song!", provider="audd")
+        with patch.object(self.db, 'get_recent_scrobbles_since', wraps=self.db.get_recent_scrobbles_since) as spy:
+            check = self.detector._check_similar_tracks(remix, "fp")
+            assert spy.call_args.kwargs['after_id'] == 1
+        assert check.is_duplicate is True
+        assert check.similar_track == {'artist': 'Queued Artist', 'title': 'Queued Song'}
+        
+        assert self.detector._get_recent_tracks(now + 60) == []
+
+    def test_recent_window_seeded_from_duplicate_cache(self):
+        """Test a new detector picks up tracks added before it started, with stored normal forms."""
+        track = RecognitionResult(success=True, confidence=0.9, artist="Simon & Garfunkel",
+                                  title="The Boxer", provider="audd")
+        self.detector.add_track(track)
+        
+        fingerprint = self.detector._create_fingerprint(track)
+        stored = self.db.find_duplicate(fingerprint)
+        assert (stored.artist_norm, stored.title_norm) == ("simon and garfunkel", "the boxer")
+        
+        restarted = DuplicateDetector(self.db)
+        recent = restarted._get_recent_tracks(int(datetime.now().timestamp()) - 60)
+        assert [(t['artist_norm'], t['title_norm']) for t in recent] == [("simon and garfunkel", "the boxer")]
+
+    def test_local_fingerprint_cache(self):
+        """Test repeat tracks are answered from the local LRU without a database lookup."""
+        result = RecognitionResult(
+            success=True,
+            confidence=0.85,
+            artist="Test Artist",
+            title="Test Song",
+            provider="audd"
+        )
+        assert self.detector.add_track(result) is True
+        
+        with patch.object(self.db, 'find_duplicate') as mock_find:
+            check = self.detector.is_duplicate(result)
+            mock_find.assert_not_called()
+        assert check.is_duplicate is True
+        assert check.similar_track == {'artist': 'Test Artist', 'title': 'Test Song'}
+        
+        # Entries older than the time window are dropped on lookup
+        fingerprint = self.detector._create_fingerprint(result)
+        self.detector._fp_cache[fingerprint].timestamp -= self.detector.time_window
+        assert self.detector._get_cached_fingerprint(fingerprint) is None
+        assert fingerprint not in self.detector._fp_cache
+    
+    def test_add_track_reuses_check_fingerprint(self):
+        """Test add_track skips fingerprinting when given the fingerprint from is_duplicate."""
+        result = RecognitionResult(
+            success=True,
+            confidence=0.85,
+            artist="Test Artist",
+            title="Test Song",
+            provider="audd"
+        )
+        check = self.detector.is_duplicate(result)
+        
+        with patch.object(self.detector, '_create_fingerprint') as mock_fingerprint:
+            assert self.detector.add_track(result, check.fingerprint) is True
+            mock_fingerprint.assert_not_called()
+        
+        assert self.db.find_duplicate(check.fingerprint) is not None
+    
+    def test_local_fingerprint_cache_eviction(self):
+        """Test the local cache evicts the least recently used fingerprint."""
+        from database import DuplicateEntry
+        self.detector.cache_size = 2
+        now = int(datetime.now().timestamp())
+        for fingerprint in ["a", "b"]:
+            self.detector._cache_fingerprint(DuplicateEntry(fingerprint, "Artist", "Song", now, 0.9))
+        
+        assert self.detector._get_cached_fingerprint("a") is not None
+        self.detector._cache_fingerprint(DuplicateEntry("c", "Artist", "Song", now, 0.9))
+        
+        assert list(self.detector._fp_cache) == ["a", "c"]
+        
+        self.detector.clear_cache()
+        assert not self.detector._fp_cache
+
     def test_get_cache_stats(self):
         """Test getting cache statistics."""
         stats = self.detector.get_cache_stats()
@@ -306,6 +545,9 @@ class TestDuplicateDetector:
         # Clear cache
         cleared_count = self.detector.clear_cache()
         assert isinstance(cleared_count, int)
+        assert cleared_count == 1
+        assert self.db.find_duplicate(fingerprint) is None
+        assert self.db.get_database_stats()['duplicate_cache_count'] == 0
 
     def test_test_duplicate_detection(self):
         """Test the test_duplicate_detection method."""
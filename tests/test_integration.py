@@ -24,19 +24,9 @@ from music_recognizer import MusicRecognizer, RecognitionResult
 class TestSystemIntegration:
     """Test integration between different system components."""
     
-    def test_config_to_database_integration(self, temp_config_dir, sample_config, sample_secrets):
+    def test_config_to_database_integration(self, populated_config_dir):
         """Test integration between config manager and database."""
-        # Setup config
-        config_file = temp_config_dir / "config.json"
-        with open(config_file, 'w') as f:
-            json.dump(sample_config, f)
-        
-        secrets_file = temp_config_dir / "secrets.env"
-        with open(secrets_file, 'w') as f:
-            for key, value in sample_secrets.items():
-                f.write(f"{key}={value}\n")
-        
-        config = ConfigManager(str(temp_config_dir))
+        config = ConfigManager(str(populated_config_dir))
         
         with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
             db_path = f.name
@@ -108,19 +98,9 @@ class TestSystemIntegration:
         assert recognizer is not None
         assert len(recognizer.providers) > 0
 
-    def test_full_workflow_integration(self, temp_config_dir, sample_config, sample_secrets):
+    def test_full_workflow_integration(self, populated_config_dir):
         """Test complete workflow integration."""
-        # Setup
-        config_file = temp_config_dir / "config.json"
-        with open(config_file, 'w') as f:
-            json.dump(sample_config, f)
-        
-        secrets_file = temp_config_dir / "secrets.env"
-        with open(secrets_file, 'w') as f:
-            for key, value in sample_secrets.items():
-                f.write(f"{key}={value}\n")
-        
-        config = ConfigManager(str(temp_config_dir))
+        config = ConfigManager(str(populated_config_dir))
         
         with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
             db_path = f.name
@@ -191,19 +171,10 @@ class TestSystemIntegration:
         # Should not be added to database
         # (This would normally be handled by the main application)
     
-    def test_configuration_persistence_integration(self, temp_config_dir, sample_config, sample_secrets):
+    def test_configuration_persistence_integration(self, populated_config_dir, sample_config):
         """Test configuration persistence across components."""
-        # Create initial config
-        config_file = temp_config_dir / "config.json"
-        with open(config_file, 'w') as f:
-            json.dump(sample_config, f)
-        
-        secrets_file = temp_config_dir / "secrets.env"
-        with open(secrets_file, 'w') as f:
-            for key, value in sample_secrets.items():
-                f.write(f"{key}={value}\n")
-        
-        config1 = ConfigManager(str(temp_config_dir))
+        config_file = populated_config_dir / "config.json"
+        config1 = ConfigManager(str(populated_config_dir))
         
         # Create components with config
         with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
@@ -219,7 +190,7 @@ class TestSystemIntegration:
                 json.dump(sample_config, f)
             
             # Create new config instance
-            config2 = ConfigManager(str(temp_config_dir))
+            config2 = ConfigManager(str(populated_config_dir))
             db2 = DatabaseManager(db_path)  # Same path for testing
             detector2 = DuplicateDetector(db2)
             
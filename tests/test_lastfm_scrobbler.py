@@ -6,7 +6,7 @@ import time
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime, timedelta
 
-from src.lastfm_scrobbler import LastFMScrobbler, ScrobbleResult
+from src.lastfm_scrobbler import LastFMScrobbler, ScrobbleResult, _TTLCache
 from src.database import ScrobbleEntry
 from src.music_recognizer import RecognitionResult
 
@@ -69,22 +69,21 @@ class TestLastFMScrobbler:
         mock_database.add_to_scrobble_queue.assert_called_once()
         
         # Test getting queue entries
-        mock_database.get_scrobble_queue.return_value = []
+        mock_database.get_scrobble_queue_dicts.return_value = []
         queue_entries = scrobbler.get_queue_entries()
         
         assert isinstance(queue_entries, list)
-        mock_database.get_scrobble_queue.assert_called_once()
+        mock_database.get_scrobble_queue_dicts.assert_called_once_with(50)
     
     def test_clear_queue(self, scrobbler, mock_database):
         """Test clearing the scrobble queue."""
-        mock_database.get_scrobble_queue.return_value = [Mock(), Mock()]  # 2 entries
-        mock_database.remove_from_scrobble_queue.return_value = True
+        mock_database.clear_scrobble_queue.return_value = 2
         
         count = scrobbler.clear_queue()
         
         assert count == 2
-        mock_database.get_scrobble_queue.assert_called_once_with(limit=1000)
-        assert mock_database.remove_from_scrobble_queue.call_count == 2
+        mock_database.clear_scrobble_queue.assert_called_once_with()
+        mock_database.remove_from_scrobble_queue.assert_not_called()
     
     def test_get_status(self, scrobbler, mock_database):
         """Test getting scrobbler status."""
@@ -134,6 +133,21 @@ class TestLastFMScrobbler:
         assert isinstance(result, ScrobbleResult)
         assert result.success is False  # Should fail since Last.fm is not authenticated in test
     
+    def test_attempt_scrobble_single_request(self, scrobbler):
+        """Test a direct scrobble makes only the scrobble call."""
+        scrobbler.network = Mock()
+        entry = ScrobbleEntry("Test Artist", "Test Track", album="Test Album", timestamp=100, id=7)
+        
+        result = scrobbler._attempt_scrobble(entry)
+        
+        assert result.success is True
+        assert result.entry_id == 7
+        scrobbler.network.scrobble.assert_called_once_with(
+            artist="Test Artist", title="Test Track", timestamp=100, album="Test Album",
+            duration=None, track_number=None, mbid=None
+        )
+        scrobbler.network.get_track.assert_not_called()
+    
     def test_test_connection(self, scrobbler):
         """Test connection testing."""
         result = scrobbler.test_connection()
@@ -145,6 +159,27 @@ class TestLastFMScrobbler:
         """Test cleanup method."""
         scrobbler.cleanup()  # Should not raise exception
     
+    def test_keepalive_transport_survives_requests(self, scrobbler):
+        """Test pylast requests share one transport that is only closed on cleanup."""
+        import pylast
+        from src.lastfm_scrobbler import KEEPALIVE_AVAILABLE
+        if not KEEPALIVE_AVAILABLE:
+            pytest.skip("pylast does not use httpx")
+        
+        scrobbler.network = pylast.LastFMNetwork(api_key="key", api_secret="secret")
+        scrobbler._enable_keepalive()
+        transport = scrobbler._transport
+        assert scrobbler.network.proxy == {'https://': transport}
+        
+        transport._pool = MagicMock()
+        with pylast.httpx.Client(mounts=scrobbler.network.proxy):
+            pass
+        transport._pool.__exit__.assert_not_called()
+        
+        scrobbler.cleanup()
+        transport._pool.close.assert_called_once()
+        assert scrobbler._transport is None
+    
     def test_scrobble_entry_creation(self):
         """Test ScrobbleEntry creation."""
         timestamp = int(time.time())
@@ -269,12 +304,48 @@ class TestLastFMScrobbler:
     
     def test_clear_queue_with_database_error(self, scrobbler, mock_database):
         """Test clearing queue with database error."""
-        mock_database.get_scrobble_queue.side_effect = Exception("Database error")
+        mock_database.clear_scrobble_queue.side_effect = Exception("Database error")
         
         # Should raise exception when database fails
         with pytest.raises(Exception, match="Database error"):
             scrobbler.clear_queue()
     
+    def test_test_connection_caches_user_info(self, scrobbler):
+        """Test repeated connection tests reuse the fetched user details."""
+        scrobbler._authenticated = True
+        scrobbler.user = Mock()
+        scrobbler.user.get_name.return_value = "listener"
+        scrobbler.user.get_playcount.return_value = 42
+        
+        for _ in range(3):
+            result = scrobbler.test_connection()
+        
+        assert result['status'] == 'success'
+        assert (result['user'], result['playcount']) == ("listener", 42)
+        assert scrobbler.user.get_name.call_count == 1
+        assert scrobbler.user.get_playcount.call_count == 1
+    
+    def test_ttl_cache_expiry_and_eviction(self):
+        """Test TTL cache entries expire and the least recently used key is evicted."""
+        cache = _TTLCache(ttl=60, max_keys=2)
+        loader = Mock(side_effect=lambda: loader.call_count)
+        
+        with patch('src.lastfm_scrobbler.time.monotonic', return_value=1000.0):
+            assert cache.get_or_load('a', loader) == 1
+            assert cache.get_or_load('a', loader) == 1
+            cache.get_or_load('b', loader)
+            cache.get_or_load('a', loader)
+            cache.get_or_load('c', loader)  # evicts 'b'
+            assert loader.call_count == 3
+            assert cache.get_or_load('b', loader) == 4
+        
+        with patch('src.lastfm_scrobbler.time.monotonic', return_value=1061.0):
+            assert cache.get_or_load('b', loader) == 5
+        
+        with pytest.raises(ValueError):
+            cache.get_or_load('d', Mock(side_effect=ValueError))
+        assert cache.get_or_load('d', lambda: "loaded") == "loaded"
+    
     def test_test_connection_with_missing_credentials(self, scrobbler):
         """Test connection testing with missing credentials."""
         scrobbler.api_key = None
@@ -369,6 +440,35 @@ class TestLastFMScrobbler:
         assert result is False
         mock_database.add_to_scrobble_queue.assert_not_called()
     
+    def test_queue_size_cached_between_enqueues(self, scrobbler, mock_database):
+        """Test the queue length is read once and then tracked incrementally."""
+        scrobbler._authenticated = True
+        scrobbler._running = True
+        scrobbler.network = Mock()
+        scrobbler.max_queue_size = 3
+        mock_database.get_queue_size.return_value = 1
+        recognition = Mock(spec=RecognitionResult, success=True, artist="Artist", title="Track",
+                           album=None, duration=None, metadata=None)
+        
+        assert scrobbler.queue_scrobble(recognition) is True
+        assert scrobbler.queue_scrobble(recognition) is True
+        assert scrobbler.queue_scrobble(recognition) is False
+        assert mock_database.get_queue_size.call_count == 1
+        
+        # Each queue pass rereads the length, then scrobbled entries free up room
+        mock_database.get_queue_size.return_value = 3
+        mock_database.get_scrobble_queue.return_value = [ScrobbleEntry("Artist", "Track", timestamp=1, id=1)]
+        mock_database.finish_scrobble_batch.return_value = 1
+        scrobbler._process_scrobble_queue()
+        assert mock_database.get_queue_size.call_count == 2
+        assert scrobbler.queue_scrobble(recognition) is True
+        assert mock_database.get_queue_size.call_count == 2
+        
+        # A failure recording results drops the cached length
+        mock_database.finish_scrobble_batch.side_effect = Exception("Database error")
+        scrobbler._process_scrobble_queue()
+        assert scrobbler._queue_size is None
+    
     def test_lastfm_scrobbler_retry_logic(self, scrobbler, mock_database):
         """Test LastFMScrobbler retry logic."""
         # Mock failed scrobble with retry count
@@ -427,6 +527,119 @@ class TestLastFMScrobbler:
             assert scrobbler.retry_interval == -10  # Uses config value
             assert scrobbler.max_retries == 0  # Uses config value
     
+    def test_process_queue_scrobbles_in_one_batch(self, scrobbler, mock_database):
+        """Test queued entries are submitted in a single scrobble_many call."""
+        scrobbler._authenticated = True
+        scrobbler._running = True
+        scrobbler.network = Mock()
+        entries = [
+            ScrobbleEntry("Artist 1", "Track 1", timestamp=100, id=1),
+            ScrobbleEntry("Artist 2", "Track 2", album="Album", timestamp=200, id=2),
+            ScrobbleEntry("Artist 3", "Short", duration=5, timestamp=300, id=3)
+        ]
+        mock_database.get_scrobble_queue.return_value = entries
+        mock_database.get_queue_size.return_value = 3
+        mock_database.finish_scrobble_batch.return_value = 3
+        
+        scrobbler._process_scrobble_queue()
+        
+        scrobbler.network.scrobble_many.assert_called_once()
+        tracks = scrobbler.network.scrobble_many.call_args[0][0]
+        assert [(t['artist'], t['title'], t['timestamp']) for t in tracks] == [
+            ("Artist 1", "Track 1", 100), ("Artist 2", "Track 2", 200)
+        ]
+        scrobbler.network.scrobble.assert_not_called()
+        
+        # The too-short track is dropped without being sent; results are written in one call
+        mock_database.finish_scrobble_batch.assert_called_once_with(entries[:2], [], [3])
+        mock_database.remove_from_scrobble_queue.assert_not_called()
+        mock_database.add_to_history.assert_not_called()
+        assert scrobbler.stats['scrobbles_successful'] == 2
+        assert scrobbler._queue_size == 0
+    
+    def test_process_queue_skips_empty_queue(self, scrobbler, mock_database):
+        """Test an empty queue is detected from the queue size without loading rows."""
+        scrobbler._authenticated = True
+        scrobbler._running = True
+        scrobbler.network = Mock()
+        mock_database.get_queue_size.return_value = 0
+        
+        scrobbler._process_scrobble_queue()
+        
+        mock_database.get_scrobble_queue.assert_not_called()
+        
+        # A track queued elsewhere is picked up on the next pass despite the cached 0
+        assert scrobbler._queue_size == 0
+        mock_database.get_queue_size.return_value = 1
+        mock_database.get_scrobble_queue.return_value = []
+        scrobbler._process_scrobble_queue()
+        mock_database.get_scrobble_queue.assert_called_once_with(limit=50)
+        assert scrobbler._queue_size == 1
+    
+    def test_batch_entries_without_timestamp_share_one(self, scrobbler):
+        """Test entries missing a timestamp in one batch get the same fallback time."""
+        scrobbler.network = Mock()
+        entries = [ScrobbleEntry(f"Artist {i}", "Track", id=i) for i in range(3)]
+        
+        with patch('src.lastfm_scrobbler.time.time', return_value=1234.5) as mock_time:
+            results = scrobbler._scrobble_batch(entries)
+        
+        assert all(result.success for result in results)
+        tracks = scrobbler.network.scrobble_many.call_args[0][0]
+        assert [t['timestamp'] for t in tracks] == [1234, 1234, 1234]
+        mock_time.assert_called_once()
+    
+    def test_process_queue_batch_failure(self, scrobbler, mock_database):
+        """Test a failed batch request applies its retry decision to every entry."""
+        import pylast
+        scrobbler._authenticated = True
+        scrobbler._running = True
+        scrobbler.network = Mock()
+        entries = [ScrobbleEntry(f"Artist {i}", "Track", timestamp=100, id=i) for i in range(3)]
+        mock_database.get_scrobble_queue.return_value = entries
+        mock_database.finish_scrobble_batch.return_value = 0
+        
+        scrobbler.network.scrobble_many.side_effect = pylast.NetworkError(None, "timeout")
+        scrobbler._process_scrobble_queue()
+        
+        mock_database.finish_scrobble_batch.assert_called_once_with([], [0, 1, 2], [])
+        assert scrobbler.stats['network_errors'] == 1
+        
+        error = pylast.WSError(None, "9", "Invalid session key")
+        error.error_code = 9
+        scrobbler.network.scrobble_many.side_effect = error
+        scrobbler.network.scrobble.side_effect = error
+        scrobbler._process_scrobble_queue()
+        
+        mock_database.finish_scrobble_batch.assert_called_with([], [], [0, 1, 2])
+    
+    def test_process_queue_batch_with_one_bad_entry(self, scrobbler, mock_database):
+        """Test a batch rejected over one entry only drops that entry."""
+        import pylast
+        scrobbler._authenticated = True
+        scrobbler._running = True
+        scrobbler.network = Mock()
+        entries = [ScrobbleEntry(f"Artist {i}", "Track", timestamp=100, id=i) for i in range(3)]
+        mock_database.get_scrobble_queue.return_value = entries
+        mock_database.get_queue_size.return_value = 3
+        mock_database.finish_scrobble_batch.return_value = 3
+        
+        error = pylast.WSError(None, "6", "Invalid parameters")
+        error.error_code = 6
+        scrobbler.network.scrobble_many.side_effect = error
+        
+        def scrobble(**track):
+            if track['artist'] == "Artist 1":
+                raise error
+        
+        scrobbler.network.scrobble.side_effect = scrobble
+        
+        scrobbler._process_scrobble_queue()
+        
+        assert scrobbler.network.scrobble.call_count == 3
+        mock_database.finish_scrobble_batch.assert_called_once_with([entries[0], entries[2]], [], [1])
+        assert scrobbler.stats['scrobbles_successful'] == 2
+    
     def test_start_stop_scrobble_processor(self, scrobbler):
         """Test starting and stopping scrobble processor."""
         # Mock authentication
@@ -440,6 +653,69 @@ class TestLastFMScrobbler:
         scrobbler.stop_scrobble_processor()
         assert scrobbler._running is False
     
+    def test_queue_scrobble_wakes_processor(self, scrobbler, mock_database):
+        """Test queueing a track and stopping both interrupt the retry wait."""
+        import threading
+        scrobbler._authenticated = True
+        scrobbler.network = Mock()
+        drained = threading.Semaphore(0)
+        
+        with patch.object(scrobbler, '_process_scrobble_queue', side_effect=drained.release) as process:
+            scrobbler.start_scrobble_processor()
+            assert drained.acquire(timeout=5)
+            
+            mock_database.get_queue_size.return_value = 0
+            recognition = Mock(spec=RecognitionResult, success=True, artist="Artist", title="Track",
+                               album=None, duration=None, metadata=None)
+            assert scrobbler.queue_scrobble(recognition) is True
+            assert drained.acquire(timeout=5)
+            
+            start = time.monotonic()
+            scrobbler.stop_scrobble_processor()
+            assert time.monotonic() - start < 5
+            assert not scrobbler._scrobble_thread.is_alive()
+            assert process.call_count == 2
+    
+    def test_wake_during_drain_is_not_lost(self, scrobbler):
+        """Test a track queued while the queue is draining starts another drain right away."""
+        import threading
+        scrobbler._authenticated = True
+        scrobbler.network = Mock()
+        scrobbler.retry_interval = 60
+        drained = threading.Semaphore(0)
+        
+        def drain():
+            if process.call_count == 1:
+                # A queue_scrobble lands during the first drain
+                scrobbler._wake.set()
+            drained.release()
+        
+        with patch.object(scrobbler, '_process_scrobble_queue', side_effect=drain) as process:
+            scrobbler.start_scrobble_processor()
+            assert drained.acquire(timeout=5)
+            # Without the wake this would wait out the 60s retry interval
+            assert drained.acquire(timeout=5)
+            scrobbler.stop_scrobble_processor()
+    
+    def test_on_change_called_after_queue_changes(self, scrobbler, mock_database):
+        """Test the change callback fires on enqueue and after a drain."""
+        scrobbler.on_change = Mock()
+        mock_database.get_queue_size.return_value = 0
+        recognition = Mock(spec=RecognitionResult, success=True, artist="Artist", title="Track",
+                           album=None, duration=None, metadata=None)
+        
+        scrobbler.queue_scrobble(recognition)
+        assert scrobbler.on_change.call_count == 1
+        
+        scrobbler._authenticated = True
+        scrobbler._running = True
+        scrobbler.network = Mock()
+        mock_database.get_queue_size.return_value = 1
+        mock_database.get_scrobble_queue.return_value = [ScrobbleEntry("Artist", "Track", timestamp=1, id=1)]
+        mock_database.finish_scrobble_batch.return_value = 1
+        scrobbler._process_scrobble_queue()
+        assert scrobbler.on_change.call_count == 2
+    
     def test_start_scrobble_processor_when_not_available(self, scrobbler):
         """Test starting scrobble processor when not available."""
         scrobbler.enabled = False
@@ -0,0 +1,106 @@
+"""
+Unit tests for the main vinyl recognition system.
+"""
+
+import pytest
+import asyncio
+import logging
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+# Add repository root to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# The module logs to logs/ at import time, which may not exist in a checkout
+with patch('logging.FileHandler', return_value=logging.NullHandler()):
+    import vinyl_recognizer
+
+from vinyl_recognizer import VinylRecognitionSystem
+
+
+class TestVinylRecognitionSystem:
+    """Test cases for recognition dispatch in VinylRecognitionSystem."""
+    
+    @pytest.fixture
+    def system(self):
+        """Create a recognition system with every component mocked."""
+        with patch.object(vinyl_recognizer, 'initialize_config'), \
+             patch.object(vinyl_recognizer, 'DatabaseManager'), \
+             patch.object(vinyl_recognizer, 'DuplicateDetector'), \
+             patch.object(vinyl_recognizer, 'LastFMScrobbler'), \
+             patch.object(vinyl_recognizer, 'MusicRecognizer'), \
+             patch.object(vinyl_recognizer, 'AudioProcessor'):
+            system = VinylRecognitionSystem()
+        
+        system.music_recognizer.providers = [SimpleNamespace(timeout=30)]
+        system.music_recognizer.rate_limit_delay = 1.0
+        system.running = True
+        yield system
+        system.running = False
+        system._stop_event_loop()
+    
+    def test_stop_cancels_recognition_in_flight(self, system):
+        """Test stopping the loop releases a thread waiting on a recognition."""
+        started = threading.Event()
+        
+        async def recognize_forever(audio_file):
+            started.set()
+            await asyncio.Event().wait()
+        
+        system.music_recognizer.recognize_track = recognize_forever
+        
+        worker = threading.Thread(target=system.on_track_detected, args=('/tmp/track.wav',))
+        worker.start()
+        assert started.wait(timeout=5.0)
+        
+        system.running = False
+        system._stop_event_loop()
+        
+        worker.join(timeout=5.0)
+        assert not worker.is_alive()
+        assert system._loop is None
+        system.music_recognizer._cleanup_audio_file.assert_called_once_with('/tmp/track.wav')
+        system.lastfm_scrobbler.queue_scrobble.assert_not_called()
+        assert system.stats['errors'] == 0
+    
+    def test_track_after_stop_does_not_start_loop(self, system):
+        """Test a track detected while not running is dropped without a new loop."""
+        system.running = False
+        system.music_recognizer.recognize_track = Mock()
+        
+        system.on_track_detected('/tmp/track.wav')
+        
+        assert system._loop is None
+        assert system._loop_thread is None
+        system.music_recognizer.recognize_track.assert_not_called()
+        system.music_recognizer._cleanup_audio_file.assert_called_once_with('/tmp/track.wav')
+    
+    def test_recognition_timeout(self, system):
+        """Test a recognition outliving its timeout is cancelled and counted as an error."""
+        cancelled = threading.Event()
+        
+        async def recognize_forever(audio_file):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        
+        system.music_recognizer.recognize_track = recognize_forever
+        
+        with patch.object(system, '_recognition_timeout', return_value=0.1):
+            system.on_track_detected('/tmp/track.wav')
+        
+        assert cancelled.wait(timeout=5.0)
+        assert system.stats['errors'] == 1
+        system.music_recognizer._cleanup_audio_file.assert_called_once_with('/tmp/track.wav')
+        system.lastfm_scrobbler.queue_scrobble.assert_not_called()
+    
+    def test_recognition_timeout_covers_providers(self, system):
+        """Test the timeout allows every provider to time out in turn."""
+        system.music_recognizer.providers = [SimpleNamespace(timeout=30), SimpleNamespace(timeout=20)]
+        
+        assert system._recognition_timeout() == 50 + 1.0 + vinyl_recognizer.RECOGNITION_TIMEOUT_MARGIN
@@ -2,11 +2,14 @@ import pytest
 import json
 import tempfile
 import os
+import threading
+import time
+from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock, mock_open
 from flask import Flask
 from flask_socketio import SocketIO
 
-from src.web_interface import WebInterface, create_web_app
+from src.web_interface import WebInterface, create_web_app, _stable_status, STATUS_REFRESH_INTERVAL
 
 
 class TestFlaskApp:
@@ -60,6 +63,18 @@ class TestFlaskApp:
         response = client.get('/')
         assert response.status_code == 200
     
+    def test_page_rendered_once(self, client):
+        """Test dashboard pages are rendered on first request and then served from cache."""
+        with patch('src.web_interface.render_template', return_value='<html></html>') as mock_render:
+            first = client.get('/')
+            second = client.get('/')
+            client.get('/logs')
+        
+        assert first.data == second.data == b'<html></html>'
+        assert second.headers['Content-Type'] == 'text/html; charset=utf-8'
+        assert second.headers['Cache-Control'] == 'public, max-age=60'
+        assert [c.args[0] for c in mock_render.call_args_list] == ['index.html', 'logs.html']
+    
     def test_api_status_route(self, client):
         """Test API status route."""
         response = client.get('/api/status')
@@ -67,6 +82,28 @@ class TestFlaskApp:
         data = json.loads(response.data)
         assert 'running' in data
     
+    def test_api_status_falls_back_to_last_good(self, web_interface, client):
+        """Test a failing status read serves the last good status marked stale."""
+        web_interface.vinyl_system = Mock()
+        web_interface.vinyl_system.get_status.side_effect = RuntimeError("restarting")
+        
+        response = client.get('/api/status')
+        assert response.status_code == 500
+        assert 'error' in json.loads(response.data)
+        
+        web_interface.vinyl_system.get_status.side_effect = None
+        web_interface.vinyl_system.get_status.return_value = {'running': True}
+        assert json.loads(client.get('/api/status').data) == {'running': True}
+        
+        web_interface._invalidate_cache()
+        web_interface.vinyl_system.get_status.side_effect = RuntimeError("restarting")
+        response = client.get('/api/status')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['running'] is True
+        assert data['stale'] is True
+        assert data['stale_since'] == pytest.approx(time.time(), abs=5)
+    
     def test_api_get_config_route(self, client):
         """Test API get config route."""
         response = client.get('/api/config')
@@ -75,14 +112,35 @@ class TestFlaskApp:
         assert 'config' in data
         assert 'secrets' in data
     
-    def test_api_logs_route(self, client):
+    def test_api_logs_route(self, client, mock_config, tmp_path):
         """Test API logs route."""
-        # Mock the logs file reading
-        with patch('builtins.open', mock_open(read_data='test log content')):
-            response = client.get('/api/logs')
-            assert response.status_code == 200
-            data = json.loads(response.data)
-            assert 'logs' in data
+        log_file = tmp_path / "vinyl_recognizer.log"
+        log_file.write_text('test log content')
+        mock_config.return_value.get.return_value = str(log_file)
+        
+        response = client.get('/api/logs')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['logs'] == 'test log content'
+    
+    def test_api_logs_tail(self, client, mock_config, tmp_path):
+        """Test the log tail returns only the requested last lines."""
+        from src import web_interface as web_module
+        log_file = tmp_path / "vinyl_recognizer.log"
+        log_file.write_text(''.join(f"line {i}\n" for i in range(5000)))
+        mock_config.return_value.get.return_value = str(log_file)
+        
+        with patch.object(web_module, 'LOG_TAIL_CHUNK', 64):
+            data = json.loads(client.get('/api/logs?lines=3').data)
+        assert data['logs'] == "line 4997\nline 4998\nline 4999\n"
+        
+        assert web_module._tail(str(log_file), 10000).count("\n") == 5000
+        log_file.write_text("first\nsecond")
+        assert web_module._tail(str(log_file), 1) == "second"
+        assert web_module._tail(str(log_file), 0) == "first\nsecond"
+        
+        mock_config.return_value.get.return_value = str(tmp_path / "missing.log")
+        assert json.loads(client.get('/api/logs').data) == {'logs': 'Log file not found'}
     
     def test_logs_route(self, client):
         """Test logs page route."""
@@ -168,6 +226,48 @@ class TestFlaskApp:
         data = json.loads(response.data)
         assert 'error' in data
     
+    def test_api_responses_cached(self, client, mock_database):
+        """Test repeated API reads are served from the response cache."""
+        for _ in range(3):
+            response = client.get('/api/stats')
+            assert response.status_code == 200
+            assert json.loads(response.data)['scrobble_stats'] == {'total': 10}
+        mock_database.get_scrobble_stats.assert_called_once_with(days=30)
+        
+        # Different query arguments are cached separately
+        client.get('/api/recent-scrobbles?limit=10')
+        client.get('/api/recent-scrobbles?limit=10')
+        client.get('/api/recent-scrobbles?limit=5')
+        assert [c.args for c in mock_database.get_recent_scrobbles.call_args_list] == [(10,), (5,)]
+    
+    def test_api_response_cache_expiry_and_errors(self, web_interface, client, mock_database):
+        """Test errors are not cached and entries expire or are invalidated."""
+        mock_database.get_scrobble_stats.side_effect = Exception("Database error")
+        assert client.get('/api/stats').status_code == 500
+        mock_database.get_scrobble_stats.side_effect = None
+        assert client.get('/api/stats').status_code == 200
+        assert mock_database.get_scrobble_stats.call_count == 2
+        
+        with patch('src.web_interface.time.monotonic', return_value=time.monotonic() + 31):
+            client.get('/api/stats')
+        assert mock_database.get_scrobble_stats.call_count == 3
+        
+        web_interface._invalidate_cache()
+        client.get('/api/stats')
+        assert mock_database.get_scrobble_stats.call_count == 4
+    
+    @pytest.mark.parametrize("orjson_available", [True, False])
+    def test_json_dumps(self, orjson_available):
+        """Test JSON payloads are compact, key-sorted and tolerate non-JSON values."""
+        from src import web_interface as web_module
+        if orjson_available and not web_module.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+        
+        with patch('src.web_interface.ORJSON_AVAILABLE', orjson_available):
+            payload = web_module._json_dumps({'b': [1, 2.5, None], 'a': {'x': True}, 'c': object})
+        
+        assert payload.startswith(b'{"a":{"x":true},"b":[1,2.5,null],"c":"')
+    
     def test_api_update_config_route_success(self, client):
         """Test API update config route success."""
         config_data = {'audio': {'sample_rate': 48000}}
@@ -558,19 +658,44 @@ class TestFlaskApp:
         """Test starting update thread."""
         web_interface._running = False
         
-        with patch('threading.Thread') as mock_thread:
+        with patch.object(web_interface.socketio, 'start_background_task') as mock_task:
             web_interface.start_updates()
             assert web_interface._running is True
-            mock_thread.assert_called_once()
+            mock_task.assert_called_once_with(web_interface._update_loop)
+            assert web_interface._update_thread is mock_task.return_value
     
     def test_stop_updates(self, web_interface):
-        """Test stopping update thread."""
+        """Test stopping update thread waits for the update loop to exit."""
         web_interface._running = True
-        web_interface._update_thread = Mock()
+        web_interface._update_done.clear()
+        
+        with patch.object(web_interface._update_done, 'wait', return_value=True) as mock_wait:
+            web_interface.stop_updates()
         
-        web_interface.stop_updates()
         assert web_interface._running is False
-        web_interface._update_thread.join.assert_called_once()
+        assert web_interface._dirty.is_set()
+        mock_wait.assert_called_once_with(timeout=5.0)
+    
+    def test_stop_updates_with_eventlet_style_task(self, web_interface):
+        """Test stopping updates when the background task is shaped like engineio's EventletThread."""
+        class EventletThreadLike:
+            """Only join() with no timeout, and no is_alive()."""
+            
+            def __init__(self, target):
+                self._thread = threading.Thread(target=target)
+                self._thread.start()
+            
+            def join(self):
+                self._thread.join()
+        
+        web_interface.database.get_recent_scrobbles.return_value = []
+        
+        with patch.object(web_interface.socketio, 'start_background_task', side_effect=EventletThreadLike):
+            web_interface.start_updates()
+            web_interface.stop_updates()
+        
+        assert web_interface._update_done.is_set()
+        assert not web_interface._update_thread._thread.is_alive()
     
     def test_update_loop(self, web_interface):
         """Test update loop."""
@@ -578,13 +703,98 @@ class TestFlaskApp:
         web_interface.vinyl_system = Mock()
         web_interface.vinyl_system.get_status.return_value = {'running': True}
         
-        with patch('time.sleep') as mock_sleep:
+        with patch.object(web_interface._dirty, 'wait') as mock_wait:
             # Set running to False after first iteration
-            def stop_after_first(*args):
+            def stop_after_first(*args, **kwargs):
                 web_interface._running = False
             
-            mock_sleep.side_effect = stop_after_first
+            mock_wait.side_effect = stop_after_first
+            web_interface._update_loop()
+        
+        mock_wait.assert_called_once_with(timeout=web_interface.update_interval)
+    
+    def test_update_loop_skips_unchanged_payloads(self, web_interface, mock_database):
+        """Test the update loop only broadcasts data that changed since the last emit."""
+        web_interface.socketio = Mock()
+        web_interface.vinyl_system = Mock()
+        statuses = iter([{'running': True}, {'running': True}, {'running': False}])
+        web_interface.vinyl_system.get_status.side_effect = lambda: next(statuses)
+        
+        web_interface._running = True
+        iterations = []
+        def stop_after_three(*args, **kwargs):
+            iterations.append(1)
+            if len(iterations) == 3:
+                web_interface._running = False
+        
+        with patch.object(web_interface._dirty, 'wait', side_effect=stop_after_three):
             web_interface._update_loop()
+        
+        # Payloads are sent as pre-serialized JSON strings
+        emitted = [(event, json.loads(payload)) for event, payload in
+                   (c.args for c in web_interface.socketio.emit.call_args_list)]
+        assert emitted == [
+            ('status_update', {'running': True}),
+            ('recent_scrobbles', [{'track': 'Test Track'}]),
+            ('status_update', {'running': False})
+        ]
+    
+    def test_update_loop_ignores_uptime(self, web_interface, mock_database):
+        """Test two statuses differing only in uptime are broadcast once."""
+        web_interface.socketio = Mock()
+        web_interface.vinyl_system = Mock()
+        statuses = iter([{'running': True, 'uptime': 10.0}, {'running': True, 'uptime': 12.5}])
+        web_interface.vinyl_system.get_status.side_effect = lambda: next(statuses)
+        
+        web_interface._running = True
+        iterations = []
+        def stop_after_two(*args, **kwargs):
+            iterations.append(1)
+            if len(iterations) == 2:
+                web_interface._running = False
+        
+        with patch.object(web_interface._dirty, 'wait', side_effect=stop_after_two):
+            web_interface._update_loop()
+        
+        status_payloads = [json.loads(c.args[1]) for c in web_interface.socketio.emit.call_args_list
+                           if c.args[0] == 'status_update']
+        assert status_payloads == [{'running': True, 'uptime': 10.0}]
+    
+    def test_status_update_refresh_interval(self, web_interface):
+        """Test a status differing only in volatile fields is re-sent after the refresh interval."""
+        web_interface.socketio = Mock()
+        
+        with patch('src.web_interface.time.monotonic', return_value=1000.0) as mock_monotonic:
+            # A stale fallback only differs by when it was read
+            stale = {'running': True, 'uptime': 15.0, 'stats': {'errors': 0}, 'stale': True}
+            for stale_since in (900.0, 950.0):
+                status = dict(stale, stale_since=stale_since)
+                web_interface._emit_if_changed('status_update', status,
+                                               compare=_stable_status(status),
+                                               max_age=STATUS_REFRESH_INTERVAL)
+            assert web_interface.socketio.emit.call_count == 1
+            
+            mock_monotonic.return_value = 1000.0 + STATUS_REFRESH_INTERVAL
+            status = dict(stale, stale_since=990.0)
+            web_interface._emit_if_changed('status_update', status,
+                                           compare=_stable_status(status),
+                                           max_age=STATUS_REFRESH_INTERVAL)
+        
+        assert web_interface.socketio.emit.call_count == 2
+        assert json.loads(web_interface.socketio.emit.call_args.args[1])['stale_since'] == 990.0
+    
+    def test_mark_dirty_wakes_update_loop(self, web_interface, client, mock_database):
+        """Test state changes wake the update loop and drop cached responses."""
+        mock_vinyl_system = Mock()
+        with patch('src.web_interface.get_config', return_value=web_interface.config):
+            wired = WebInterface(vinyl_system=mock_vinyl_system)
+        mock_vinyl_system.set_change_callback.assert_called_once_with(wired.mark_dirty)
+        
+        client.get('/api/stats')
+        web_interface.mark_dirty()
+        assert web_interface._dirty.is_set()
+        client.get('/api/stats')
+        assert mock_database.get_scrobble_stats.call_count == 2
     
     def test_run_method(self, web_interface):
         """Test run method."""
@@ -616,8 +826,9 @@ class TestFlaskApp:
             assert isinstance(app, Flask)
             assert isinstance(socketio, SocketIO)
     
-    def test_web_interface_init_without_secret_key(self):
+    def test_web_interface_init_without_secret_key(self, tmp_path):
         """Test WebInterface initialization without secret key."""
+        key_file = tmp_path / "keys" / "flask_secret.key"
         with patch('src.web_interface.get_config') as mock_get_config:
             config_mock = Mock()
             config_mock.get_web_config.return_value = {
@@ -625,7 +836,8 @@ class TestFlaskApp:
                 'port': 5000,
                 'debug': False,
                 'update_interval': 5,
-                'enable_config_editing': True
+                'enable_config_editing': True,
+                'secret_key_file': str(key_file)
             }
             config_mock.get_secret.return_value = None  # No secret key
             mock_get_config.return_value = config_mock
@@ -634,6 +846,47 @@ class TestFlaskApp:
                 mock_token.return_value = 'generated_secret'
                 web_interface = WebInterface()
                 assert web_interface.app.config['SECRET_KEY'] == 'generated_secret'
+            
+            # The generated key is saved and reused after a restart
+            assert key_file.read_text() == 'generated_secret'
+            assert key_file.stat().st_mode & 0o777 == 0o600
+            with patch('secrets.token_hex') as mock_token:
+                assert WebInterface().app.config['SECRET_KEY'] == 'generated_secret'
+                mock_token.assert_not_called()
+    
+    def test_load_secret_key_regenerates_empty_file(self, tmp_path):
+        """Test an empty or whitespace-only key file is replaced with a new key."""
+        key_file = tmp_path / "flask_secret.key"
+        key_file.write_text("  \n")
+        
+        with patch('secrets.token_hex', return_value='generated_secret'):
+            assert WebInterface._load_secret_key(str(key_file)) == 'generated_secret'
+        
+        assert key_file.read_text() == 'generated_secret'
+        assert key_file.stat().st_mode & 0o777 == 0o600
+        assert [p.name for p in tmp_path.iterdir()] == ["flask_secret.key"]
+    
+    def test_load_secret_key_creation_race(self, tmp_path):
+        """Test a key file another process created first is reused, unless it is still empty."""
+        key_file = tmp_path / "flask_secret.key"
+        
+        def create_first(contents):
+            def link(src, dst):
+                Path(dst).write_text(contents)
+                raise FileExistsError(dst)
+            return link
+        
+        with patch('src.web_interface.os.link', side_effect=create_first('other_secret')), \
+             patch('secrets.token_hex', return_value='generated_secret'):
+            assert WebInterface._load_secret_key(str(key_file)) == 'other_secret'
+        assert key_file.read_text() == 'other_secret'
+        
+        key_file.unlink()
+        with patch('src.web_interface.os.link', side_effect=create_first('')), \
+             patch('secrets.token_hex', return_value='generated_secret'):
+            assert WebInterface._load_secret_key(str(key_file)) == 'generated_secret'
+        assert key_file.read_text() == 'generated_secret'
+        assert [p.name for p in tmp_path.iterdir()] == ["flask_secret.key"]
     
     def test_web_interface_init_with_custom_config(self):
         """Test WebInterface initialization with custom config."""
@@ -654,4 +907,22 @@ class TestFlaskApp:
             assert web_interface.port == 8080
             assert web_interface.debug is True
             assert web_interface.update_interval == 10
-            assert web_interface.enable_config_editing is False 
\ No newline at end of file
+            assert web_interface.enable_config_editing is False
+            assert web_interface.async_mode is None
+    
+    def test_web_interface_async_mode_config(self, mock_database):
+        """Test the SocketIO async mode can be chosen in the web config."""
+        with patch('src.web_interface.get_config') as mock_get_config:
+            config_mock = Mock()
+            config_mock.get_web_config.return_value = {'async_mode': 'threading'}
+            config_mock.get_secret.return_value = 'test_secret_key'
+            mock_get_config.return_value = config_mock
+            
+            web_interface = WebInterface()
+        
+        assert web_interface.socketio.server.async_mode == 'threading'
+        
+        web_interface.start_updates()
+        assert web_interface._update_thread.is_alive()
+        web_interface.stop_updates()
+        assert not web_interface._update_thread.is_alive() 
\ No newline at end of file
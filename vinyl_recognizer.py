@@ -7,13 +7,14 @@ vinyl music recognition and Last.fm scrobbling.
 """
 
 import asyncio
+import concurrent.futures
 import signal
 import sys
 import time
 import logging
 import threading
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Callable
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
@@ -37,6 +38,20 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Slack on top of the provider timeouts before a recognition is abandoned (seconds)
+RECOGNITION_TIMEOUT_MARGIN = 10.0
+
+# Time allowed for cancelled recognitions to unwind when the system stops (seconds)
+LOOP_SHUTDOWN_TIMEOUT = 5.0
+
+
+async def _cancel_pending_tasks():
+    """Cancel every other task on the running loop and wait for them to unwind."""
+    tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
 
 class VinylRecognitionSystem:
     """Main application class that coordinates all components."""
@@ -70,6 +85,15 @@ class VinylRecognitionSystem:
         self._maintenance_thread = None
         self._shutdown_event = threading.Event()
         
+        # Called when the system starts, stops or its scrobbles change
+        self._on_change: Optional[Callable[[], None]] = None
+        
+        # Event loop shared by all recognitions, run on its own thread and
+        # created on first use while the system is running
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()
+        
         logger.info("Vinyl Recognition System initialized")
     
     def start(self):
@@ -98,6 +122,7 @@ class VinylRecognitionSystem:
             self._start_maintenance_thread()
             
             logger.info("Vinyl Recognition System started successfully")
+            self._notify_change()
             
         except Exception as e:
             logger.error(f"Failed to start system: {e}")
@@ -130,14 +155,37 @@ class VinylRecognitionSystem:
         if self._maintenance_thread and self._maintenance_thread.is_alive():
             self._maintenance_thread.join(timeout=5.0)
         
+        # Stop the recognition event loop
+        self._stop_event_loop()
+        
         # Cleanup components
         try:
             self.audio_processor.cleanup()
             self.lastfm_scrobbler.cleanup()
+            self.database.close()
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
         
         logger.info("Vinyl Recognition System stopped")
+        self._notify_change()
+    
+    def set_change_callback(self, callback: Optional[Callable[[], None]]):
+        """
+        Register a callback for system state changes.
+        
+        Args:
+            callback: Called without arguments after start, stop and scrobble queue changes
+        """
+        self._on_change = callback
+        self.lastfm_scrobbler.on_change = callback
+    
+    def _notify_change(self):
+        """Invoke the change callback, if one is registered."""
+        if self._on_change is not None:
+            try:
+                self._on_change()
+            except Exception as e:
+                logger.error(f"Error in change callback: {e}")
     
     def _check_system_readiness(self):
         """Check if system is ready to start."""
@@ -176,17 +224,22 @@ class VinylRecognitionSystem:
         logger.info(f"Processing detected track: {audio_file}")
         self.stats['tracks_processed'] += 1
         
+        future = self._submit_recognition(audio_file)
+        if future is None:
+            logger.warning(f"System is not running, ignoring detected track: {audio_file}")
+            self.music_recognizer._cleanup_audio_file(audio_file)
+            return
+        
         try:
-            # Run recognition asynchronously
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
             try:
-                recognition_result = loop.run_until_complete(
-                    self.music_recognizer.recognize_track(audio_file)
-                )
-            finally:
-                loop.close()
+                recognition_result = future.result(timeout=self._recognition_timeout())
+            except (concurrent.futures.TimeoutError, concurrent.futures.CancelledError):
+                future.cancel()
+                self.music_recognizer._cleanup_audio_file(audio_file)
+                if not self.running:
+                    logger.info(f"Recognition cancelled by shutdown: {audio_file}")
+                    return
+                raise RuntimeError("Recognition timed out")
             
             if recognition_result.success:
                 self.stats['tracks_recognized'] += 1
@@ -204,8 +257,8 @@ class VinylRecognitionSystem:
                                f"confidence: {duplicate_check.confidence:.2f})")
                     return
                 
-                # Add to duplicate cache
-                self.duplicate_detector.add_track(recognition_result)
+                # Add to duplicate cache, reusing the fingerprint from the check
+                self.duplicate_detector.add_track(recognition_result, duplicate_check.fingerprint)
                 
                 # Queue for scrobbling
                 if self.lastfm_scrobbler.queue_scrobble(recognition_result):
@@ -221,6 +274,71 @@ class VinylRecognitionSystem:
             logger.error(f"Error processing track: {e}")
             self.stats['errors'] += 1
     
+    def _recognition_timeout(self) -> float:
+        """Longest a recognition may run: every provider timing out in turn, plus rate limiting."""
+        recognizer = self.music_recognizer
+        return (sum(provider.timeout for provider in recognizer.providers)
+                + recognizer.rate_limit_delay + RECOGNITION_TIMEOUT_MARGIN)
+    
+    def _submit_recognition(self, audio_file: str) -> Optional[concurrent.futures.Future]:
+        """
+        Schedule recognition of an audio file on the shared event loop.
+        
+        Submitting under the loop lock means a loop being stopped never receives
+        new work after its pending tasks have been cancelled.
+        
+        Args:
+            audio_file: Path to detected audio file
+            
+        Returns:
+            Future for the RecognitionResult, or None if the system is not running
+        """
+        with self._loop_lock:
+            loop = self._get_event_loop()
+            if loop is None:
+                return None
+            return asyncio.run_coroutine_threadsafe(
+                self.music_recognizer.recognize_track(audio_file), loop
+            )
+    
+    def _get_event_loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """
+        Get the recognition event loop, starting its thread if needed.
+        
+        Must be called with _loop_lock held.
+        
+        Returns:
+            The event loop, or None if the system is not running
+        """
+        if self._loop is None:
+            if not self.running:
+                return None
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+            self._loop_thread.start()
+        return self._loop
+    
+    def _stop_event_loop(self):
+        """Cancel in-flight recognitions, then stop and close the recognition event loop."""
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+            thread, self._loop_thread = self._loop_thread, None
+        
+        if loop is None:
+            return
+        
+        try:
+            # Waiting threads see their futures cancelled instead of blocking
+            asyncio.run_coroutine_threadsafe(_cancel_pending_tasks(), loop).result(
+                timeout=LOOP_SHUTDOWN_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Recognitions did not finish cancelling: {e}")
+        
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=LOOP_SHUTDOWN_TIMEOUT)
+        if not loop.is_running():
+            loop.close()
+    
     def _start_maintenance_thread(self):
         """Start the maintenance thread."""
         self._maintenance_thread = threading.Thread(target=self._maintenance_loop, daemon=True)